@@ -0,0 +1,336 @@
+from src.strategies import (
+    MovementStrategy,
+    HamiltonianMovementStrategy,
+    HamiltonianSkipMovementStrategy,
+    DummyMovementStrategy,
+    PathfindingMovementStrategy,
+    HamiltonianCycle,
+)
+from src.model import GameState
+from src.seeding import make_rng
+import argparse
+import copy
+import time
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="Snake benchmarks",
+        description="Micro-benchmarks of the Snake model and strategies",
+    )
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    model_parser = subparsers.add_parser(
+        "model",
+        help="Per-step cost of GameState.update from length 1 to a full board.",
+    )
+    model_parser.add_argument("--size", type=int, default=60,
+                              help="Width and height of the grid.")
+    model_parser.add_argument("--buckets", type=int, default=10,
+                              help="Number of snake length buckets to report.")
+
+    hamiltonian_parser = subparsers.add_parser(
+        "hamiltonian",
+        help="Per-move latency of the Hamiltonian strategies across grid sizes.",
+    )
+    hamiltonian_parser.add_argument("--strategy", choices=["cycle", "hamiltonian_skip"], default="cycle",
+                                    help="The strategy to time.")
+    hamiltonian_parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 200],
+                                    help="Widths and heights of the grids.")
+    hamiltonian_parser.add_argument("--moves", type=int, default=100_000,
+                                    help="Number of moves to time for each grid.")
+
+    cycle_parser = subparsers.add_parser(
+        "cycle-generation",
+        help="Time of the random Hamiltonian cycle generation across grid sizes.",
+    )
+    cycle_parser.add_argument("--sizes", type=int, nargs="+", default=[100, 200, 400, 1000],
+                              help="Widths and heights of the grids (even).")
+
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help="Total steps/s of BatchGameState against a loop over GameState instances.",
+    )
+    batch_parser.add_argument("--strategy", choices=["cycle", "hamiltonian_skip", "dummy"], default="cycle",
+                              help="The strategy playing the games.")
+    batch_parser.add_argument("--games", type=int, default=1024,
+                              help="Number of games simulated together.")
+    batch_parser.add_argument("--size", type=int, default=20,
+                              help="Width and height of the grid.")
+    batch_parser.add_argument("--steps", type=int, default=1000,
+                              help="Number of steps of every game.")
+
+    clone_parser = subparsers.add_parser(
+        "clone",
+        help="Cost of copying a GameState (deepcopy, snapshot, restore) and of apply_move/undo_move.",
+    )
+    clone_parser.add_argument("--size", type=int, default=60,
+                              help="Width and height of the grid.")
+    clone_parser.add_argument("--fills", type=float, nargs="+", default=[0.1, 0.5, 0.9],
+                              help="Lengths of the snake, as fractions of the grid.")
+    clone_parser.add_argument("--moves", type=int, default=1000,
+                              help="Number of moves applied then undone in a row.")
+
+    pathfinding_parser = subparsers.add_parser(
+        "pathfinding",
+        help="Per-move latency of the pathfinding strategy across grid sizes.",
+    )
+    pathfinding_parser.add_argument("--algorithm", choices=["astar", "bfs"], default="astar",
+                                    help="The search of the path to the food.")
+    pathfinding_parser.add_argument("--sizes", type=int, nargs="+", default=[20, 50, 100],
+                                    help="Widths and heights of the grids.")
+    pathfinding_parser.add_argument("--moves", type=int, default=20_000,
+                                    help="Maximum number of moves to time for each grid.")
+    pathfinding_parser.add_argument("--no-wrap-around", dest="wrap_around", action="store_false",
+                                    help="Play with walls instead of teleportation.")
+
+    return parser.parse_args()
+
+
+def benchmark_model(size: int, buckets: int) -> None:
+    """
+    Fill the whole board by following a Hamiltonian cycle and report the
+    average cost of a step for each snake length bucket.
+
+    The food is moved right in front of the head every other step, so that
+    both the move and the grow paths are measured.
+
+    :param size: Width and height of the grid.
+    :param buckets: Number of snake length buckets to report.
+    """
+    cycle = HamiltonianMovementStrategy(size, size, False).hamiltonian_cycle
+    cells = len(cycle)
+    directions = {}
+    for i, (x, y) in enumerate(cycle):
+        next_x, next_y = cycle[(i + 1) % cells]
+        directions[(x, y)] = (next_x - x, next_y - y)
+    next_cell = {cell: cycle[(i + 1) % cells] for i, cell in enumerate(cycle)}
+
+    game_state = GameState(size, size, wrap_around=False)
+
+    bucket_size = max(1, cells // buckets)
+    totals = [0] * (buckets + 1)
+    counts = [0] * (buckets + 1)
+    step = 0
+    while not game_state.game_over:
+        head = game_state.snake.get_head()
+        if step % 2 == 0:
+            game_state.food = next_cell[head]
+        bucket = min(len(game_state.snake) // bucket_size, buckets)
+
+        start = time.perf_counter_ns()
+        game_state.update(directions[head])
+        totals[bucket] += time.perf_counter_ns() - start
+        counts[bucket] += 1
+        step += 1
+
+    print(f"Grid {size}x{size}, {step} steps, win={game_state.win}")
+    print(f"{'length':>15} | {'steps':>8} | {'ns/step':>8}")
+    for bucket in range(buckets + 1):
+        if counts[bucket]:
+            low = bucket * bucket_size
+            high = min(cells, low + bucket_size - 1)
+            print(f"{low:>6} - {high:<6} | {counts[bucket]:>8} | "
+                  f"{totals[bucket] // counts[bucket]:>8}")
+
+
+def benchmark_hamiltonian(strategy_name: str, sizes: list[int], moves: int) -> None:
+    """
+    Play seeded games on grids of increasing size and report the average
+    latency of the strategy's get_move (the game updates are not timed).
+
+    :param strategy_name: The strategy to time, "cycle" or "hamiltonian_skip".
+    :param sizes: Widths and heights of the grids.
+    :param moves: Number of moves to time for each grid.
+    """
+    strategy_class = {
+        "cycle": HamiltonianMovementStrategy,
+        "hamiltonian_skip": HamiltonianSkipMovementStrategy,
+    }[strategy_name]
+
+    print(f"{'grid':>9} | {'ns/move':>8}")
+    for size in sizes:
+        strategy = strategy_class(size, size, True, make_rng(0, "cycle"))
+        game_state = GameState(size, size, rng=make_rng(0, "food"))
+
+        elapsed = 0
+        for _ in range(moves):
+            if game_state.game_over:
+                game_state.reset()
+            start = time.perf_counter_ns()
+            direction = strategy.get_move(game_state.snake.body, game_state.food)
+            elapsed += time.perf_counter_ns() - start
+            game_state.update(direction)
+
+        print(f"{size:>4}x{size:<4} | {elapsed // moves:>8}")
+
+
+def benchmark_cycle_generation(sizes: list[int]) -> None:
+    """
+    Report the time needed to generate a random Hamiltonian cycle and its
+    lookup tables on grids of increasing size.
+
+    :param sizes: Widths and heights of the grids.
+    """
+    print(f"{'grid':>11} | {'seconds':>8} | {'ns/cell':>8}")
+    for size in sizes:
+        start = time.perf_counter_ns()
+        HamiltonianCycle.generate(size, size, True, make_rng(0, "cycle"))
+        elapsed = time.perf_counter_ns() - start
+        print(f"{size:>5}x{size:<5} | {elapsed / 1e9:>8.3f} | {elapsed // (size * size):>8}")
+
+
+def benchmark_batch(strategy_name: str, games: int, size: int, steps: int) -> None:
+    """
+    Play the same number of games with BatchGameState and get_moves, and
+    with a loop over GameState instances and get_move, and report the total
+    number of steps per second of both.
+
+    :param strategy_name: The strategy playing the games.
+    :param games: Number of games simulated together.
+    :param size: Width and height of the grid.
+    :param steps: Number of steps of every game.
+    """
+    from src.model import BatchGameState
+
+    cycle = HamiltonianCycle.generate(size, size, True, make_rng(0, "cycle"))
+
+    def create_strategy() -> MovementStrategy:
+        if strategy_name == "dummy":
+            return DummyMovementStrategy()
+        strategy_class = {
+            "cycle": HamiltonianMovementStrategy,
+            "hamiltonian_skip": HamiltonianSkipMovementStrategy,
+        }[strategy_name]
+        return strategy_class(size, size, True, cycle=cycle)
+
+    # One strategy per game, as some strategies remember their last move
+    strategies = [create_strategy() for _ in range(games)]
+    game_states = [GameState(size, size, rng=make_rng(game, "food")) for game in range(games)]
+    start = time.perf_counter()
+    for _ in range(steps):
+        for game_state, strategy in zip(game_states, strategies):
+            if game_state.game_over:
+                game_state.reset()
+                strategy.reset()
+            game_state.update(strategy.get_move(game_state.snake.body, game_state.food))
+    loop_rate = games * steps / (time.perf_counter() - start)
+
+    strategy = create_strategy()
+    batch = BatchGameState(games, size, size, seed=0)
+    start = time.perf_counter()
+    for _ in range(steps):
+        batch.step(strategy.get_moves(batch))
+    batch_rate = games * steps / (time.perf_counter() - start)
+
+    print(f"{'engine':>14} | {'steps/s':>12}")
+    print(f"{'GameState loop':>14} | {loop_rate:>12,.0f}")
+    print(f"{'BatchGameState':>14} | {batch_rate:>12,.0f}")
+    print(f"Speedup: {batch_rate / loop_rate:.1f}x")
+
+
+def benchmark_clone(size: int, fills: list[float], moves: int) -> None:
+    """
+    Report, for several lengths of the snake, the cost of copying a
+    GameState with copy.deepcopy, with snapshot and restore, and the cost of
+    a move explored with apply_move then undone with undo_move.
+
+    The snake is grown by following a Hamiltonian cycle with the food right
+    in front of its head, and the explored moves keep following the cycle.
+
+    :param size: Width and height of the grid.
+    :param fills: Lengths of the snake, as fractions of the grid.
+    :param moves: Number of moves applied then undone in a row.
+    """
+    cycle = HamiltonianMovementStrategy(size, size, False).hamiltonian_cycle
+    cells = len(cycle)
+    directions = {}
+    for i, (x, y) in enumerate(cycle):
+        next_x, next_y = cycle[(i + 1) % cells]
+        directions[(x, y)] = (next_x - x, next_y - y)
+    next_cell = {cell: cycle[(i + 1) % cells] for i, cell in enumerate(cycle)}
+
+    def time_ns(function, repeat: int) -> int:
+        start = time.perf_counter_ns()
+        for _ in range(repeat):
+            function()
+        return (time.perf_counter_ns() - start) // repeat
+
+    game_state = GameState(size, size, wrap_around=False, rng=make_rng(0, "food"))
+    print(f"Grid {size}x{size}, {moves} moves applied then undone in a row")
+    print(f"{'length':>7} | {'deepcopy ns':>11} | {'snapshot ns':>11} | {'restore ns':>10} | "
+          f"{'apply ns':>8} | {'undo ns':>8}")
+    for fill in sorted(fills):
+        length = max(1, min(cells - 1, int(cells * fill)))
+        while len(game_state.snake) < length:
+            head = game_state.snake.get_head()
+            game_state.food = next_cell[head]
+            game_state.update(directions[head])
+
+        repeat = max(3, 200_000 // cells)
+        deepcopy_ns = time_ns(lambda: copy.deepcopy(game_state), max(3, repeat // 10))
+        snapshot_ns = time_ns(game_state.snapshot, repeat)
+        snapshot = game_state.snapshot()
+        restore_ns = time_ns(lambda: game_state.restore(snapshot), repeat)
+
+        apply_total = undo_total = 0
+        rounds = max(3, 200_000 // moves)
+        for _ in range(rounds):
+            records = []
+            start = time.perf_counter_ns()
+            for _ in range(moves):
+                records.append(game_state.apply_move(directions[game_state.snake.get_head()]))
+            apply_total += time.perf_counter_ns() - start
+            start = time.perf_counter_ns()
+            for record in reversed(records):
+                game_state.undo_move(record)
+            undo_total += time.perf_counter_ns() - start
+
+        print(f"{length:>7} | {deepcopy_ns:>11} | {snapshot_ns:>11} | {restore_ns:>10} | "
+              f"{apply_total // (rounds * moves):>8} | {undo_total // (rounds * moves):>8}")
+
+
+def benchmark_pathfinding(algorithm: str, sizes: list[int], moves: int, wrap_around: bool) -> None:
+    """
+    Play a game with the pathfinding strategy on grids of increasing size
+    and report the distribution of the time of a move.
+
+    :param algorithm: The search of the path to the food.
+    :param sizes: Widths and heights of the grids.
+    :param moves: Maximum number of moves to time for each grid.
+    :param wrap_around: Whether the snake teleports to the edges.
+    """
+    print(f"{'grid':>9} | {'moves':>6} | {'length':>6} | {'mean us':>8} | {'p50 us':>7} | "
+          f"{'p99 us':>8} | {'max us':>8}")
+    for size in sizes:
+        strategy = PathfindingMovementStrategy(size, size, wrap_around, algorithm)
+        game_state = GameState(size, size, wrap_around, rng=make_rng(0, "food"))
+        times = []
+        while len(times) < moves and not game_state.game_over:
+            start = time.perf_counter_ns()
+            direction = strategy.get_move(game_state.snake.body, game_state.food)
+            times.append(time.perf_counter_ns() - start)
+            game_state.update(direction)
+
+        times.sort()
+        print(f"{size:>4}x{size:<4} | {len(times):>6} | {len(game_state.snake):>6} | "
+              f"{sum(times) / len(times) / 1000:>8.1f} | {times[len(times) // 2] / 1000:>7.1f} | "
+              f"{times[int(len(times) * 0.99)] / 1000:>8.1f} | {times[-1] / 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    if args.benchmark == "model":
+        benchmark_model(args.size, args.buckets)
+    elif args.benchmark == "hamiltonian":
+        benchmark_hamiltonian(args.strategy, args.sizes, args.moves)
+    elif args.benchmark == "cycle-generation":
+        benchmark_cycle_generation(args.sizes)
+    elif args.benchmark == "batch":
+        benchmark_batch(args.strategy, args.games, args.size, args.steps)
+    elif args.benchmark == "pathfinding":
+        benchmark_pathfinding(args.algorithm, args.sizes, args.moves, args.wrap_around)
+    elif args.benchmark == "clone":
+        benchmark_clone(args.size, args.fills, args.moves)
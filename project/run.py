@@ -1,7 +1,9 @@
-from src.app import App
 import argparse
 import logging
 import os
+import subprocess
+import sys
+import time
 
 LOGGING_CONFIG = {
     "level": logging.INFO,
@@ -12,6 +14,20 @@ LOGGING_CONFIG = {
 }
 
 DEFAULT_CONFIG_PATH = "config/default.yaml"
+DEFAULT_SWEEP_CACHE_DIR = ".cache/sweeps"
+
+# Modules imported at startup by each mode
+STARTUP_IMPORTS = {
+    "headless": "from src.config import load_config; from src.simulation import HeadlessEngine",
+    "console": "from src.config import load_config; from src.app import App; from src.view.console_view import ConsoleView",
+    "pygame": "from src.config import load_config; from src.app import App; from src.view.pygame_view import PygameView",
+}
+
+# Import time budget of the modes that must start fast (milliseconds)
+STARTUP_BUDGET_MS = {
+    "headless": 100,
+    "console": 100,
+}
 
 
 def parse_args() -> argparse.Namespace:
@@ -28,6 +44,67 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_CONFIG_PATH,
         help="Path to the configuration file. If not provided, uses the default config.",
     )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Run the games without any view, as fast as possible, and print statistics.",
+    )
+    parser.add_argument(
+        "--episodes",
+        "-n",
+        metavar="N",
+        type=int,
+        default=1,
+        help="Number of games to play in headless mode.",
+    )
+    parser.add_argument(
+        "--max-steps",
+        metavar="STEPS",
+        type=int,
+        default=None,
+        help="Maximum number of steps of a headless game.",
+    )
+    parser.add_argument(
+        "--seed",
+        metavar="SEED",
+        type=int,
+        default=None,
+        help="Seed of the random generators, overrides the one of the config file.",
+    )
+
+    parser.add_argument(
+        "--record",
+        metavar="DIR",
+        type=str,
+        default=None,
+        help="Record a replay of every headless game in this directory, overrides the one of the config file.",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="REPLAY_FILE",
+        type=str,
+        default=None,
+        help="Play a recorded game, in the view of the config file.",
+    )
+    parser.add_argument(
+        "--workers",
+        metavar="N",
+        type=int,
+        default=None,
+        help="Number of worker processes of a headless sweep, the number of CPUs by default.",
+    )
+    parser.add_argument(
+        "--sweep-cache",
+        metavar="DIR",
+        type=str,
+        default=DEFAULT_SWEEP_CACHE_DIR,
+        help="Directory of the cached results of the sweep points ('none' to disable).",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print an import-time breakdown of the startup of the selected mode and exit.",
+    )
 
     return parser.parse_args()
 
@@ -46,6 +123,84 @@ def process_config_path(config_path: str) -> str:
     raise FileNotFoundError(f"Config file {config_path} not found.")
 
 
+def profile_startup(mode: str, top: int = 15) -> None:
+    """
+    Print an import-time breakdown of the startup of a mode, measured in a
+    fresh interpreter with -X importtime.
+
+    :param mode: The mode to profile ("headless", "console" or "pygame").
+    :param top: The number of packages to list.
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_IMPORTS[mode]],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    wall_time_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        print(result.stderr)
+        return
+
+    # Lines look like "import time:  self [us] | cumulative | imported package",
+    # nested imports being indented by two spaces per level
+    total_us = 0
+    self_us_by_package: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        self_us_by_package[package] = self_us_by_package.get(package, 0) + int(self_us)
+        if len(name) - len(name.lstrip()) == 1:
+            total_us += int(cumulative_us)
+
+    print(f"Startup imports of the {mode} mode: {total_us / 1000:.1f} ms "
+          f"(interpreter + imports: {wall_time_ms:.1f} ms)")
+    print(f"{'package':<24} | {'self [ms]':>9}")
+    ranking = sorted(self_us_by_package.items(), key=lambda item: item[1], reverse=True)
+    for package, self_us in ranking[:top]:
+        print(f"{package:<24} | {self_us / 1000:>9.1f}")
+
+    budget_ms = STARTUP_BUDGET_MS.get(mode)
+    if budget_ms is not None:
+        status = "OK" if total_us / 1000 <= budget_ms else "OVER BUDGET"
+        print(f"Budget: {budget_ms} ms -> {status}")
+
+
+def headless_sweep(config: dict, args: argparse.Namespace) -> None:
+    """
+    Expand the sweep axes of a config and play the headless games of every
+    point in parallel, reusing the cached results of the points already played.
+
+    :param config: The config, with a sweep section.
+    :param args: The command-line arguments.
+    """
+    from src.config import expand_sweep, get_config_value
+    from src.simulation import run_sweep
+
+    if args.seed is not None:
+        config["game"]["seed"] = args.seed
+    axes = list(config["sweep"])
+    configs = expand_sweep(config)
+    cache_dir = None if args.sweep_cache.lower() == "none" else args.sweep_cache
+
+    print(f"Sweep of {len(configs)} points x {args.episodes} episodes over {', '.join(axes)}")
+    start = time.perf_counter()
+    computed = 0
+    for point in run_sweep(configs, args.episodes, args.max_steps, args.workers, cache_dir):
+        computed += not point.cached
+        values = ", ".join(f"{axis}={get_config_value(point.config, axis)}" for axis in axes)
+        result = point.result
+        steps_to_win = result["steps_to_win_mean"]
+        print(f"{values} | win {result['win_rate']:.1%} | "
+              f"steps to win {steps_to_win if steps_to_win is None else round(steps_to_win)} | "
+              f"{result['steps_per_second']:,.0f} steps/s"
+              f"{' (cached)' if point.cached else ''}")
+    print(f"Computed {computed} of {len(configs)} points in {time.perf_counter() - start:.1f} s")
+
+
 if __name__ == "__main__":
     # Check if the log directory exist if not make it
     if not os.path.exists("log"):
@@ -62,6 +217,38 @@ if __name__ == "__main__":
 
     logger.info(f"Using config file {config_path}")
 
-    # Launch the app with the given config path
-    app = App(config_path)
-    app.run()
\ No newline at end of file
+    if args.profile_startup:
+        from src.config import load_config
+
+        if args.headless:
+            mode = "headless"
+        elif load_config(config_path)["graphics"]["enable"]:
+            mode = "pygame"
+        else:
+            mode = "console"
+        profile_startup(mode)
+    elif args.headless:
+        # Imported here so that the headless mode never loads pygame
+        from src.simulation import HeadlessEngine
+        from src.config import load_config
+
+        config = load_config(config_path)
+        if config.get("sweep"):
+            headless_sweep(config, args)
+            sys.exit()
+
+        engine = HeadlessEngine(config, max_steps=args.max_steps, seed=args.seed, record_dir=args.record)
+        stats = engine.run(args.episodes)
+        logger.info(f"Headless run finished: {stats.total_steps} steps")
+        print(stats.summary())
+    elif args.replay:
+        from src.app import ReplayApp
+
+        app = ReplayApp(args.replay, config_path)
+        app.run()
+    else:
+        from src.app import App
+
+        # Launch the app with the given config path
+        app = App(config_path)
+        app.run()
\ No newline at end of file
@@ -1,6 +1,22 @@
-from .view import PygameView, ConsoleView
-from .controller import GameController
+from .controller import GameController, ReplayController
 from .config import load_config
+from .view.base_view import BaseView
+
+
+def create_view(config: dict) -> BaseView:
+    """
+    Create the view selected by a config.
+
+    :param config: The configuration.
+    :return: The view.
+    """
+    # The views are imported on demand so that the console mode never loads pygame
+    if config["graphics"]["enable"]:
+        from .view.pygame_view import PygameView
+        return PygameView(config)
+    else:
+        from .view.console_view import ConsoleView
+        return ConsoleView(config)
 
 
 class App:
@@ -14,13 +30,32 @@ class App:
         if self.config["game"]["grid_width"] % 2 != 0 or self.config["game"]["grid_height"] % 2 != 0:
             raise ValueError("Grid width and height must be even.")
         
-        if self.config["graphics"]["enable"]:
-            self.view = PygameView(self.config)
-        else:
-            self.view = ConsoleView(self.config)
-        
+        self.view = create_view(self.config)
         self.controller = GameController(self.config, self.view)
 
     def run(self) -> None:
         """Run the application."""
         self.controller.run()
+
+
+class ReplayApp:
+    def __init__(self, replay_path: str, config_path: str) -> None:
+        """
+        Init the replay viewer
+
+        :param replay_path: Path to the replay file
+        :param config_path: Path to the config file of the view (the game
+                            settings come from the replay)
+        """
+        from .replay import ReplayPlayer
+
+        self.player = ReplayPlayer(replay_path)
+        self.config = self.player.reader.config
+        self.config["graphics"] = load_config(config_path)["graphics"]
+
+        self.view = create_view(self.config)
+        self.controller = ReplayController(self.config, self.view, self.player)
+
+    def run(self) -> None:
+        """Run the replay viewer."""
+        self.controller.run()
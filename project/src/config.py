@@ -1,5 +1,19 @@
+import copy
+import itertools
+
 import yaml
 
+# Top-level section of the sweep axes: dotted config key -> list of values
+SWEEP_KEY = "sweep"
+# Sections and dotted keys that don't change the outcome of a game (the
+# display, and where the cycles and the replays are written), left out of
+# the config hash
+HASH_IGNORED_SECTIONS = (SWEEP_KEY, "graphics")
+HASH_IGNORED_KEYS = ("hamiltonian.cache_dir", "replay.record_dir")
+# Bumped whenever a change of the game rules or of a strategy changes the
+# results of a run, so that cached sweep results are played again
+RESULTS_VERSION = 1
+
 
 def load_config(config_path: str) -> dict:
     with open(config_path, 'r') as file:
@@ -7,3 +21,94 @@ def load_config(config_path: str) -> dict:
             return yaml.safe_load(file)
         except yaml.YAMLError as e:
             raise ValueError(f"Error loading config: {e}")
+
+
+def get_config_value(config: dict, key: str):
+    """
+    Get a value of a config from its dotted key (e.g. "game.grid_width").
+
+    :param config: The config.
+    :param key: The dotted key.
+    :return: The value.
+    """
+    value = config
+    for part in key.split("."):
+        if not isinstance(value, dict) or part not in value:
+            raise ValueError(f"Unknown config key: {key}")
+        value = value[part]
+    return value
+
+
+def set_config_value(config: dict, key: str, value) -> None:
+    """
+    Set a value of a config from its dotted key. The key must already exist,
+    so that typos in the sweep axes are reported instead of ignored.
+
+    :param config: The config.
+    :param key: The dotted key.
+    :param value: The new value.
+    """
+    *sections, name = key.split(".")
+    parent = get_config_value(config, ".".join(sections)) if sections else config
+    if not isinstance(parent, dict) or name not in parent:
+        raise ValueError(f"Unknown config key: {key}")
+    parent[name] = value
+
+
+def expand_sweep(config: dict) -> list[dict]:
+    """
+    Expand the sweep axes of a config into the cartesian product of their
+    values, the first axis varying the slowest. The sweep section maps dotted
+    config keys to lists of values, e.g.:
+
+        sweep:
+          game.grid_width: [10, 20, 40]
+          hamiltonian.random_cycle: [true, false]
+
+    :param config: The config, with or without a sweep section.
+    :return: The concrete configs, without the sweep section.
+    """
+    axes = config.get(SWEEP_KEY) or {}
+    base = {section: value for section, value in config.items() if section != SWEEP_KEY}
+    for key, values in axes.items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"Sweep axis {key} must be a non-empty list of values")
+        get_config_value(base, key)
+
+    configs = []
+    for combination in itertools.product(*axes.values()):
+        point = copy.deepcopy(base)
+        for key, value in zip(axes, combination):
+            set_config_value(point, key, value)
+        configs.append(point)
+    return configs
+
+
+def config_hash(config: dict, **run_parameters) -> str:
+    """
+    Hash of the parts of a concrete config that affect the results of a run,
+    and of the versions of the code producing them (RESULTS_VERSION and the
+    GENERATOR_VERSION of the Hamiltonian cycles).
+
+    :param config: The config.
+    :param run_parameters: The other parameters of the run (e.g. the number of episodes).
+    :return: The hexadecimal SHA-256 digest.
+    """
+    # Imported here, only the sweeps hash configs
+    import hashlib
+    import json
+
+    from .strategies.hamiltonian_cycle import GENERATOR_VERSION
+
+    relevant = copy.deepcopy({section: value for section, value in config.items()
+                              if section not in HASH_IGNORED_SECTIONS})
+    for key in HASH_IGNORED_KEYS:
+        *sections, name = key.split(".")
+        parent = relevant
+        for section in sections:
+            parent = parent.get(section) if isinstance(parent, dict) else None
+        if isinstance(parent, dict):
+            parent.pop(name, None)
+    versions = {"results": RESULTS_VERSION, "generator": GENERATOR_VERSION}
+    payload = json.dumps({"versions": versions, "config": relevant, "run": run_parameters}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
@@ -1,5 +1,5 @@
 from .input_handler import ConsoleInputHandler
 from .game_controller import GameController
+from .replay_controller import ReplayController
 
-__all__ = ["GameController", "ConsoleInputHandler"]
-
+__all__ = ["GameController", "ReplayController", "ConsoleInputHandler"]
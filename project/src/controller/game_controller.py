@@ -1,13 +1,64 @@
+import logging
+import math
 import time
 import sys
 
-import pygame
-
-from ..strategies import PlayerMovementStrategy, HamiltonianMovementStrategy, DummyMovementStrategy, HamiltonianSkipMovementStrategy
+from ..strategies import PlayerMovementStrategy, StrategyRegistry
 from .input_handler import ConsoleInputHandler
-from ..view.pygame_view import PygameView
+from .tick_scheduler import TickScheduler
 from ..model.game_state import GameState
+from ..replay.replay_recorder import ReplayRecorder
 from ..view.base_view import BaseView
+from ..seeding import make_rng
+
+# Keys toggling between the player and another strategy
+CONSOLE_STRATEGY_KEYS = {
+    '0': "cycle",
+    '1': "dummy",
+    '2': "pathfinding",
+}
+PYGAME_STRATEGY_KEYS = {
+    "K_h": "cycle",
+    "K_d": "dummy",
+    "K_p": "pathfinding",
+}
+
+logger = logging.getLogger(__name__)
+
+# pygame is only imported when a pygame view is used, so that the console
+# mode starts fast and works without SDL (see load_pygame)
+pygame = None
+
+
+def load_pygame():
+    """
+    Import pygame on first use.
+
+    :return: The pygame module.
+    """
+    global pygame
+    if pygame is None:
+        import pygame as pygame_module
+        pygame = pygame_module
+    return pygame
+
+
+def wait_pygame_events(timeout: float | None) -> list:
+    """
+    Block until a pygame event arrives or the timeout expires, without using
+    the CPU in the meantime.
+
+    :param timeout: The maximum waiting time in seconds, None to wait
+                    until an event arrives.
+    :return: The pending events.
+    """
+    if timeout is not None and timeout <= 0:
+        return pygame.event.get()
+    # A timeout of 0 waits forever, round the others up to 1 ms
+    event = pygame.event.wait(0 if timeout is None else max(1, math.ceil(timeout * 1000)))
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event, *pygame.event.get()]
 
 
 class GameController:
@@ -28,10 +79,12 @@ class GameController:
 
         # Initialize the game state
         game_config = config["game"]
+        seed = game_config.get("seed")
         self.game_state = GameState(
             grid_width=game_config["grid_width"],
             grid_height=game_config["grid_height"],
-            wrap_around=game_config["wrap_around"]
+            wrap_around=game_config["wrap_around"],
+            rng=make_rng(seed, "food")
         )
 
         # Speed configuration
@@ -40,47 +93,41 @@ class GameController:
         self.speed_acceleration = game_props["speed_acceleration"]
         self.min_speed = game_props["min_speed"]
         self.speed = self.initial_speed
-
-        # Movement strategies
-        self.player_strategy = PlayerMovementStrategy()
-        self.auto_strategy = HamiltonianMovementStrategy(
-            game_config["grid_width"],
-            game_config["grid_height"],
-            config["hamiltonian"]["random_cycle"]
-        )
-        self.dummy_strategy = DummyMovementStrategy()
-        self.hamiltonian_skip_strategy = HamiltonianSkipMovementStrategy(
-            game_config["grid_width"],
-            game_config["grid_height"],
-            config["hamiltonian"]["random_cycle"]
+        # The clock of the game updates, shared by the pygame and console loops
+        self.scheduler = TickScheduler(
+            self.speed,
+            policy=game_props.get("tick_policy", "catch_up"),
+            max_lag_ms=game_props.get("max_lag", 250),
         )
 
-        # Set initial strategy
-        if game_config["strategy"].lower() == "cycle":
-            self.current_strategy = self.auto_strategy
-            self.current_strategy_name = "Cycle"
-        elif game_config["strategy"].lower() == "hamiltonian_skip":
-            self.current_strategy = self.hamiltonian_skip_strategy
-            self.current_strategy_name = "Hamiltonian Skip"
-        elif game_config["strategy"].lower() == "player":
-            self.current_strategy = self.player_strategy
-            self.current_strategy_name = "Player"
-        elif game_config["strategy"].lower() == "dummy":
-            self.current_strategy = self.dummy_strategy
-            self.current_strategy_name = "Dummy"
-        else:
-            raise ValueError(f"Invalid strategy: {game_config['strategy']}")
+        # Replay of every game, if enabled
+        record_dir = config.get("replay", {}).get("record_dir")
+        self.recorder = None
+        if record_dir is not None:
+            self.recorder = ReplayRecorder(record_dir, config, seed, time.strftime("%Y%m%d-%H%M%S"))
+            self.recorder.start(self.game_state)
+
+        # Movement strategies, built on first use
+        self.strategies = StrategyRegistry(config, seed)
+        self.set_strategy(game_config["strategy"])
 
         # Game loop state
         self.running = True
-        self.last_update_time = 0
 
-        # Handle the timer differently depending on the view
-        self.use_pygame_timer = isinstance(self.view, PygameView)
-        if self.use_pygame_timer:
+        # Handle the input differently depending on the view
+        self.use_pygame = self.view.uses_pygame
+        if self.use_pygame:
+            load_pygame()
+            self.pygame_strategy_keys = {
+                getattr(pygame, key_name): name for key_name, name in PYGAME_STRATEGY_KEYS.items()
+            }
             pygame.init()
-            self.GAME_UPDATE = pygame.USEREVENT + 1
-            pygame.time.set_timer(self.GAME_UPDATE, self.speed)
+            # The events after which the window is redrawn
+            self.redraw_events = {pygame.KEYDOWN, pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED}
+            # The frames are drawn at most at the refresh rate, and only after a change
+            self.frame_clock = TickScheduler(1000 / config["graphics"].get("fps", 60), policy="drop")
+            # Turbo mode: as many updates as possible between two frames
+            self.turbo = False
         else:
             # Console mode: setup input handler
             self.input_handler = ConsoleInputHandler()
@@ -89,20 +136,61 @@ class GameController:
     def reset(self) -> None:
         """Reset the game."""
         self.game_state.reset()
-        self.speed = self.initial_speed
+        self.log_tick_stats()
+        self.set_speed(self.initial_speed)
+        self.scheduler.reset()
+        if self.recorder is not None:
+            self.recorder.start(self.game_state)
 
-        # Reset the strategies
-        self.player_strategy = PlayerMovementStrategy((1, 0))
-        self.dummy_strategy = DummyMovementStrategy()
+        # Keep the current strategy but reset the strategies
+        self.strategies.reset()
 
-        # Keep the current strategy but reset it
-        if isinstance(self.current_strategy, PlayerMovementStrategy):
-            self.current_strategy = self.player_strategy
-        elif isinstance(self.current_strategy, DummyMovementStrategy):
-            self.current_strategy = self.dummy_strategy
+    def set_speed(self, speed: int) -> None:
+        """
+        Change the interval between two game updates.
+
+        :param speed: The new interval in milliseconds.
+        """
+        self.speed = speed
+        self.scheduler.set_interval(speed)
+
+    def log_tick_stats(self) -> None:
+        """Log the timing statistics of the game updates since the start of the game."""
+        stats = self.scheduler.stats()
+        if stats["ticks"]:
+            logger.info(
+                f"Ticks at {self.speed} ms ({self.scheduler.policy}): {stats['ticks']} run, "
+                f"{stats['late_ticks']} caught up, {stats['missed_ticks']} missed, "
+                f"jitter mean {stats['jitter_mean_ms']:.2f} ms, max {stats['jitter_max_ms']:.2f} ms"
+            )
+
+    def toggle_wrap_around(self) -> None:
+        """Toggle the teleportation, recording the change in the replay."""
+        self.game_state.toggle_wrap_around()
+        self.strategies.set_wrap_around(self.game_state.wrap_around)
+        if self.recorder is not None:
+            self.recorder.record_wrap_around(self.game_state)
+
+    def set_strategy(self, name: str) -> None:
+        """
+        Switch to another strategy.
+
+        :param name: The name of the strategy in the config.
+        """
+        self.current_strategy = self.strategies.get(name)
+        self.current_strategy_key = self.strategies.resolve(name)
+        self.current_strategy_name = self.strategies.display_name(name)
 
-        if self.use_pygame_timer:
-            pygame.time.set_timer(self.GAME_UPDATE, self.speed)
+    def toggle_strategy(self, name: str) -> None:
+        """
+        Switch to a strategy, or back to the player if it is already the current one.
+
+        :param name: The name of the strategy in the config.
+        """
+        if self.current_strategy_key == name:
+            self.set_strategy("player")
+        else:
+            self.set_strategy(name)
 
     def update(self) -> None:
         """Update the game logic."""
@@ -118,27 +206,56 @@ class GameController:
         # Update the game state
         old_score = self.game_state.score
         self.game_state.update(direction)
+        if self.recorder is not None:
+            self.recorder.record_step(direction, self.game_state)
 
         # Increase the speed if the score has increased
         if self.game_state.score > old_score:
-            self.speed = max(0, max(self.min_speed, self.speed -
-                             self.speed_acceleration))
-            if self.use_pygame_timer:
-                pygame.time.set_timer(self.GAME_UPDATE, self.speed)
+            self.set_speed(max(0, max(self.min_speed, self.speed - self.speed_acceleration)))
+
+    def run_due_updates(self) -> bool:
+        """
+        Run the game updates due according to the scheduler.
+
+        :return: True if the game was updated.
+        """
+        if self.game_state.game_over:
+            return False
+        ticks = self.scheduler.due_ticks()
+        for _ in range(ticks):
+            self.update()
+        return ticks > 0
+
+    def run_turbo_updates(self) -> bool:
+        """
+        Run game updates back to back until the next frame is due (at least one).
+
+        :return: True if the game was updated.
+        """
+        if self.game_state.game_over:
+            return False
+        self.update()
+        while not self.game_state.game_over and self.frame_clock.time_until_tick() > 0:
+            self.update()
+        return True
+
+    def toggle_turbo(self) -> None:
+        """Toggle the turbo mode, the normal speed resuming from now when it ends."""
+        self.turbo = not self.turbo
+        if not self.turbo:
+            self.scheduler.reset(keep_stats=True)
 
-    def handle_pygame_events(self) -> bool:
+    def handle_pygame_events(self, events: list) -> bool:
         """
         Handle the Pygame events.
 
+        :param events: The events.
         :return: False if the game should quit, True otherwise.
         """
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 return False
 
-            elif event.type == self.GAME_UPDATE:
-                self.update()
-
             elif event.type == pygame.KEYDOWN:
                 if not self.handle_keydown(event.key):
                     return False
@@ -147,74 +264,136 @@ class GameController:
 
     def handle_console_input(self) -> bool:
         """
-        Handle the console input (non-blocking).
+        Handle the keys waiting on the console input (non-blocking).
 
         :return: True to continue, False to quit.
         """
-        # Get key press (non-blocking)
-        key = self.input_handler.get_key()
-
-        if key:
-            # Handle quit
-            if key == 'escape' or key == '\x1b':
+        while (key := self.input_handler.get_key()) is not None:
+            if not self.handle_console_key(key):
                 return False
+        return True
 
-            # Handle reset
-            elif key == ' ':
-                if self.game_state.game_over:
-                    self.reset()
-
-            # Handle teleportation toggle
-            elif key == 't':
-                self.game_state.toggle_wrap_around()
-
-            # Handle strategy changes
-            elif key == '0':
-                if isinstance(self.current_strategy, HamiltonianMovementStrategy):
-                    self.current_strategy = self.player_strategy
-                    self.current_strategy_name = "Player"
-                else:
-                    self.current_strategy = self.auto_strategy
-                    self.current_strategy_name = "Auto (H)"
-
-            elif key == '1':
-                if isinstance(self.current_strategy, DummyMovementStrategy):
-                    self.current_strategy = self.player_strategy
-                    self.current_strategy_name = "Player"
-                else:
-                    self.current_strategy = self.dummy_strategy
-                    self.current_strategy_name = "Dummy (D)"
-
-            elif key == '+':
-                self.speed += self.speed_acceleration
-            elif key == '-':
-                self.speed = max(0, self.speed - self.speed_acceleration)
-                self.min_speed = max(0, self.min_speed - self.speed_acceleration)
-
-            # Handle player movement (only if in player mode)
-            if isinstance(self.current_strategy, PlayerMovementStrategy):
-                if key in ('UP', 'w', 'z'):  # Up (z for AZERTY keyboards)
-                    self.current_strategy.set_pending_direction(
-                        (0, -1), len(self.game_state.snake))
-                elif key in ('DOWN', 's'):  # Down
-                    self.current_strategy.set_pending_direction(
-                        (0, 1), len(self.game_state.snake))
-                elif key in ('LEFT', 'a', 'q'):  # Left (q for AZERTY)
-                    self.current_strategy.set_pending_direction(
-                        (-1, 0), len(self.game_state.snake))
-                elif key in ('RIGHT', 'd'):  # Right
-                    self.current_strategy.set_pending_direction(
-                        (1, 0), len(self.game_state.snake))
-
-        # Update game at regular intervals
-        current_time = time.time() * 1000  # Convert to milliseconds
-
-        if current_time - self.last_update_time >= self.speed:
-            self.update()
-            self.last_update_time = current_time
+    def handle_console_key(self, key: str) -> bool:
+        """
+        Handle a key pressed on the console.
+
+        :param key: The key.
+        :return: True to continue, False to quit.
+        """
+        # Handle quit
+        if key in ('ESCAPE', 'escape', '\x1b'):
+            return False
+
+        # Handle reset
+        elif key == ' ':
+            if self.game_state.game_over:
+                self.reset()
+
+        # Handle teleportation toggle
+        elif key == 't':
+            self.toggle_wrap_around()
+
+        # Handle strategy changes
+        elif key in CONSOLE_STRATEGY_KEYS:
+            self.toggle_strategy(CONSOLE_STRATEGY_KEYS[key])
+
+        elif key == '+':
+            self.set_speed(self.speed + self.speed_acceleration)
+        elif key == '-':
+            self.set_speed(max(0, self.speed - self.speed_acceleration))
+            self.min_speed = max(0, self.min_speed - self.speed_acceleration)
+
+        # Handle player movement (only if in player mode)
+        if isinstance(self.current_strategy, PlayerMovementStrategy):
+            if key in ('UP', 'w', 'z'):  # Up (z for AZERTY keyboards)
+                self.current_strategy.set_pending_direction(
+                    (0, -1), len(self.game_state.snake))
+            elif key in ('DOWN', 's'):  # Down
+                self.current_strategy.set_pending_direction(
+                    (0, 1), len(self.game_state.snake))
+            elif key in ('LEFT', 'a', 'q'):  # Left (q for AZERTY)
+                self.current_strategy.set_pending_direction(
+                    (-1, 0), len(self.game_state.snake))
+            elif key in ('RIGHT', 'd'):  # Right
+                self.current_strategy.set_pending_direction(
+                    (1, 0), len(self.game_state.snake))
 
         return True
 
+    def time_until_update(self) -> float | None:
+        """
+        :return: The time in seconds until the next game update, None if the
+                 game is over (nothing happens until a key is pressed).
+        """
+        if self.game_state.game_over:
+            return None
+        return self.scheduler.time_until_tick()
+
+    def display_state(self) -> tuple:
+        """
+        :return: What a key can change in the frame: the game (restarted), the
+                 strategy, the speed and the teleportation.
+        """
+        game_state = self.game_state
+        return game_state.game_over, game_state.score, self.current_strategy_name, self.speed, game_state.wrap_around
+
+    def run_console(self) -> None:
+        """
+        The console game loop: block on the input until a key is pressed or
+        the next update is due, and redraw only when something changed, so
+        that an idle game doesn't use the CPU. The keys that change nothing
+        shown (the unmapped keys, the moves waiting for the next update)
+        don't redraw.
+        """
+        dirty = True
+        while self.running:
+            if dirty:
+                self.view.render(self.game_state, self.current_strategy_name, self.speed)
+                dirty = False
+
+            if self.input_handler.wait_for_input(self.time_until_update()):
+                displayed = self.display_state()
+                self.running = self.handle_console_input()
+                if self.display_state() != displayed:
+                    dirty = True
+
+            # Update the game at regular intervals
+            if self.run_due_updates():
+                dirty = True
+
+    def run_pygame(self) -> None:
+        """
+        The pygame game loop: the game is updated by the scheduler (or as fast
+        as possible in turbo mode), the window is redrawn at most once per
+        frame and only after a change, and the loop sleeps in between.
+        """
+        dirty = True
+        while self.running:
+            if self.turbo:
+                updated = self.run_turbo_updates()
+            else:
+                updated = self.run_due_updates()
+            dirty = dirty or updated
+
+            if dirty and self.frame_clock.due_ticks():
+                strategy_name = f"{self.current_strategy_name} (turbo)" if self.turbo else self.current_strategy_name
+                self.view.render(self.game_state, strategy_name, self.speed)
+                dirty = False
+
+            # Sleep until the next update, the next frame if it is waiting to
+            # be drawn, or an event
+            timeout = self.time_until_update()
+            if self.turbo and timeout is not None:
+                timeout = 0
+            if dirty:
+                frame_timeout = self.frame_clock.time_until_tick()
+                timeout = frame_timeout if timeout is None else min(timeout, frame_timeout)
+
+            events = wait_pygame_events(timeout)
+            self.running = self.handle_pygame_events(events)
+            if any(event.type in self.redraw_events for event in events):
+                dirty = True
+
     def handle_keydown(self, key: int) -> bool:
         """
         Handle the keydown events.
@@ -233,25 +412,15 @@ class GameController:
 
         # T to toggle the teleportation
         elif key == pygame.K_t:
-            self.game_state.toggle_wrap_around()
+            self.toggle_wrap_around()
 
-        # H for the auto mode (Hamiltonian)
-        elif key == pygame.K_h:
-            if isinstance(self.current_strategy, HamiltonianMovementStrategy):
-                self.current_strategy = self.player_strategy
-                self.current_strategy_name = "Player"
-            else:
-                self.current_strategy = self.auto_strategy
-                self.current_strategy_name = "Auto (H)"
-
-        # D for the dummy mode
-        elif key == pygame.K_d:
-            if isinstance(self.current_strategy, DummyMovementStrategy):
-                self.current_strategy = self.player_strategy
-                self.current_strategy_name = "Player"
-            else:
-                self.current_strategy = self.dummy_strategy
-                self.current_strategy_name = "Dummy (D)"
+        # F to toggle the turbo mode
+        elif key == pygame.K_f:
+            self.toggle_turbo()
+
+        # H for the auto mode (Hamiltonian), D for the dummy mode, P for the pathfinding mode
+        elif key in self.pygame_strategy_keys:
+            self.toggle_strategy(self.pygame_strategy_keys[key])
 
         # Player controls (only if in player mode)
         if isinstance(self.current_strategy, PlayerMovementStrategy):
@@ -275,31 +444,23 @@ class GameController:
         self.view.initialize()
 
         try:
-            while self.running:
-                # Handle the events depending on the view type
-                if self.use_pygame_timer:
-                    self.running = self.handle_pygame_events()
-                else:
-                    self.running = self.handle_console_input()
-                    time.sleep(0.01)  # Small delay to not overload the CPU
-
-                # Display the game state
-                self.view.render(
-                    self.game_state, self.current_strategy_name, self.speed)
-
-                # Limit the FPS for pygame
-                if isinstance(self.view, PygameView):
-                    self.view.tick(60)
+            if self.use_pygame:
+                self.run_pygame()
+            else:
+                self.run_console()
         except Exception as e:
             print(f"Error: {e}")
             sys.exit(1)
 
         finally:
             # Cleanup
-            if not self.use_pygame_timer:
+            self.log_tick_stats()
+            if self.recorder is not None:
+                self.recorder.stop(score=self.game_state.score)
+            if not self.use_pygame:
                 self.input_handler.restore_terminal()
 
             self.view.cleanup()
-            if self.use_pygame_timer:
+            if self.use_pygame:
                 pygame.quit()
             sys.exit()
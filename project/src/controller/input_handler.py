@@ -1,5 +1,13 @@
+import codecs
+import os
 import platform
 import sys
+import time
+
+# Final character of the escape sequences of the arrow keys (ESC [ A...)
+ARROW_KEYS = {'A': 'UP', 'B': 'DOWN', 'C': 'RIGHT', 'D': 'LEFT'}
+# Maximum number of bytes read from stdin at once
+READ_SIZE = 64
 
 
 class ConsoleInputHandler:
@@ -21,6 +29,13 @@ class ConsoleInputHandler:
             self.tty = tty
             self.termios = termios
             self.old_settings = None
+            # Characters read from stdin and not returned by get_key yet. The
+            # raw file descriptor is read instead of the buffered sys.stdin,
+            # whose buffer would hold keys that select doesn't see.
+            self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            self.pending = ""
+        # Set when the input is closed (end of a piped stdin)
+        self.closed = False
 
     def setup_terminal(self) -> None:
         """Setup terminal for raw input (Unix only)."""
@@ -34,6 +49,33 @@ class ConsoleInputHandler:
             self.termios.tcsetattr(
                 sys.stdin, self.termios.TCSADRAIN, self.old_settings)
 
+    def wait_for_input(self, timeout: float | None) -> bool:
+        """
+        Block until a key is pressed or the timeout expires, without using
+        the CPU in the meantime.
+
+        :param timeout: The maximum waiting time in seconds, None to wait
+                        until a key is pressed.
+        :return: True if a key can be read with get_key.
+        """
+        if self.closed:
+            # Nothing will ever be read, just wait (forever only if nothing else can happen)
+            time.sleep(timeout if timeout is not None else 0.1)
+            return False
+        if self.system == "Windows":
+            return self._wait_for_input_windows(timeout)
+        return bool(self.pending) or self._read_input(timeout)
+
+    def _wait_for_input_windows(self, timeout: float | None) -> bool:
+        """Wait for a key on Windows, where select doesn't support the console."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.msvcrt.kbhit():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            time.sleep(0.01 if remaining is None else min(0.01, remaining))
+        return True
+
     def get_key(self) -> str | None:
         """
         Get a key press in a non-blocking way.
@@ -70,34 +112,51 @@ class ConsoleInputHandler:
                     return None
         return None
 
+    def _read_input(self, timeout: float | None) -> bool:
+        """
+        Read the bytes available on stdin into the pending characters.
+
+        :param timeout: The maximum waiting time in seconds for the first
+                        byte, None to wait until a key is pressed.
+        :return: True if something was read.
+        """
+        import select
+
+        file_descriptor = sys.stdin.fileno()
+        ready, _, _ = select.select([file_descriptor], [], [], timeout)
+        if not ready:
+            return False
+        data = os.read(file_descriptor, READ_SIZE)
+        if not data:
+            # End of the input
+            self.closed = True
+            return False
+        self.pending += self.decoder.decode(data)
+        return True
+
     def _get_key_unix(self) -> str | None:
         """Get key press on Unix-like systems."""
-        import select
+        while True:
+            if not self.pending and (self.closed or not self._read_input(0)):
+                return None
+            if not self.pending:
+                # The start of a multi-byte character
+                return None
 
-        # Check if there's input waiting
-        dr, dw, de = select.select([sys.stdin], [], [], 0)
-        if dr:
-            ch = sys.stdin.read(1)
-
-            # Handle escape sequences (arrow keys)
-            if ch == '\x1b':  # ESC
-                # Check if this is an escape sequence or just ESC
-                dr, dw, de = select.select([sys.stdin], [], [], 0.01)
-                if dr:
-                    ch2 = sys.stdin.read(1)
-                    if ch2 == '[':
-                        ch3 = sys.stdin.read(1)
-                        if ch3 == 'A':
-                            return 'UP'
-                        elif ch3 == 'B':
-                            return 'DOWN'
-                        elif ch3 == 'C':
-                            return 'RIGHT'
-                        elif ch3 == 'D':
-                            return 'LEFT'
-                else:
-                    return 'ESCAPE'
-
-            return ch.lower()
+            ch = self.pending[0]
+            if ch != '\x1b':  # Not ESC
+                self.pending = self.pending[1:]
+                return ch.lower()
 
-        return None
+            # Handle escape sequences (arrow keys): check if this is an
+            # escape sequence or just ESC
+            if len(self.pending) < 3 and not self.closed:
+                self._read_input(0.01)
+            if self.pending[1:2] != '[':
+                self.pending = self.pending[1:]
+                return 'ESCAPE'
+            key = ARROW_KEYS.get(self.pending[2:3])
+            self.pending = self.pending[3:]
+            if key is not None:
+                return key
+            # Skip the other escape sequences
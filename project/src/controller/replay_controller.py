@@ -0,0 +1,252 @@
+import time
+import sys
+
+from .game_controller import load_pygame, wait_pygame_events
+from .input_handler import ConsoleInputHandler
+from .tick_scheduler import TickScheduler
+from ..replay.replay_player import ReplayPlayer
+from ..view.base_view import BaseView
+
+# Keys of the replay commands
+CONSOLE_REPLAY_KEYS = {
+    ' ': "pause",
+    'RIGHT': "forward",
+    'LEFT': "backward",
+    'UP': "faster",
+    'DOWN': "slower",
+    'e': "end",
+}
+PYGAME_REPLAY_KEYS = {
+    "K_SPACE": "pause",
+    "K_RIGHT": "forward",
+    "K_LEFT": "backward",
+    "K_UP": "faster",
+    "K_DOWN": "slower",
+    "K_HOME": "start",
+    "K_END": "end",
+}
+
+
+class ReplayController:
+    """
+    Controller playing a recorded game in a view. The replay can be paused,
+    played at any speed, stepped forwards and backwards, and the digit keys
+    jump to 0%, 10%, ..., 90% of the game.
+    """
+
+    def __init__(self, config: dict, view: BaseView, player: ReplayPlayer):
+        """
+        Initialize the replay controller.
+
+        :param config: Configuration of the replayed game.
+        :param view: The view to use for display.
+        :param player: The replay player.
+        """
+        self.config = config
+        self.view = view
+        self.player = player
+
+        # Playback speed, starting at the initial speed of the game
+        self.steps_per_second = 1000 / max(1, config["game"]["properties"]["initial_speed"])
+        self.paused = False
+        self.running = True
+        self._pending_steps = 0.0
+        self._last_time = time.perf_counter()
+
+        self.use_pygame = self.view.uses_pygame
+        if self.use_pygame:
+            pygame = load_pygame()
+            self.pygame_keys = {getattr(pygame, key_name): command for key_name, command in PYGAME_REPLAY_KEYS.items()}
+            self.pygame_keys.update({getattr(pygame, f"K_{digit}"): f"jump {digit}" for digit in range(10)})
+            pygame.init()
+            # The events after which the window is redrawn, besides the changes of the replay
+            self.redraw_events = {pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.VIDEORESIZE,
+                                  pygame.WINDOWSIZECHANGED}
+            # The frames are drawn at most at the refresh rate
+            self.frame_clock = TickScheduler(1000 / config["graphics"].get("fps", 60), policy="drop")
+        else:
+            self.input_handler = ConsoleInputHandler()
+            self.input_handler.setup_terminal()
+
+    def handle_command(self, command: str) -> None:
+        """
+        Apply a replay command.
+
+        :param command: The command (see CONSOLE_REPLAY_KEYS and PYGAME_REPLAY_KEYS,
+                        or "jump <digit>").
+        """
+        player = self.player
+        # The loops don't call advance while the replay is idle (paused or at
+        # its end): the time spent idle must not count as playing time
+        idle = self.time_until_step() is None
+        if command == "pause":
+            self.paused = not self.paused
+        elif command == "forward":
+            self.paused = True
+            player.step_forward()
+        elif command == "backward":
+            self.paused = True
+            player.step_backward()
+        elif command == "faster":
+            self.steps_per_second *= 2
+        elif command == "slower":
+            self.steps_per_second = max(0.5, self.steps_per_second / 2)
+        elif command == "start":
+            player.seek(0)
+        elif command == "end":
+            player.seek(player.total_steps)
+        elif command.startswith("jump "):
+            player.seek(player.total_steps * int(command[5:]) // 10)
+        if idle:
+            self._last_time = time.perf_counter()
+
+    def advance(self) -> bool:
+        """
+        Play the steps due since the last call.
+
+        :return: True if steps were played.
+        """
+        now = time.perf_counter()
+        elapsed = now - self._last_time
+        self._last_time = now
+        if self.paused or self.player.step >= self.player.total_steps:
+            self._pending_steps = 0.0
+            return False
+
+        self._pending_steps += elapsed * self.steps_per_second
+        steps = int(self._pending_steps)
+        if steps:
+            self._pending_steps -= steps
+            self.player.step_forward(steps)
+        return steps > 0
+
+    def time_until_step(self) -> float | None:
+        """
+        :return: The time in seconds until the next step is due, None if the
+                 replay is paused or at its end.
+        """
+        if self.paused or self.player.step >= self.player.total_steps:
+            return None
+        elapsed = time.perf_counter() - self._last_time
+        return max(0.0, (1 - self._pending_steps) / self.steps_per_second - elapsed)
+
+    def handle_pygame_events(self, events: list) -> bool:
+        """
+        Handle the Pygame events.
+
+        :param events: The events.
+        :return: False if the replay should quit, True otherwise.
+        """
+        pygame = load_pygame()
+        for event in events:
+            if event.type == pygame.QUIT:
+                return False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    return False
+                if event.key in self.pygame_keys:
+                    self.handle_command(self.pygame_keys[event.key])
+        return True
+
+    def handle_console_input(self) -> bool:
+        """
+        Handle the keys waiting on the console input (non-blocking).
+
+        :return: False if the replay should quit, True otherwise.
+        """
+        while (key := self.input_handler.get_key()) is not None:
+            if key in ('ESCAPE', 'escape', '\x1b'):
+                return False
+            if key in CONSOLE_REPLAY_KEYS:
+                self.handle_command(CONSOLE_REPLAY_KEYS[key])
+            elif key.isdigit():
+                self.handle_command(f"jump {key}")
+        return True
+
+    def status(self) -> str:
+        """
+        :return: The replay status shown in place of the strategy name.
+        """
+        state = "paused" if self.paused else f"{self.steps_per_second:g} steps/s"
+        return f"Replay {self.player.step}/{self.player.total_steps} ({state})"
+
+    def display_state(self) -> tuple:
+        """
+        :return: What a command can change in the frame: the step shown, the
+                 pause and the speed.
+        """
+        return self.player.step, self.paused, self.steps_per_second
+
+    def render(self) -> None:
+        """Draw the replayed game."""
+        self.view.render(self.player.state, self.status(), round(1000 / self.steps_per_second))
+
+    def run_console(self) -> None:
+        """
+        The console replay loop: block on the input until a key is pressed or
+        the next step is due, and redraw only when something changed.
+        """
+        dirty = True
+        while self.running:
+            if dirty:
+                self.render()
+                dirty = False
+
+            if self.input_handler.wait_for_input(self.time_until_step()):
+                displayed = self.display_state()
+                self.running = self.handle_console_input()
+                if self.display_state() != displayed:
+                    dirty = True
+            if self.advance():
+                dirty = True
+
+    def run_pygame(self) -> None:
+        """
+        The pygame replay loop: sleep until the next step is due (forever when
+        paused) or an event arrives, and redraw at most once per frame, only
+        after a step, a seek, a change of the pause or the speed, or an
+        exposure of the window.
+        """
+        dirty = True
+        while self.running:
+            if dirty and self.frame_clock.due_ticks():
+                self.render()
+                dirty = False
+
+            # Sleep until the next step, the next frame if it is waiting to
+            # be drawn, or an event
+            timeout = self.time_until_step()
+            if dirty:
+                frame_timeout = self.frame_clock.time_until_tick()
+                timeout = frame_timeout if timeout is None else min(timeout, frame_timeout)
+
+            events = wait_pygame_events(timeout)
+            displayed = self.display_state()
+            self.running = self.handle_pygame_events(events)
+            if self.display_state() != displayed or any(event.type in self.redraw_events for event in events):
+                dirty = True
+            if self.advance():
+                dirty = True
+
+    def run(self) -> None:
+        """Start the replay loop."""
+        self.view.initialize()
+
+        try:
+            if self.use_pygame:
+                self.run_pygame()
+            else:
+                self.run_console()
+        except Exception as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+        finally:
+            if not self.use_pygame:
+                self.input_handler.restore_terminal()
+
+            self.player.close()
+            self.view.cleanup()
+            if self.use_pygame:
+                load_pygame().quit()
+            sys.exit()
@@ -0,0 +1,128 @@
+import time
+
+# What to do with the ticks missed when the loop falls behind
+TICK_POLICIES = ("catch_up", "drop")
+
+
+class TickScheduler:
+    """
+    Fixed-rate tick clock of the game loops, on time.monotonic_ns.
+
+    The deadlines are multiples of the interval from the start, not from the
+    last tick, so a late tick doesn't delay the following ones and the step
+    rate doesn't drift. When the loop falls behind, the "catch_up" policy
+    runs the missed ticks back to back (up to max_lag, older ticks are
+    dropped), and the "drop" policy runs a single tick and skips the others,
+    keeping the deadlines on the same grid.
+
+    The statistics of the ticks (late ticks, missed ticks, jitter) are kept
+    from the last reset.
+    """
+
+    def __init__(self, interval_ms: float, policy: str = "catch_up", max_lag_ms: float = 250,
+                 clock=time.monotonic_ns):
+        """
+        :param interval_ms: The interval between two ticks in milliseconds
+                            (0 for a tick at every call of due_ticks).
+        :param policy: "catch_up" or "drop", see TICK_POLICIES.
+        :param max_lag_ms: The maximum delay of a caught-up tick in
+                           milliseconds, older ticks are dropped.
+        :param clock: The clock in nanoseconds.
+        """
+        if policy not in TICK_POLICIES:
+            raise ValueError(f"Unknown tick policy {policy}, expected one of {', '.join(TICK_POLICIES)}")
+        if interval_ms < 0 or max_lag_ms < 0:
+            raise ValueError("The tick interval and the maximum lag must be positive")
+        self.policy = policy
+        self.max_lag_ns = int(max_lag_ms * 1_000_000)
+        self.clock = clock
+        self.interval_ns = int(interval_ms * 1_000_000)
+        self.reset()
+
+    def reset(self, keep_stats: bool = False) -> None:
+        """
+        Start again from now: the first tick is due immediately.
+
+        :param keep_stats: Keep the statistics instead of clearing them.
+        """
+        self.next_tick_ns = self.clock()
+        if keep_stats:
+            return
+        self.ticks = 0
+        self.missed_ticks = 0
+        self.late_ticks = 0
+        self.wakeups = 0
+        self.jitter_total_ns = 0
+        self.jitter_max_ns = 0
+
+    def set_interval(self, interval_ms: float) -> None:
+        """
+        Change the interval between two ticks, the next tick being due one new
+        interval after the last one.
+
+        :param interval_ms: The new interval in milliseconds.
+        """
+        interval_ns = int(interval_ms * 1_000_000)
+        if interval_ns < 0:
+            raise ValueError("The tick interval must be positive")
+        self.next_tick_ns += interval_ns - self.interval_ns
+        self.interval_ns = interval_ns
+
+    def time_until_tick(self) -> float:
+        """
+        :return: The time in seconds until the next tick is due, 0 if it is already due.
+        """
+        return max(0, self.next_tick_ns - self.clock()) / 1e9
+
+    def due_ticks(self) -> int:
+        """
+        Count the ticks due now and move the deadline past them. The caller
+        runs that many game updates.
+
+        :return: The number of ticks to run.
+        """
+        now = self.clock()
+        lag = now - self.next_tick_ns
+        if lag < 0:
+            return 0
+
+        interval = self.interval_ns
+        if interval == 0:
+            self.next_tick_ns = now
+            self._record(1, 0, lag)
+            return 1
+
+        due = lag // interval + 1
+        if self.policy == "catch_up":
+            ticks = min(due, self.max_lag_ns // interval + 1)
+        else:
+            ticks = 1
+        self.next_tick_ns += due * interval
+        # The jitter is the delay of the newest tick run
+        self._record(ticks, due - ticks, lag - (due - 1) * interval)
+        return ticks
+
+    def _record(self, ticks: int, missed: int, jitter_ns: int) -> None:
+        """Update the statistics with the ticks of a call of due_ticks."""
+        self.ticks += ticks
+        self.missed_ticks += missed
+        self.late_ticks += ticks - 1
+        self.wakeups += 1
+        self.jitter_total_ns += jitter_ns
+        if jitter_ns > self.jitter_max_ns:
+            self.jitter_max_ns = jitter_ns
+
+    def stats(self) -> dict:
+        """
+        :return: The statistics since the last reset: the ticks run, the ticks
+                 missed (dropped), the ticks run back to back to catch up,
+                 and the mean and max jitter (delay of the ticks after their
+                 deadline) in milliseconds.
+        """
+        return {
+            "ticks": self.ticks,
+            "missed_ticks": self.missed_ticks,
+            "late_ticks": self.late_ticks,
+            "jitter_mean_ms": self.jitter_total_ns / self.wakeups / 1e6 if self.wakeups else 0.0,
+            "jitter_max_ms": self.jitter_max_ns / 1e6,
+        }
@@ -1,5 +1,14 @@
-from .game_state import GameState
+from .free_cells import FreeCells
+from .game_state import GameState, GameStateSnapshot, MoveRecord
 from .snake import Snake
+from .zobrist import ZobristTable
 
-__all__ = ["Snake", "GameState"]
+__all__ = ["Snake", "GameState", "GameStateSnapshot", "MoveRecord", "FreeCells", "ZobristTable", "BatchGameState"]
 
+
+def __getattr__(name: str):
+    """Import the batch game state (and NumPy) only when it is used."""
+    if name == "BatchGameState":
+        from .batch_game_state import BatchGameState
+        return BatchGameState
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
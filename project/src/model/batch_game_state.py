@@ -0,0 +1,228 @@
+import numpy as np
+
+from ..seeding import make_rng
+
+# Direction codes: index in this table of the (dx, dy) movement
+DIRECTIONS = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+DIRECTION_DX = np.array([dx for dx, _ in DIRECTIONS], dtype=np.int64)
+DIRECTION_DY = np.array([dy for _, dy in DIRECTIONS], dtype=np.int64)
+
+
+class BatchGameState:
+    """
+    Simulates N games in lockstep with NumPy arrays.
+    Each game follows the same rules as GameState; a finished game is
+    immediately reset so that every step advances N running games.
+
+    Cells are identified by their id (y * grid_width + x). The body of each
+    game is stored in a ring buffer of grid_width * grid_height cells, the
+    head being at head_pointer and the tail length - 1 cells before it.
+
+    A step runs a fixed number of array operations whatever the number of
+    games, so its Python overhead is amortized over the batch: the bodies and
+    occupancy grids are indexed through flat views (row offset + cell), and
+    the updates run on every game, the games that crashed being reset anyway.
+    """
+
+    def __init__(self, num_games: int, grid_width: int, grid_height: int, wrap_around: bool = True,
+                 seed: int | None = None, stall_limit: int | None = None):
+        """
+        Initialize the games.
+
+        :param num_games: The number of games simulated in lockstep.
+        :param grid_width: Width of the grid.
+        :param grid_height: Height of the grid.
+        :param wrap_around: If True, the snakes teleport to the edges.
+        :param seed: The seed of the food spawns, or None for a non reproducible run.
+        :param stall_limit: Number of steps without eating after which a game
+                            is stopped, twice the number of cells by default.
+        """
+        self.num_games = num_games
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.wrap_around = wrap_around
+        self.cell_count = grid_width * grid_height
+        self.stall_limit = stall_limit if stall_limit is not None else 2 * self.cell_count
+        self.rng = np.random.default_rng(make_rng(seed, "batch_food").getrandbits(64))
+
+        self._rows = np.arange(num_games)
+        self._start_cell = (grid_height // 2) * grid_width + grid_width // 2
+
+        self.body = np.zeros((num_games, self.cell_count), dtype=np.int32)
+        self.occupancy = np.zeros((num_games, self.cell_count), dtype=bool)
+        # Flat views of the bodies and occupancy grids, indexed by row offset + cell
+        self._row_offsets = self._rows * self.cell_count
+        self._body_flat = self.body.reshape(-1)
+        self._occupancy_flat = self.occupancy.reshape(-1)
+        self.head_pointer = np.zeros(num_games, dtype=np.int64)
+        self.length = np.ones(num_games, dtype=np.int64)
+        self.head = np.full(num_games, self._start_cell, dtype=np.int64)
+        self.direction = np.zeros(num_games, dtype=np.int64)
+        self.food = np.full(num_games, -1, dtype=np.int64)
+        self.score = np.ones(num_games, dtype=np.int64)
+        self.episode_steps = np.zeros(num_games, dtype=np.int64)
+        self.last_apple_step = np.zeros(num_games, dtype=np.int64)
+
+        # Outcome of the last step, before the finished games were reset
+        self.done = np.zeros(num_games, dtype=bool)
+        self.won = np.zeros(num_games, dtype=bool)
+
+        # Statistics over all the finished episodes
+        self.total_steps = 0
+        self.episodes = 0
+        self.wins = 0
+        self.timeouts = 0
+        self.total_apples = 0
+        self.steps_to_win = 0
+
+        self.reset(np.ones(num_games, dtype=bool))
+
+    def reset(self, mask: np.ndarray) -> None:
+        """
+        Reset the selected games to their initial state.
+
+        :param mask: Boolean array selecting the games to reset.
+        """
+        rows = self._rows[mask]
+        if rows.size == 0:
+            return
+
+        self.occupancy[rows] = False
+        self.body[rows, 0] = self._start_cell
+        self.occupancy[rows, self._start_cell] = True
+        self.head_pointer[rows] = 0
+        self.length[rows] = 1
+        self.head[rows] = self._start_cell
+        self.direction[rows] = 0
+        self.score[rows] = 1
+        self.episode_steps[rows] = 0
+        self.last_apple_step[rows] = 0
+        self._spawn_food(rows)
+
+    def _spawn_food(self, rows: np.ndarray) -> None:
+        """
+        Spawn the food of the selected games in a random free cell.
+
+        :param rows: Indices of the games.
+        """
+        if rows.size == 0:
+            return
+
+        free_count = self.cell_count - self.length[rows]
+        has_room = free_count > 0
+        self.food[rows[~has_room]] = -1
+        rows = rows[has_room]
+        if rows.size == 0:
+            return
+
+        # Take the r-th free cell of each grid, r uniform in [0, free_count)
+        rank = self.rng.integers(0, free_count[has_room])
+        free_cells_seen = np.cumsum(~self.occupancy[rows], axis=1)
+        self.food[rows] = np.argmax(free_cells_seen > rank[:, None], axis=1)
+
+    def step(self, directions: np.ndarray) -> np.ndarray:
+        """
+        Move every snake one cell, then reset the games that ended.
+
+        :param directions: Direction code (index in DIRECTIONS) of each game.
+        :return: Boolean array of the games that ended during this step.
+        """
+        grid_width, grid_height, cell_count = self.grid_width, self.grid_height, self.cell_count
+        row_offsets = self._row_offsets
+        body = self._body_flat
+        occupancy = self._occupancy_flat
+        directions = np.asarray(directions, dtype=np.int64)
+        self.direction[:] = directions
+
+        # 1. Calculate the new position of the heads
+        head_x = self.head % grid_width + DIRECTION_DX[directions]
+        head_y = self.head // grid_width + DIRECTION_DY[directions]
+
+        # 2. Handle the collisions with the walls / teleportation
+        if self.wrap_around:
+            head_x %= grid_width
+            head_y %= grid_height
+            crashed = None
+        else:
+            crashed = (head_x < 0) | (head_x >= grid_width) | (head_y < 0) | (head_y >= grid_height)
+            np.clip(head_x, 0, grid_width - 1, out=head_x)
+            np.clip(head_y, 0, grid_height - 1, out=head_y)
+        new_head = head_y * grid_width + head_x
+
+        # 3. Check the collisions with the bodies (the tail included, as in GameState)
+        new_head_index = row_offsets + new_head
+        hit = occupancy[new_head_index]
+        crashed = hit if crashed is None else crashed | hit
+        alive = ~crashed
+        ate = alive & (new_head == self.food)
+
+        # 4. Remove the tails of the snakes that didn't eat
+        tail_index = row_offsets + body[row_offsets + (self.head_pointer - self.length + 1) % cell_count]
+        occupancy[tail_index[alive ^ ate]] = False
+
+        # 5. Push the new heads. The games that crashed are reset below, so
+        # their bodies are updated too rather than selected out.
+        self.head_pointer += alive
+        self.head_pointer %= cell_count
+        body[row_offsets + self.head_pointer] = new_head
+        occupancy[new_head_index] = True
+        self.head[:] = new_head
+        self.length += ate
+        np.copyto(self.score, self.length, where=ate)
+        self.episode_steps += alive
+        np.copyto(self.last_apple_step, self.episode_steps, where=ate)
+
+        # 6. Check the victories and spawn the food
+        won = ate & (self.length == cell_count)
+        if ate.any():
+            self._spawn_food(self._rows[ate & ~won])
+
+        # 7. Stop the games going in circles without eating
+        timed_out = alive & (self.episode_steps - self.last_apple_step > self.stall_limit)
+
+        done = crashed | won | timed_out
+        self.done = done
+        self.won = won
+        self.total_steps += int(np.count_nonzero(alive))
+
+        # 8. Record and reset the finished games
+        if done.any():
+            self.episodes += int(done.sum())
+            self.wins += int(won.sum())
+            self.timeouts += int(timed_out.sum())
+            self.total_apples += int((self.length[done] - 1).sum())
+            self.steps_to_win += int(self.episode_steps[won].sum())
+            self.reset(done)
+
+        return done
+
+    def tail_cells(self) -> np.ndarray:
+        """
+        :return: The cell id of the tail of each game.
+        """
+        tail_pointer = (self.head_pointer - self.length + 1) % self.cell_count
+        return self.body[self._rows, tail_pointer]
+
+    def get_body(self, game: int) -> list[tuple[int, int]]:
+        """
+        Get the body of a game as (x, y) tuples, the head first.
+
+        :param game: Index of the game.
+        :return: The cells of the body.
+        """
+        length = int(self.length[game])
+        pointers = (self.head_pointer[game] - np.arange(length)) % self.cell_count
+        cells = self.body[game, pointers]
+        return [(int(cell) % self.grid_width, int(cell) // self.grid_width) for cell in cells]
+
+    def get_food(self, game: int) -> tuple[int, int] | None:
+        """
+        Get the position of the food of a game.
+
+        :param game: Index of the game.
+        :return: The (x, y) position of the food, or None if there is none.
+        """
+        food = int(self.food[game])
+        if food < 0:
+            return None
+        return (food % self.grid_width, food // self.grid_width)
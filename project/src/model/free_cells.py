@@ -0,0 +1,128 @@
+import random
+
+
+class FreeCells:
+    """
+    Set of the free cells of the grid supporting constant-time insertion,
+    removal and uniform random sampling.
+
+    The free cells are kept in a dense array, and a position map gives for
+    every cell its index in that array (-1 if the cell is not free).
+    Removing a cell swaps it with the last free cell before popping it.
+    """
+
+    def __init__(self, grid_width: int, grid_height: int):
+        """
+        Initialize the index with every cell of the grid free.
+
+        :param grid_width: Width of the grid.
+        :param grid_height: Height of the grid.
+        """
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        # Shared (x, y) tuples so that sampling doesn't allocate
+        self._cells = [(x, y) for y in range(grid_height) for x in range(grid_width)]
+        self._free: list[int] = []
+        self._position: list[int] = []
+        self.reset()
+
+    def reset(self) -> None:
+        """Mark every cell of the grid as free."""
+        cell_count = self.grid_width * self.grid_height
+        self._free = list(range(cell_count))
+        self._position = list(range(cell_count))
+
+    def add(self, cell: tuple[int, int]) -> None:
+        """
+        Mark a cell as free.
+
+        :param cell: The (x, y) coordinates of the cell.
+        """
+        cell_id = cell[1] * self.grid_width + cell[0]
+        if self._position[cell_id] == -1:
+            self._position[cell_id] = len(self._free)
+            self._free.append(cell_id)
+
+    def remove(self, cell: tuple[int, int]) -> int:
+        """
+        Mark a cell as occupied.
+
+        :param cell: The (x, y) coordinates of the cell.
+        :return: The position the cell had in the free cells (for restore),
+                 -1 if it was not free.
+        """
+        cell_id = cell[1] * self.grid_width + cell[0]
+        position = self._position[cell_id]
+        if position == -1:
+            return -1
+
+        last_id = self._free.pop()
+        if last_id != cell_id:
+            self._free[position] = last_id
+            self._position[last_id] = position
+        self._position[cell_id] = -1
+        return position
+
+    def restore(self, cell: tuple[int, int], position: int) -> None:
+        """
+        Undo the last remove of a cell, putting it back at its position so
+        that the order of the free cells, hence the following samples, is
+        exactly the one before the remove.
+
+        :param cell: The (x, y) coordinates of the cell.
+        :param position: The position returned by remove.
+        """
+        if position == -1:
+            return
+        cell_id = cell[1] * self.grid_width + cell[0]
+        if position < len(self._free):
+            # The cell that replaced it goes back to the end
+            moved_id = self._free[position]
+            self._position[moved_id] = len(self._free)
+            self._free.append(moved_id)
+            self._free[position] = cell_id
+        else:
+            self._free.append(cell_id)
+        self._position[cell_id] = position
+
+    def getstate(self) -> tuple[list[int], list[int]]:
+        """
+        :return: A copy of the internal state, for setstate.
+        """
+        return self._free.copy(), self._position.copy()
+
+    def setstate(self, state: tuple[list[int], list[int]]) -> None:
+        """
+        Restore the internal state returned by getstate.
+
+        :param state: The state, left untouched so that it can be restored again.
+        """
+        self._free = state[0].copy()
+        self._position = state[1].copy()
+
+    def sample(self, rng: random.Random) -> tuple[int, int] | None:
+        """
+        Pick a free cell uniformly at random.
+
+        :param rng: The random generator to use.
+        :return: The (x, y) coordinates of the cell, or None if the grid is full.
+        """
+        if not self._free:
+            return None
+        index = rng.randrange(len(self._free))
+        return self._cells[self._free[index]]
+
+    def __len__(self) -> int:
+        """
+        :return: The number of free cells.
+        """
+        return len(self._free)
+
+    def __contains__(self, cell: tuple[int, int]) -> bool:
+        """
+        Check if a given (x, y) coordinate is free.
+
+        :param cell: The (x, y) coordinate to check.
+        :return: True if the cell is free, False otherwise.
+        """
+        return self._position[cell[1] * self.grid_width + cell[0]] != -1
@@ -1,26 +1,72 @@
+from .free_cells import FreeCells
 from .snake import Snake
+from .zobrist import ZobristTable
+from dataclasses import dataclass
+from typing import NamedTuple
 import random
 
 
+class MoveRecord(NamedTuple):
+    """What GameState.apply_move changed, for GameState.undo_move."""
+    direction: tuple[int, int]
+    # The head added, None if the snake didn't move (game over)
+    head: tuple[int, int] | None
+    # The position of the head in the free cells before the move
+    head_position: int
+    # The tail removed, None if the snake grew or didn't move
+    tail: tuple[int, int] | None
+    food: tuple[int, int] | None
+    score: int
+    game_over: bool
+    win: bool
+    # The state of the food generator before a food spawn, None if no food was spawned
+    rng_state: tuple | None
+    zobrist: int
+
+
+@dataclass
+class GameStateSnapshot:
+    """A copy of the state of a game, see GameState.snapshot."""
+    snake: Snake
+    food: tuple[int, int] | None
+    free_cells: tuple[list[int], list[int]]
+    score: int
+    game_over: bool
+    win: bool
+    wrap_around: bool
+    rng_state: tuple
+    zobrist: int
+
+
 class GameState:
     """
     Represents the game state of the Snake game.
     Manages the game logic: the snake, the food, the score, etc.
     """
 
-    def __init__(self, grid_width: int, grid_height: int, wrap_around: bool = True):
+    def __init__(self, grid_width: int, grid_height: int, wrap_around: bool = True, rng: random.Random | None = None,
+                 zobrist: ZobristTable | None = None):
         """
         Initialize the game state.
 
         :param grid_width: Width of the grid.
         :param grid_height: Height of the grid.
         :param wrap_around: If True, the snake teleports to the edges.
+        :param rng: Random generator used to spawn the food. A fresh unseeded
+                    generator is used if None.
+        :param zobrist: The keys of the state hash, the shared table of the
+                        grid size if None.
         """
         self.grid_width = grid_width
         self.grid_height = grid_height
         self.wrap_around = wrap_around
+        self.rng = rng if rng is not None else random.Random()
+        self.zobrist = zobrist if zobrist is not None else ZobristTable.for_grid(grid_width, grid_height)
+        # Hash of the snake, maintained on every move (the food is added on read)
+        self._snake_hash = 0
         
         self.snake: Snake | None = None
+        self.free_cells = FreeCells(grid_width, grid_height)
         self.food: tuple[int, int] | None = None
         self.game_over = False
         self.win = False
@@ -34,17 +80,38 @@ class GameState:
         center_y = self.grid_height // 2
         
         self.snake = Snake((center_x, center_y), (1, 0))
+        self._snake_hash = self.zobrist.head_body_keys[center_y * self.grid_width + center_x]
+        self.free_cells.reset()
+        self.free_cells.remove((center_x, center_y))
         self.spawn_food()
         self.game_over = False
         self.win = False
         self.score = 1
 
+    @property
+    def zobrist_hash(self) -> int:
+        """
+        64-bit Zobrist hash of the state (the cells of the snake, its head and
+        the food), maintained in O(1) per move, for the transposition tables
+        of the search strategies.
+
+        :return: The hash, equal to compute_zobrist_hash().
+        """
+        food = self.food
+        if food is None:
+            return self._snake_hash
+        return self._snake_hash ^ self.zobrist.food_keys[food[1] * self.grid_width + food[0]]
+
+    def compute_zobrist_hash(self) -> int:
+        """
+        :return: The Zobrist hash of the state computed from scratch, in
+                 O(length of the snake).
+        """
+        return self.zobrist.hash(self.snake.body, self.food)
+
     def spawn_food(self) -> None:
         """Spawn the food in a random available cell."""
-        all_cells = {(x, y) for x in range(self.grid_width)
-                     for y in range(self.grid_height)}
-        available = all_cells - set(self.snake.body)
-        self.food = random.choice(tuple(available)) if available else None
+        self.food = self.free_cells.sample(self.rng)
 
     def update(self, direction: tuple[int, int]) -> None:
         """
@@ -76,22 +143,152 @@ class GameState:
         new_head = (new_head_x, new_head_y)
 
         # 4. Check the collision with itself
-        if new_head in self.snake.body:
+        if new_head in self.snake:
             self.end_game()
             return
 
-        # 5. Check the collision with the food
+        # 5. Check the collision with the food, and update the hash of the snake
+        zobrist = self.zobrist
+        grid_width = self.grid_width
+        snake_hash = (self._snake_hash ^ zobrist.head_keys[head_y * grid_width + head_x]
+                      ^ zobrist.head_body_keys[new_head_y * grid_width + new_head_x])
         if self.food is not None and new_head == self.food:
             self.snake.grow(new_head)
+            self.free_cells.remove(new_head)
             self.score = len(self.snake)
             self.spawn_food()
         else:
-            self.snake.move(new_head)
+            tail = self.snake.move(new_head)
+            self.free_cells.add(tail)
+            self.free_cells.remove(new_head)
+            snake_hash ^= zobrist.body_keys[tail[1] * grid_width + tail[0]]
+        self._snake_hash = snake_hash
 
         # 6. Check the victory
         if len(self.snake) == self.grid_width * self.grid_height:
             self.end_game(win=True)
 
+    def apply_move(self, direction: tuple[int, int]) -> MoveRecord:
+        """
+        Update the game as update does, and return what changed so that the
+        move can be undone with undo_move. Meant for the search strategies
+        exploring moves on a game state: the food spawns of the explored
+        moves are undone as well, including the state of the food generator.
+
+        :param direction: The direction (dx, dy) in which to move the snake.
+        :return: The record of the move.
+        """
+        snake = self.snake
+        record_direction = snake.direction
+        food = self.food
+        score = self.score
+        snake_hash = self._snake_hash
+        if self.game_over:
+            return MoveRecord(record_direction, None, -1, None, food, score, True, self.win, None, snake_hash)
+
+        snake.direction = direction
+        head_x, head_y = snake.get_head()
+        new_head_x = head_x + direction[0]
+        new_head_y = head_y + direction[1]
+        if self.wrap_around:
+            new_head_x %= self.grid_width
+            new_head_y %= self.grid_height
+        elif not (0 <= new_head_x < self.grid_width and 0 <= new_head_y < self.grid_height):
+            self.end_game()
+            return MoveRecord(record_direction, None, -1, None, food, score, False, False, None, snake_hash)
+
+        new_head = (new_head_x, new_head_y)
+        if new_head in snake:
+            self.end_game()
+            return MoveRecord(record_direction, None, -1, None, food, score, False, False, None, snake_hash)
+
+        zobrist = self.zobrist
+        grid_width = self.grid_width
+        self._snake_hash = (snake_hash ^ zobrist.head_keys[head_y * grid_width + head_x]
+                            ^ zobrist.head_body_keys[new_head_y * grid_width + new_head_x])
+        if food is not None and new_head == food:
+            rng_state = self.rng.getstate()
+            snake.grow(new_head)
+            head_position = self.free_cells.remove(new_head)
+            self.score = len(snake)
+            self.spawn_food()
+            tail = None
+        else:
+            rng_state = None
+            tail = snake.move(new_head)
+            self.free_cells.add(tail)
+            head_position = self.free_cells.remove(new_head)
+            self._snake_hash ^= zobrist.body_keys[tail[1] * grid_width + tail[0]]
+
+        if len(snake) == self.grid_width * self.grid_height:
+            self.end_game(win=True)
+        return MoveRecord(record_direction, new_head, head_position, tail, food, score, False, False, rng_state,
+                          snake_hash)
+
+    def undo_move(self, record: MoveRecord) -> None:
+        """
+        Undo the last move applied with apply_move. The moves must be undone
+        in the reverse order of their application.
+
+        :param record: The record returned by apply_move.
+        """
+        head = record.head
+        if head is not None:
+            tail = record.tail
+            if tail is None:
+                self.snake.undo_grow()
+            else:
+                self.snake.undo_move(tail)
+            # Reverse order of apply_move, so that the order of the free cells is restored
+            self.free_cells.restore(head, record.head_position)
+            if tail is not None:
+                self.free_cells.remove(tail)
+            if record.rng_state is not None:
+                self.rng.setstate(record.rng_state)
+
+        self.snake.direction = record.direction
+        self.food = record.food
+        self.score = record.score
+        self.game_over = record.game_over
+        self.win = record.win
+        self._snake_hash = record.zobrist
+
+    def snapshot(self) -> GameStateSnapshot:
+        """
+        Copy the state of the game, for restore. The copy costs a few copies
+        of flat lists, instead of a deepcopy of the whole object graph.
+
+        :return: The snapshot.
+        """
+        return GameStateSnapshot(
+            snake=self.snake.copy(),
+            food=self.food,
+            free_cells=self.free_cells.getstate(),
+            score=self.score,
+            game_over=self.game_over,
+            win=self.win,
+            wrap_around=self.wrap_around,
+            rng_state=self.rng.getstate(),
+            zobrist=self._snake_hash,
+        )
+
+    def restore(self, snapshot: GameStateSnapshot) -> None:
+        """
+        Restore the state of the game saved by snapshot. A snapshot can be
+        restored any number of times.
+
+        :param snapshot: The snapshot.
+        """
+        self.snake = snapshot.snake.copy()
+        self.free_cells.setstate(snapshot.free_cells)
+        self.food = snapshot.food
+        self.score = snapshot.score
+        self.game_over = snapshot.game_over
+        self.win = snapshot.win
+        self.wrap_around = snapshot.wrap_around
+        self.rng.setstate(snapshot.rng_state)
+        self._snake_hash = snapshot.zobrist
+
     def end_game(self, win: bool = False) -> None:
         """
         Stop the game and set the game_over flag.
@@ -1,7 +1,15 @@
+from collections import deque
+from collections.abc import Sequence
+
+
 class Snake:
     """
     Represents the snake in the game.
     Manages its body, movement and growth.
+
+    The body is stored in a deque (head on the left, tail on the right) and
+    mirrored in an occupancy set, so moving, growing and collision checks
+    don't depend on the length of the snake.
     """
 
     def __init__(self, start_pos: tuple[int, int], start_direction: tuple[int, int]):
@@ -11,8 +19,34 @@ class Snake:
         :param start_pos: The (x, y) starting position of the snake's head.
         :param start_direction: The (dx, dy) starting direction.
         """
-        self.body: list[tuple[int, int]] = [start_pos]
+        self.body: deque[tuple[int, int]] = deque([start_pos])
         self.direction = start_direction
+        self._occupied: set[tuple[int, int]] = {start_pos}
+
+    @classmethod
+    def from_body(cls, body: Sequence[tuple[int, int]], direction: tuple[int, int]) -> "Snake":
+        """
+        Build a snake from the cells of its body.
+
+        :param body: The (x, y) cells of the body, the head first.
+        :param direction: The (dx, dy) direction of the snake.
+        :return: The snake.
+        """
+        snake = cls(body[0], direction)
+        snake.body.extend(body[1:])
+        snake._occupied.update(body)
+        return snake
+
+    def copy(self) -> "Snake":
+        """
+        :return: An independent copy of the snake. The occupancy set is
+                 copied as is, without hashing the cells again.
+        """
+        snake = Snake.__new__(Snake)
+        snake.body = self.body.copy()
+        snake.direction = self.direction
+        snake._occupied = self._occupied.copy()
+        return snake
 
     def get_head(self) -> tuple[int, int]:
         """
@@ -20,14 +54,26 @@ class Snake:
         """
         return self.body[0]
 
-    def move(self, new_head: tuple[int, int]) -> None:
+    def get_tail(self) -> tuple[int, int]:
+        """
+        :return: The (x, y) coordinates of the snake's tail.
+        """
+        return self.body[-1]
+
+    def move(self, new_head: tuple[int, int]) -> tuple[int, int]:
         """
         Move the snake to a new head position and remove the tail.
 
         :param new_head: The (x, y) coordinates of the new head.
+        :return: The (x, y) coordinates of the removed tail.
         """
-        self.body.insert(0, new_head)
-        self.body.pop()
+        self.body.appendleft(new_head)
+        tail = self.body.pop()
+        # Remove the tail before adding the head so that moving into the
+        # cell the tail just left keeps the occupancy set consistent
+        self._occupied.discard(tail)
+        self._occupied.add(new_head)
+        return tail
 
     def grow(self, new_head: tuple[int, int]) -> None:
         """
@@ -35,7 +81,23 @@ class Snake:
 
         :param new_head: The (x, y) coordinates of the new head.
         """
-        self.body.insert(0, new_head)
+        self.body.appendleft(new_head)
+        self._occupied.add(new_head)
+
+    def undo_move(self, tail: tuple[int, int]) -> None:
+        """
+        Undo the last move: remove the head and put the tail back.
+
+        :param tail: The (x, y) coordinates of the tail removed by the move.
+        """
+        head = self.body.popleft()
+        self._occupied.discard(head)
+        self.body.append(tail)
+        self._occupied.add(tail)
+
+    def undo_grow(self) -> None:
+        """Undo the last growth: remove the head."""
+        self._occupied.discard(self.body.popleft())
 
     def check_self_collision(self) -> bool:
         """
@@ -43,7 +105,9 @@ class Snake:
 
         :return: True if a collision occurred, False otherwise.
         """
-        return self.get_head() in self.body[1:]
+        # A cell occupied twice collapses in the set, so the set is smaller
+        # than the body exactly when the head overlaps another segment
+        return len(self._occupied) != len(self.body)
 
     def __len__(self) -> int:
         """
@@ -58,5 +122,4 @@ class Snake:
         :param item: The (x, y) coordinate to check.
         :return: True if the coordinate is in the snake's body, False otherwise.
         """
-        return item in self.body
-
+        return item in self._occupied
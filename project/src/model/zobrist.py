@@ -0,0 +1,73 @@
+from array import array
+from collections.abc import Sequence
+import random
+
+
+class ZobristTable:
+    """
+    Random 64-bit keys of the cells of a grid, for Zobrist hashing of game
+    states: the hash of a state is the XOR of the body key of every cell of
+    the snake, the head key of its head and the food key of the food, so
+    that a move updates it with a few XORs whatever the length of the snake.
+
+    The keys are drawn from their own generator, never from the food
+    generator of a game, so hashing doesn't change the food spawns.
+    """
+
+    _tables: dict[tuple[int, int], "ZobristTable"] = {}
+
+    def __init__(self, grid_width: int, grid_height: int, rng: random.Random):
+        """
+        Draw the keys of a grid.
+
+        :param grid_width: Width of the grid.
+        :param grid_height: Height of the grid.
+        :param rng: The random generator of the keys.
+        """
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        cell_count = grid_width * grid_height
+        self.body_keys = array("Q", rng.randbytes(cell_count * 8))
+        self.head_keys = array("Q", rng.randbytes(cell_count * 8))
+        self.food_keys = array("Q", rng.randbytes(cell_count * 8))
+        # The head key and the body key of a cell, XORed together: a new head
+        # adds both in a single lookup
+        self.head_body_keys = array("Q", [head ^ body for head, body in zip(self.head_keys, self.body_keys)])
+
+    @classmethod
+    def for_grid(cls, grid_width: int, grid_height: int) -> "ZobristTable":
+        """
+        Get the shared table of a grid size, drawn on first use. The keys only
+        depend on the grid size, so the hashes of the states are the same
+        across games and processes.
+
+        :param grid_width: Width of the grid.
+        :param grid_height: Height of the grid.
+        :return: The table.
+        """
+        key = (grid_width, grid_height)
+        table = cls._tables.get(key)
+        if table is None:
+            table = cls(grid_width, grid_height, random.Random(f"{grid_width}x{grid_height}:zobrist"))
+            cls._tables[key] = table
+        return table
+
+    def hash(self, body: Sequence[tuple[int, int]], food: tuple[int, int] | None) -> int:
+        """
+        Hash a state from scratch, in O(length of the snake).
+
+        :param body: The (x, y) cells of the body, the head first.
+        :param food: The (x, y) position of the food, or None.
+        :return: The 64-bit hash.
+        """
+        grid_width = self.grid_width
+        body_keys = self.body_keys
+        value = 0
+        for x, y in body:
+            value ^= body_keys[y * grid_width + x]
+        head = next(iter(body), None)
+        if head is not None:
+            value ^= self.head_keys[head[1] * grid_width + head[0]]
+        if food is not None:
+            value ^= self.food_keys[food[1] * grid_width + food[0]]
+        return value
@@ -0,0 +1,30 @@
+from .replay_index import ReplayIndex
+from .replay_player import ReplayPlayer
+from .replay_reader import ReplayReader, ReplayChunk
+from .replay_recorder import ReplayRecorder
+from .replay_state import ReplayState
+from .replay_writer import ReplayWriter
+
+__all__ = [
+    "ReplayWriter",
+    "ReplayReader",
+    "ReplayChunk",
+    "ReplayRecorder",
+    "ReplayState",
+    "ReplayIndex",
+    "ReplayPlayer",
+    "VerificationResult",
+    "find_replays",
+    "verify_replay",
+    "verify_replays",
+]
+
+_VERIFIER_NAMES = {"VerificationResult", "find_replays", "verify_replay", "verify_replays"}
+
+
+def __getattr__(name: str):
+    """Import the verifier (and multiprocessing) only when it is used."""
+    if name in _VERIFIER_NAMES:
+        from . import replay_verifier
+        return getattr(replay_verifier, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,72 @@
+import struct
+
+# File layout (native byte order, checked with the byte order mark):
+#   header:   magic, byte order mark, format version, metadata size
+#   metadata: zlib compressed JSON (config, seed, wrap around, state of the food generator)
+#   chunks:   chunk header (tag, first step, step count, event count, payload size)
+#             then the zlib compressed payload:
+#               directions:   2 bits per step, 4 steps per byte (first step in the low bits)
+#               event steps:  uint32 * event count (steps since the previous event of the
+#                             chunk, or since the first step of the chunk for the first one)
+#               event kinds:  uint8  * event count
+#               event values: uint32 * event count
+#   trailer:  tag, total steps, outcome, score (missing if the recording was interrupted)
+MAGIC = b"SRPL"
+FORMAT_VERSION = 1
+BYTE_ORDER_MARK = 0x01020304
+HEADER = struct.Struct("=4sIII")
+CHUNK_TAG = b"CHNK"
+CHUNK_HEADER = struct.Struct("=4sQIII")
+TRAILER_TAG = b"SEND"
+TRAILER = struct.Struct("=4sQBI")
+
+FILE_EXTENSION = ".srpl"
+
+# Direction codes of the steps, turning left being +1 (mod 4)
+DIRECTIONS = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+# Kinds of events, recorded with the number of steps played before them
+EVENT_FOOD = 0         # value: cell id of the new food
+EVENT_WRAP_AROUND = 1  # value: 1 if the teleportation was enabled, 0 if it was disabled
+NO_FOOD = 0xFFFFFFFF   # value of a food event when the board is full
+
+# Outcomes of a game
+OUTCOME_ABORTED = 0
+OUTCOME_DEATH = 1
+OUTCOME_WIN = 2
+OUTCOME_TIMEOUT = 3
+OUTCOME_NAMES = {
+    OUTCOME_ABORTED: "aborted",
+    OUTCOME_DEATH: "death",
+    OUTCOME_WIN: "win",
+    OUTCOME_TIMEOUT: "timeout",
+}
+
+# Byte -> the 4 direction codes it packs
+_UNPACK_TABLE = [bytes((byte >> shift) & 3 for shift in (0, 2, 4, 6)) for byte in range(256)]
+
+
+def pack_directions(codes: bytes | bytearray) -> bytes:
+    """
+    Pack direction codes (one per byte) 4 per byte.
+
+    :param codes: The direction codes.
+    :return: The packed codes, the last byte padded with zeros.
+    """
+    padded = bytes(codes) + bytes(-len(codes) % 4)
+    return bytes(
+        padded[i] | padded[i + 1] << 2 | padded[i + 2] << 4 | padded[i + 3] << 6
+        for i in range(0, len(padded), 4)
+    )
+
+
+def unpack_directions(packed: bytes, count: int) -> bytes:
+    """
+    Unpack direction codes packed by pack_directions.
+
+    :param packed: The packed codes.
+    :param count: The number of codes.
+    :return: The direction codes, one per byte.
+    """
+    return b"".join(map(_UNPACK_TABLE.__getitem__, packed))[:count]
@@ -0,0 +1,291 @@
+from array import array
+import bisect
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+
+from .replay_format import (
+    BYTE_ORDER_MARK, DIRECTIONS, DIRECTION_CODES, EVENT_FOOD, EVENT_WRAP_AROUND, NO_FOOD,
+    pack_directions, unpack_directions,
+)
+from .replay_reader import ReplayReader
+from .replay_state import ReplayState
+from ..model.snake import Snake
+
+# File layout (native byte order, checked with the byte order mark):
+#   header:            magic, byte order mark, format version, size of the replay file,
+#                      total steps, keyframe interval, keyframe count
+#   steps:             uint64 * keyframe count (step of each keyframe, increasing)
+#   chunk offsets:     uint64 * keyframe count (offset in the replay file of the chunk
+#                      holding the steps following the keyframe)
+#   keyframe offsets:  uint64 * keyframe count (offset of the keyframe in this file)
+#   keyframes:         keyframe header (head cell, length, food cell, wrap around,
+#                      game over, win, body size) then the zlib compressed body: the
+#                      directions from each segment to the previous one, 2 bits each
+INDEX_MAGIC = b"SRPI"
+INDEX_FORMAT_VERSION = 1
+INDEX_HEADER = struct.Struct("=4sIIQQII")
+KEYFRAME_HEADER = struct.Struct("=IIIBBBI")
+INDEX_EXTENSION = ".srpi"
+
+
+def index_path(replay_path: str) -> str:
+    """
+    :param replay_path: The path of a replay file.
+    :return: The path of its index file.
+    """
+    return os.path.splitext(replay_path)[0] + INDEX_EXTENSION
+
+
+def encode_keyframe(state: ReplayState) -> bytes:
+    """
+    Encode the full state of a replayed game.
+
+    :param state: The state.
+    :return: The keyframe.
+    """
+    grid_width = state.grid_width
+    grid_height = state.grid_height
+    body = state.snake.body
+    head_x, head_y = body[0]
+
+    # Direction of the move from each segment to the one before it, the
+    # wrap around being handled by taking the differences modulo the grid
+    moves = bytearray()
+    previous_x, previous_y = head_x, head_y
+    for index in range(1, len(body)):
+        x, y = body[index]
+        dx = (previous_x - x) % grid_width
+        dy = (previous_y - y) % grid_height
+        moves.append(DIRECTION_CODES[(1 if dx == 1 else -1 if dx else 0, 1 if dy == 1 else -1 if dy else 0)])
+        previous_x, previous_y = x, y
+
+    food = NO_FOOD if state.food is None else state.food[1] * grid_width + state.food[0]
+    compressed_body = zlib.compress(pack_directions(moves))
+    return KEYFRAME_HEADER.pack(
+        head_y * grid_width + head_x, len(body), food, state.wrap_around, state.game_over, state.win,
+        len(compressed_body)
+    ) + compressed_body
+
+
+def decode_keyframe(data, step: int, grid_width: int, grid_height: int) -> ReplayState:
+    """
+    Decode a keyframe encoded by encode_keyframe.
+
+    :param data: A buffer starting with the keyframe.
+    :param step: The step of the keyframe.
+    :param grid_width: Width of the grid.
+    :param grid_height: Height of the grid.
+    :return: The state.
+    """
+    head, length, food, wrap_around, game_over, win, body_size = KEYFRAME_HEADER.unpack_from(data, 0)
+    moves = unpack_directions(
+        zlib.decompress(data[KEYFRAME_HEADER.size:KEYFRAME_HEADER.size + body_size]), length - 1)
+
+    x, y = head % grid_width, head // grid_width
+    body = [(x, y)]
+    for code in moves:
+        dx, dy = DIRECTIONS[code]
+        x = (x - dx) % grid_width
+        y = (y - dy) % grid_height
+        body.append((x, y))
+
+    state = ReplayState(grid_width, grid_height, bool(wrap_around))
+    state.snake = Snake.from_body(body, (1, 0))
+    state.set_food(food)
+    state.score = length
+    state.game_over = bool(game_over)
+    state.win = bool(win)
+    state.step = step
+    return state
+
+
+def initial_state(reader: ReplayReader) -> ReplayState:
+    """
+    :param reader: The reader of a replay.
+    :return: The state of the replayed game before its first step (without food).
+    """
+    game_config = reader.config["game"]
+    return ReplayState(game_config["grid_width"], game_config["grid_height"], reader.metadata["wrap_around"])
+
+
+def apply_event(state: ReplayState, kind: int, value: int) -> None:
+    """
+    Apply a recorded event to a replayed game.
+
+    :param state: The state.
+    :param kind: The kind of event.
+    :param value: The value of the event.
+    """
+    if kind == EVENT_FOOD:
+        state.set_food(value)
+    elif kind == EVENT_WRAP_AROUND:
+        state.wrap_around = bool(value)
+
+
+def encode_index(reader: ReplayReader, keyframe_interval: int = 4096) -> bytes:
+    """
+    Replay a game from start to end and encode the keyframes of its index.
+
+    A keyframe is written every keyframe_interval steps, or less often when
+    the snake is longer than that, so that the index stays smaller than the
+    replay however long the snake grows. A keyframe is always written at the
+    start of the game.
+
+    :param reader: The reader of the replay.
+    :param keyframe_interval: The minimum number of steps between two keyframes.
+    :return: The content of the index file.
+    """
+    state = initial_state(reader)
+    steps = array("Q")
+    chunk_offsets = array("Q")
+    keyframes = []
+    keyframes_size = 0
+    last_keyframe = None
+
+    for chunk in reader.chunks():
+        events = chunk.events
+        event_index = 0
+        # Events of the current step (the initial food at step 0)
+        while event_index < len(events) and events[event_index][0] == state.step:
+            apply_event(state, *events[event_index][1:])
+            event_index += 1
+
+        for code in chunk.directions:
+            if last_keyframe is None or state.step - last_keyframe >= max(keyframe_interval, len(state.snake)):
+                keyframe = encode_keyframe(state)
+                steps.append(state.step)
+                chunk_offsets.append(chunk.offset)
+                keyframes.append(keyframe)
+                keyframes_size += len(keyframe)
+                last_keyframe = state.step
+
+            state.apply_step(code)
+            while event_index < len(events) and events[event_index][0] == state.step:
+                apply_event(state, *events[event_index][1:])
+                event_index += 1
+
+    if last_keyframe is None:
+        # A game without any step
+        steps.append(0)
+        chunk_offsets.append(reader.chunks_offset)
+        keyframes.append(encode_keyframe(state))
+
+    keyframe_offsets = array("Q")
+    offset = INDEX_HEADER.size + len(steps) * 8 * 3
+    for keyframe in keyframes:
+        keyframe_offsets.append(offset)
+        offset += len(keyframe)
+
+    return b"".join([
+        INDEX_HEADER.pack(
+            INDEX_MAGIC, BYTE_ORDER_MARK, INDEX_FORMAT_VERSION, os.path.getsize(reader.path),
+            state.step, keyframe_interval, len(steps)
+        ),
+        steps.tobytes(),
+        chunk_offsets.tobytes(),
+        keyframe_offsets.tobytes(),
+        *keyframes,
+    ])
+
+
+def write_index(path: str, content: bytes) -> None:
+    """
+    Write an index next to its final path and rename it, so that an
+    interrupted write never leaves a partial index.
+
+    :param path: The path of the index file.
+    :param content: The content of the index file (see encode_index).
+    """
+    directory = os.path.dirname(path) or "."
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(content)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+class ReplayIndex:
+    """
+    Keyframes of a replay, memory-mapped from its index file, so that
+    opening a replay doesn't depend on its length and any step can be
+    reached by replaying at most one keyframe interval. When the index
+    can't be written next to the replay (e.g. a read-only directory), it
+    is built in memory for this opening only.
+    """
+
+    def __init__(self, mapping: mmap.mmap | bytes, grid_width: int, grid_height: int):
+        """
+        :param mapping: The memory-mapped index file, or the content of an in-memory index.
+        :param grid_width: Width of the grid.
+        :param grid_height: Height of the grid.
+        """
+        _, _, _, _, self.total_steps, self.keyframe_interval, count = INDEX_HEADER.unpack_from(mapping, 0)
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self._mapping = mapping
+        self._view = view = memoryview(mapping)
+        offset = INDEX_HEADER.size
+        self.steps = view[offset:offset + count * 8].cast("Q")
+        offset += count * 8
+        self.chunk_offsets = view[offset:offset + count * 8].cast("Q")
+        offset += count * 8
+        self.keyframe_offsets = view[offset:offset + count * 8].cast("Q")
+
+    @classmethod
+    def open(cls, reader: ReplayReader, keyframe_interval: int = 4096) -> "ReplayIndex":
+        """
+        Open the index of a replay, building it if it is missing or outdated,
+        in memory if it can't be written.
+
+        :param reader: The reader of the replay.
+        :param keyframe_interval: The keyframe interval of a new index.
+        :return: The index.
+        """
+        path = index_path(reader.path)
+        game_config = reader.config["game"]
+        for _ in range(2):
+            mapping = cls._map(path, os.path.getsize(reader.path))
+            if mapping is not None:
+                return cls(mapping, game_config["grid_width"], game_config["grid_height"])
+            content = encode_index(reader, keyframe_interval)
+            try:
+                write_index(path, content)
+            except OSError:
+                return cls(content, game_config["grid_width"], game_config["grid_height"])
+        raise ValueError(f"Could not build the index of {reader.path}")
+
+    @staticmethod
+    def _map(path: str, replay_size: int) -> mmap.mmap | None:
+        """
+        :return: The mapping of an index file, or None if it is missing or doesn't match the replay.
+        """
+        try:
+            with open(path, "rb") as file:
+                mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(mapping) < INDEX_HEADER.size:
+            return None
+        magic, byte_order_mark, format_version, indexed_size, _, _, _ = INDEX_HEADER.unpack_from(mapping, 0)
+        if (magic != INDEX_MAGIC or byte_order_mark != BYTE_ORDER_MARK
+                or format_version != INDEX_FORMAT_VERSION or indexed_size != replay_size):
+            return None
+        return mapping
+
+    def keyframe_before(self, step: int) -> tuple[ReplayState, int]:
+        """
+        Find the last keyframe at or before a step.
+
+        :param step: The step.
+        :return: The state of the keyframe and the offset of the chunk following it.
+        """
+        index = max(0, bisect.bisect_right(self.steps, step) - 1)
+        state = decode_keyframe(self._view[self.keyframe_offsets[index]:], self.steps[index],
+                                self.grid_width, self.grid_height)
+        return state, self.chunk_offsets[index]
@@ -0,0 +1,127 @@
+from .replay_index import ReplayIndex, apply_event, initial_state
+from .replay_reader import ReplayReader, ReplayChunk
+from .replay_state import ReplayState
+
+
+class ReplayPlayer:
+    """
+    Plays a recorded game forwards and backwards. Seeking restores the last
+    keyframe of the index before the target step and replays the steps
+    following it, so it costs at most one keyframe interval of steps.
+    """
+
+    def __init__(self, replay_path: str, keyframe_interval: int = 4096):
+        """
+        Open a replay, building its index on the first opening.
+
+        :param replay_path: The path of the replay file.
+        :param keyframe_interval: The keyframe interval of a new index.
+        """
+        self.reader = ReplayReader(replay_path)
+        self.index = ReplayIndex.open(self.reader, keyframe_interval)
+        self.total_steps = self.index.total_steps
+        self._file = open(replay_path, "rb")
+        self._chunk: ReplayChunk | None = None
+        self._event_index = 0
+        self.state: ReplayState = initial_state(self.reader)
+        self.seek(0)
+
+    @property
+    def step(self) -> int:
+        return self.state.step
+
+    def _load_chunk(self, offset: int) -> bool:
+        """
+        Make the chunk at an offset the current one.
+
+        :param offset: The offset of the chunk in the replay file.
+        :return: False if there is no chunk at this offset (end of the replay).
+        """
+        if self._chunk is None or self._chunk.offset != offset:
+            chunk = self.reader.read_chunk(self._file, offset)
+            if chunk is None:
+                return False
+            self._chunk = chunk
+        return True
+
+    def seek(self, step: int) -> None:
+        """
+        Go to a step of the game.
+
+        :param step: The step, clamped to the length of the game.
+        """
+        step = max(0, min(step, self.total_steps))
+        state, chunk_offset = self.index.keyframe_before(step)
+        self.state = state
+        if self._load_chunk(chunk_offset):
+            # Skip the events already applied to the keyframe
+            events = self._chunk.events
+            self._event_index = 0
+            while self._event_index < len(events) and events[self._event_index][0] <= state.step:
+                self._event_index += 1
+        self._advance(step - state.step)
+
+    def _apply_events(self) -> None:
+        """Apply the events of the current chunk recorded at the current step."""
+        state = self.state
+        events = self._chunk.events
+        event_index = self._event_index
+        while event_index < len(events) and events[event_index][0] <= state.step:
+            apply_event(state, events[event_index][1], events[event_index][2])
+            event_index += 1
+        self._event_index = event_index
+
+    def _next_chunk(self) -> bool:
+        """
+        Move to the next chunk and apply its events of the current step.
+
+        :return: False at the end of the replay.
+        """
+        if not self._load_chunk(self._chunk.next_offset):
+            return False
+        self._event_index = 0
+        self._apply_events()
+        return True
+
+    def _advance(self, count: int) -> None:
+        """
+        Replay the next steps of the game from the current chunk.
+
+        :param count: The number of steps to replay.
+        """
+        state = self.state
+        target = min(state.step + count, self.total_steps)
+        while state.step < target:
+            chunk = self._chunk
+            position = state.step - chunk.first_step
+            end = min(chunk.step_count, position + target - state.step)
+            directions = chunk.directions
+            for position in range(position, end):
+                state.apply_step(directions[position])
+                self._apply_events()
+            # The events following the last step of a chunk are in the next one
+            if state.step == chunk.first_step + chunk.step_count and not self._next_chunk():
+                return
+
+    def step_forward(self, count: int = 1) -> None:
+        """
+        Play the next steps, seeking when it is faster than replaying them.
+
+        :param count: The number of steps.
+        """
+        if count > self.index.keyframe_interval:
+            self.seek(self.state.step + count)
+        else:
+            self._advance(count)
+
+    def step_backward(self, count: int = 1) -> None:
+        """
+        Go back some steps.
+
+        :param count: The number of steps.
+        """
+        self.seek(self.state.step - count)
+
+    def close(self) -> None:
+        """Close the replay file."""
+        self._file.close()
@@ -0,0 +1,123 @@
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass
+import json
+import zlib
+
+from .replay_format import (
+    MAGIC, FORMAT_VERSION, BYTE_ORDER_MARK, HEADER, CHUNK_TAG, CHUNK_HEADER, TRAILER_TAG, TRAILER,
+    unpack_directions,
+)
+
+
+@dataclass
+class ReplayChunk:
+    """The steps and events of a chunk of a replay."""
+    offset: int
+    next_offset: int
+    first_step: int
+    directions: bytes
+    events: list[tuple[int, int, int]]
+
+    @property
+    def step_count(self) -> int:
+        return len(self.directions)
+
+
+class ReplayReader:
+    """
+    Reads a replay file chunk by chunk, so that only one chunk is in memory
+    at a time whatever the length of the game.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a replay file and read its header and trailer.
+
+        :param path: The path of the replay file.
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"Invalid replay file: {path}")
+            magic, byte_order_mark, format_version, metadata_size = HEADER.unpack(header)
+            if magic != MAGIC or byte_order_mark != BYTE_ORDER_MARK or format_version != FORMAT_VERSION:
+                raise ValueError(f"Invalid or incompatible replay file: {path}")
+            self.metadata: dict = json.loads(zlib.decompress(file.read(metadata_size)))
+            self.chunks_offset = HEADER.size + metadata_size
+
+            # The trailer is missing if the recording was interrupted
+            file_size = file.seek(0, 2)
+            self.total_steps: int | None = None
+            self.outcome: int | None = None
+            self.score: int | None = None
+            self.chunks_end = file_size
+            if file_size - TRAILER.size >= self.chunks_offset:
+                file.seek(file_size - TRAILER.size)
+                tag, total_steps, outcome, score = TRAILER.unpack(file.read(TRAILER.size))
+                if tag == TRAILER_TAG:
+                    self.total_steps, self.outcome, self.score = total_steps, outcome, score
+                    self.chunks_end = file_size - TRAILER.size
+
+    @property
+    def config(self) -> dict:
+        return self.metadata["config"]
+
+    @property
+    def seed(self) -> int | None:
+        return self.metadata["seed"]
+
+    @property
+    def food_rng_state(self) -> tuple:
+        """
+        :return: The state of the food generator after the initial food spawn,
+                 for random.Random.setstate.
+        """
+        version, internal_state, gauss_next = self.metadata["food_rng_state"]
+        return (version, tuple(internal_state), gauss_next)
+
+    def read_chunk(self, file, offset: int) -> ReplayChunk | None:
+        """
+        Read the chunk at an offset of an open replay file.
+
+        :param file: The replay file, open in binary mode.
+        :param offset: The offset of the chunk.
+        :return: The chunk, or None at the end of the chunks.
+        """
+        if offset + CHUNK_HEADER.size > self.chunks_end:
+            return None
+        file.seek(offset)
+        tag, first_step, step_count, event_count, payload_size = CHUNK_HEADER.unpack(file.read(CHUNK_HEADER.size))
+        if tag != CHUNK_TAG:
+            raise ValueError(f"Corrupted replay file: {self.path} (offset {offset})")
+        payload = zlib.decompress(file.read(payload_size))
+
+        packed_size = (step_count + 3) // 4
+        directions = unpack_directions(payload[:packed_size], step_count)
+        position = packed_size
+        event_steps = array("I", payload[position:position + event_count * 4])
+        position += event_count * 4
+        event_kinds = payload[position:position + event_count]
+        position += event_count
+        event_values = array("I", payload[position:position + event_count * 4])
+
+        next_offset = file.tell()
+        events = []
+        step = first_step
+        for step_delta, kind, value in zip(event_steps, event_kinds, event_values):
+            step += step_delta
+            events.append((step, kind, value))
+        return ReplayChunk(offset, next_offset, first_step, directions, events)
+
+    def chunks(self) -> Iterator[ReplayChunk]:
+        """
+        Iterate over the chunks of the replay.
+
+        :return: The chunks, in the order of the game.
+        """
+        with open(self.path, "rb") as file:
+            offset = self.chunks_offset
+            while (chunk := self.read_chunk(file, offset)) is not None:
+                yield chunk
+                offset = chunk.next_offset
@@ -0,0 +1,103 @@
+import os
+
+from .replay_format import (
+    DIRECTION_CODES, EVENT_FOOD, EVENT_WRAP_AROUND, NO_FOOD, FILE_EXTENSION,
+    OUTCOME_ABORTED, OUTCOME_DEATH, OUTCOME_WIN,
+)
+from .replay_writer import ReplayWriter
+from ..model.game_state import GameState
+
+
+class ReplayRecorder:
+    """
+    Records the games played on a GameState, one replay file per game.
+
+    A replay holds the config, the seed and the state of the food generator
+    right after the initial food spawn, then the direction of every step and
+    the food spawns, so that a game can be both drawn and re-simulated.
+    """
+
+    def __init__(self, record_dir: str, config: dict, seed: int | None, prefix: str = "game",
+                 chunk_steps: int = 1 << 16):
+        """
+        Initialize the recorder.
+
+        :param record_dir: The directory of the replay files.
+        :param config: The game configuration.
+        :param seed: The seed of the run, or None for a non reproducible run.
+        :param prefix: The prefix of the names of the replay files.
+        :param chunk_steps: Number of steps of a chunk of the replays.
+        """
+        self.record_dir = record_dir
+        self.config = config
+        self.seed = seed
+        self.prefix = prefix
+        self.chunk_steps = chunk_steps
+        self.games = 0
+        self.writer: ReplayWriter | None = None
+        self._food = None
+
+    def start(self, game_state: GameState) -> None:
+        """
+        Start recording a game that has just been reset, stopping the
+        recording of the previous game if it is still running.
+
+        :param game_state: The game state.
+        """
+        self.stop()
+        path = os.path.join(self.record_dir, f"{self.prefix}-{self.games:06d}{FILE_EXTENSION}")
+        self.games += 1
+
+        version, internal_state, gauss_next = game_state.rng.getstate()
+        self.writer = ReplayWriter(path, {
+            "config": self.config,
+            "seed": self.seed,
+            "wrap_around": game_state.wrap_around,
+            "food_rng_state": [version, list(internal_state), gauss_next],
+        }, chunk_steps=self.chunk_steps)
+        self._food = game_state.food
+        self._record_food(game_state)
+
+    def _record_food(self, game_state: GameState) -> None:
+        food = game_state.food
+        cell = NO_FOOD if food is None else food[1] * game_state.grid_width + food[0]
+        self.writer.record_event(EVENT_FOOD, cell)
+
+    def record_step(self, direction: tuple[int, int], game_state: GameState) -> None:
+        """
+        Record a step, after the game state has been updated. The recording
+        stops when the game is over.
+
+        :param direction: The direction of the step.
+        :param game_state: The updated game state.
+        """
+        writer = self.writer
+        if writer is None:
+            return
+        writer.record_step(DIRECTION_CODES[direction])
+        if game_state.food is not self._food:
+            self._food = game_state.food
+            if not game_state.game_over:
+                self._record_food(game_state)
+        if game_state.game_over:
+            self.stop(OUTCOME_WIN if game_state.win else OUTCOME_DEATH, game_state.score)
+
+    def record_wrap_around(self, game_state: GameState) -> None:
+        """
+        Record a change of the teleportation during a game.
+
+        :param game_state: The game state.
+        """
+        if self.writer is not None:
+            self.writer.record_event(EVENT_WRAP_AROUND, int(game_state.wrap_around))
+
+    def stop(self, outcome: int = OUTCOME_ABORTED, score: int | None = None) -> None:
+        """
+        Stop recording the current game, if any.
+
+        :param outcome: The outcome of the game.
+        :param score: The final score, 0 if unknown.
+        """
+        if self.writer is not None:
+            self.writer.close(outcome, score or 0)
+            self.writer = None
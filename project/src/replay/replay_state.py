@@ -0,0 +1,73 @@
+from .replay_format import DIRECTIONS, NO_FOOD
+from ..model.snake import Snake
+
+
+class ReplayState:
+    """
+    State of a replayed game, with the attributes of GameState read by the
+    views. The moves follow the rules of GameState, the food comes from the
+    recording instead of the random generator.
+    """
+
+    def __init__(self, grid_width: int, grid_height: int, wrap_around: bool):
+        """
+        Initialize the state of the start of a game, without food.
+
+        :param grid_width: Width of the grid.
+        :param grid_height: Height of the grid.
+        :param wrap_around: If True, the snake teleports to the edges.
+        """
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.wrap_around = wrap_around
+        self.snake = Snake((grid_width // 2, grid_height // 2), (1, 0))
+        self.food: tuple[int, int] | None = None
+        self.score = 1
+        self.game_over = False
+        self.win = False
+        self.step = 0
+
+    def set_food(self, cell: int) -> None:
+        """
+        Place the food.
+
+        :param cell: The cell id of the food, or NO_FOOD.
+        """
+        self.food = None if cell == NO_FOOD else (cell % self.grid_width, cell // self.grid_width)
+
+    def apply_step(self, direction_code: int) -> None:
+        """
+        Move the snake, as GameState.update does.
+
+        :param direction_code: The code (in DIRECTIONS) of the direction.
+        """
+        self.step += 1
+        if self.game_over:
+            return
+
+        dx, dy = DIRECTIONS[direction_code]
+        self.snake.direction = (dx, dy)
+        head_x, head_y = self.snake.get_head()
+        new_head_x = head_x + dx
+        new_head_y = head_y + dy
+        if self.wrap_around:
+            new_head_x %= self.grid_width
+            new_head_y %= self.grid_height
+        elif not (0 <= new_head_x < self.grid_width and 0 <= new_head_y < self.grid_height):
+            self.game_over = True
+            return
+
+        new_head = (new_head_x, new_head_y)
+        if new_head in self.snake:
+            self.game_over = True
+            return
+
+        if new_head == self.food:
+            self.snake.grow(new_head)
+            self.score = len(self.snake)
+            self.food = None
+            if len(self.snake) == self.grid_width * self.grid_height:
+                self.game_over = True
+                self.win = True
+        else:
+            self.snake.move(new_head)
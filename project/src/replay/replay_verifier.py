@@ -0,0 +1,217 @@
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+import os
+import random
+import zlib
+
+from .replay_format import (
+    DIRECTIONS, DIRECTION_CODES, EVENT_FOOD, FILE_EXTENSION, OUTCOME_ABORTED, OUTCOME_DEATH, OUTCOME_NAMES, OUTCOME_WIN,
+)
+from .replay_index import apply_event
+from .replay_reader import ReplayReader
+from .replay_state import ReplayState
+from ..model.game_state import GameState
+from ..simulation.pool import map_unordered
+
+
+@dataclass
+class VerificationResult:
+    """Outcome of the verification of a replay."""
+    path: str
+    steps: int = 0
+    outcome: str | None = None
+    divergence_step: int | None = None
+    message: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.message is None
+
+
+def find_replays(paths: Iterable[str]) -> Iterator[str]:
+    """
+    Find the replay files of directories (recursively) and files, lazily so
+    that a large corpus is never listed in memory at once.
+
+    :param paths: The directories and replay files.
+    :return: The paths of the replay files.
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        directories = [path]
+        while directories:
+            with os.scandir(directories.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        directories.append(entry.path)
+                    elif entry.name.endswith(FILE_EXTENSION):
+                        yield entry.path
+
+
+def _compare(game_state: GameState, expected: ReplayState) -> str | None:
+    """
+    :return: The first difference between a re-simulated game and its recording, or None.
+    """
+    if game_state.game_over != expected.game_over:
+        return f"game over {game_state.game_over}, recorded {expected.game_over}"
+    if game_state.game_over:
+        return None
+    if game_state.snake.get_head() != expected.snake.get_head():
+        return f"head {game_state.snake.get_head()}, recorded {expected.snake.get_head()}"
+    if game_state.score != expected.score:
+        return f"score {game_state.score}, recorded {expected.score}"
+    if game_state.food != expected.food:
+        return f"food {game_state.food}, recorded {expected.food}"
+    return None
+
+
+def verify_replay(path: str, check_moves: bool = False) -> VerificationResult:
+    """
+    Re-simulate a recorded game with GameState and its recorded food
+    generator, and check every step against the recording: the head, the
+    score and the food spawned after each step, then the outcome and the
+    final score. The replay is read chunk by chunk.
+
+    The recording gives the food and the directions; the expected heads and
+    scores are those of the recorded directions under the replay rules
+    (ReplayState), so that a change of the rules of GameState, or of its
+    food spawns, is reported at the first step it affects.
+
+    :param path: The path of the replay file.
+    :param check_moves: Also replay the strategy of the config and check that
+                        it plays the recorded directions. Only meaningful for
+                        the games recorded by the headless engine, where the
+                        strategy doesn't change during a game.
+    :return: The result, with the first divergence if any.
+    """
+    try:
+        reader = ReplayReader(path)
+    except (OSError, ValueError, zlib.error) as error:
+        return VerificationResult(path, message=str(error))
+
+    game_config = reader.config["game"]
+    wrap_around = reader.metadata["wrap_around"]
+    game_state = GameState(game_config["grid_width"], game_config["grid_height"], wrap_around, random.Random())
+    expected = ReplayState(game_config["grid_width"], game_config["grid_height"], wrap_around)
+
+    strategy = None
+    if check_moves:
+        from ..strategies import StrategyRegistry
+
+        strategy = StrategyRegistry(reader.config, reader.seed).get(game_config["strategy"])
+        strategy.reset()
+
+    def apply_events(events: list[tuple[int, int, int]], event_index: int) -> int:
+        """Apply the recorded events of the current step, return the index of the next event."""
+        while event_index < len(events) and events[event_index][0] == expected.step:
+            _, kind, value = events[event_index]
+            apply_event(expected, kind, value)
+            if kind == EVENT_FOOD and expected.step == 0:
+                # The initial food, spawned before the recorded state of the generator
+                game_state.food = expected.food
+                game_state.rng.setstate(reader.food_rng_state)
+            event_index += 1
+        if game_state.wrap_around != expected.wrap_around:
+            game_state.wrap_around = expected.wrap_around
+            if strategy is not None:
+                strategy.set_wrap_around(expected.wrap_around)
+        return event_index
+
+    result = VerificationResult(path)
+    # The events following the last step of a chunk are recorded in the next
+    # chunk, so that step is compared once they have been applied
+    pending_step = False
+    try:
+        for chunk in reader.chunks():
+            events = chunk.events
+            event_index = apply_events(events, 0)
+            if pending_step:
+                pending_step = False
+                message = _compare(game_state, expected)
+                if message is not None:
+                    result.divergence_step = expected.step
+                    result.message = message
+                    return result
+
+            last_position = len(chunk.directions) - 1
+            for position, code in enumerate(chunk.directions):
+                if game_state.game_over:
+                    result.divergence_step = expected.step
+                    result.message = "steps recorded after the end of the game"
+                    return result
+
+                if strategy is not None:
+                    direction = strategy.get_move(game_state.snake.body, game_state.food)
+                    if DIRECTION_CODES.get(direction) != code:
+                        result.divergence_step = expected.step
+                        result.message = f"move {direction}, recorded {DIRECTIONS[code]}"
+                        return result
+
+                game_state.update(DIRECTIONS[code])
+                expected.apply_step(code)
+                event_index = apply_events(events, event_index)
+                result.steps = expected.step
+                if position == last_position:
+                    pending_step = True
+                    continue
+
+                message = _compare(game_state, expected)
+                if message is not None:
+                    result.divergence_step = expected.step
+                    result.message = message
+                    return result
+    except (OSError, ValueError, zlib.error) as error:
+        result.message = str(error)
+        return result
+
+    if pending_step:
+        message = _compare(game_state, expected)
+        if message is not None:
+            result.divergence_step = expected.step
+            result.message = message
+            return result
+
+    # An interrupted recording has no outcome to check
+    if reader.outcome is None:
+        return result
+    result.outcome = OUTCOME_NAMES.get(reader.outcome, str(reader.outcome))
+    if reader.total_steps != result.steps:
+        result.message = f"{result.steps} steps, recorded {reader.total_steps}"
+    elif reader.outcome == OUTCOME_WIN and not game_state.win:
+        result.message = f"no win, recorded {result.outcome}"
+    elif reader.outcome == OUTCOME_DEATH and (not game_state.game_over or game_state.win):
+        result.message = f"{'win' if game_state.win else 'no death'}, recorded {result.outcome}"
+    elif reader.outcome not in (OUTCOME_WIN, OUTCOME_DEATH) and game_state.game_over:
+        result.message = f"{'win' if game_state.win else 'death'}, recorded {result.outcome}"
+    elif reader.outcome != OUTCOME_ABORTED and reader.score != game_state.score:
+        result.message = f"final score {game_state.score}, recorded {reader.score}"
+    if result.message is not None:
+        result.divergence_step = result.steps
+    return result
+
+
+def verify_replays(paths: Iterable[str], workers: int | None = None, check_moves: bool = False,
+                   max_in_flight: int | None = None) -> Iterator[VerificationResult]:
+    """
+    Verify replays over a pool of worker processes. The paths are consumed
+    lazily, with at most max_in_flight replays pending, and the results are
+    yielded as soon as they finish (not in the order of the paths), so that
+    the memory doesn't grow with the size of the corpus.
+
+    :param paths: The paths of the replay files, see find_replays.
+    :param workers: The number of worker processes, the number of CPUs if None.
+    :param check_moves: Also check the moves of the strategies, see verify_replay.
+    :param max_in_flight: Maximum number of pending replays, four per worker if None.
+    :return: The results of the replays.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        verify = partial(verify_replay, check_moves=check_moves)
+        for _, result in map_unordered(pool, verify, paths, max_in_flight):
+            yield result
@@ -0,0 +1,107 @@
+from array import array
+import json
+import os
+import zlib
+
+from .replay_format import (
+    MAGIC, FORMAT_VERSION, BYTE_ORDER_MARK, HEADER, CHUNK_TAG, CHUNK_HEADER, TRAILER_TAG, TRAILER,
+    pack_directions,
+)
+
+
+class ReplayWriter:
+    """
+    Streams a replay to a file. Steps and events are appended to in-memory
+    buffers, and written as a compressed chunk every chunk_steps steps, so
+    that recording a step is a single append.
+    """
+
+    def __init__(self, path: str, metadata: dict, chunk_steps: int = 1 << 16, compression_level: int = 6):
+        """
+        Create the file and write its header.
+
+        :param path: The path of the replay file.
+        :param metadata: The JSON serializable metadata of the game (see ReplayRecorder).
+        :param chunk_steps: Number of steps of a chunk.
+        :param compression_level: The zlib compression level of the chunks.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.chunk_steps = chunk_steps
+        self.compression_level = compression_level
+        self.steps = 0
+
+        self._file = open(path, "wb")
+        encoded_metadata = zlib.compress(json.dumps(metadata).encode())
+        self._file.write(HEADER.pack(MAGIC, BYTE_ORDER_MARK, FORMAT_VERSION, len(encoded_metadata)))
+        self._file.write(encoded_metadata)
+
+        self._chunk_first_step = 0
+        self._last_event_step = 0
+        self._directions = bytearray()
+        self._event_steps = array("I")
+        self._event_kinds = bytearray()
+        self._event_values = array("I")
+
+    def record_step(self, direction_code: int) -> None:
+        """
+        Record a step.
+
+        :param direction_code: The code (in DIRECTIONS) of the direction of the step.
+        """
+        self._directions.append(direction_code)
+        self.steps += 1
+        if len(self._directions) >= self.chunk_steps:
+            self.flush_chunk()
+
+    def record_event(self, kind: int, value: int) -> None:
+        """
+        Record an event happening after the steps recorded so far.
+
+        :param kind: The kind of event (EVENT_FOOD, EVENT_WRAP_AROUND).
+        :param value: The value of the event.
+        """
+        # Steps are stored as the difference with the previous event, which compresses better
+        self._event_steps.append(self.steps - self._last_event_step)
+        self._last_event_step = self.steps
+        self._event_kinds.append(kind)
+        self._event_values.append(value)
+
+    def flush_chunk(self) -> None:
+        """Compress and write the buffered steps and events as a chunk."""
+        if not self._directions and not self._event_kinds:
+            return
+
+        payload = zlib.compress(
+            pack_directions(self._directions)
+            + self._event_steps.tobytes()
+            + bytes(self._event_kinds)
+            + self._event_values.tobytes(),
+            self.compression_level
+        )
+        self._file.write(CHUNK_HEADER.pack(
+            CHUNK_TAG, self._chunk_first_step, len(self._directions), len(self._event_kinds), len(payload)))
+        self._file.write(payload)
+
+        self._chunk_first_step = self.steps
+        self._last_event_step = self.steps
+        self._directions.clear()
+        del self._event_steps[:]
+        self._event_kinds.clear()
+        del self._event_values[:]
+
+    def close(self, outcome: int, score: int) -> None:
+        """
+        Write the last chunk and the trailer, and close the file.
+
+        :param outcome: The outcome of the game (OUTCOME_*).
+        :param score: The final score.
+        """
+        if self._file.closed:
+            return
+        self.flush_chunk()
+        self._file.write(TRAILER.pack(TRAILER_TAG, self.steps, outcome, score))
+        self._file.close()
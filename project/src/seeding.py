@@ -0,0 +1,20 @@
+import random
+
+
+def make_rng(seed: int | None, stream: str) -> random.Random:
+    """
+    Create an independent random generator for one consumer of randomness.
+
+    Each consumer (the food spawner, the cycle generator, ...) gets its own
+    stream derived from the shared seed, so adding a random draw in one of
+    them doesn't shift the others. String seeds are hashed with SHA-512 by
+    the random module, so the streams are identical across processes and
+    machines.
+
+    :param seed: The seed of the run, or None for a non reproducible run.
+    :param stream: The name of the consumer.
+    :return: The random generator.
+    """
+    if seed is None:
+        return random.Random()
+    return random.Random(f"{seed}:{stream}")
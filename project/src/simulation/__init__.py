@@ -0,0 +1,30 @@
+from .headless_engine import HeadlessEngine, EpisodeResult, SimulationStats
+
+__all__ = [
+    "HeadlessEngine",
+    "EpisodeResult",
+    "SimulationStats",
+    "TournamentJob",
+    "GameResult",
+    "TournamentReport",
+    "GameWriter",
+    "run_tournament",
+    "SweepJob",
+    "SweepPoint",
+    "SweepResultCache",
+    "run_sweep",
+]
+
+_TOURNAMENT_NAMES = {"TournamentJob", "GameResult", "TournamentReport", "GameWriter", "run_tournament"}
+_SWEEP_NAMES = {"SweepJob", "SweepPoint", "SweepResultCache", "run_sweep"}
+
+
+def __getattr__(name: str):
+    """Import the parallel runners (and multiprocessing) only when they are used."""
+    if name in _TOURNAMENT_NAMES:
+        from . import tournament
+        return getattr(tournament, name)
+    if name in _SWEEP_NAMES:
+        from . import sweep
+        return getattr(sweep, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,200 @@
+from dataclasses import dataclass, field
+import statistics
+import time
+
+from ..strategies import MovementStrategy, StrategyRegistry
+from ..model.game_state import GameState
+from ..replay.replay_format import OUTCOME_TIMEOUT
+from ..replay.replay_recorder import ReplayRecorder
+from ..seeding import make_rng
+
+
+@dataclass
+class EpisodeResult:
+    """Outcome of a single headless game."""
+    steps: int
+    apples: int
+    win: bool
+    timed_out: bool
+
+
+@dataclass
+class SimulationStats:
+    """Aggregated results of several headless games."""
+    episodes: list[EpisodeResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def total_steps(self) -> int:
+        return sum(episode.steps for episode in self.episodes)
+
+    @property
+    def total_apples(self) -> int:
+        return sum(episode.apples for episode in self.episodes)
+
+    @property
+    def steps_per_second(self) -> float:
+        return self.total_steps / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def apples_per_second(self) -> float:
+        return self.total_apples / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        if not self.episodes:
+            return 0.0
+        return sum(episode.win for episode in self.episodes) / len(self.episodes)
+
+    @property
+    def steps_to_win(self) -> list[int]:
+        return [episode.steps for episode in self.episodes if episode.win]
+
+    def to_dict(self) -> dict:
+        """
+        :return: The aggregated statistics as a JSON serializable dict.
+        """
+        steps_to_win = self.steps_to_win
+        return {
+            "episodes": len(self.episodes),
+            "deaths": sum(not episode.win and not episode.timed_out for episode in self.episodes),
+            "timeouts": sum(episode.timed_out for episode in self.episodes),
+            "elapsed": self.elapsed,
+            "total_steps": self.total_steps,
+            "total_apples": self.total_apples,
+            "steps_per_second": self.steps_per_second,
+            "apples_per_second": self.apples_per_second,
+            "win_rate": self.win_rate,
+            "steps_to_win_mean": statistics.fmean(steps_to_win) if steps_to_win else None,
+            "steps_to_win_median": statistics.median(steps_to_win) if steps_to_win else None,
+        }
+
+    def summary(self) -> str:
+        """
+        :return: A human readable report of the statistics.
+        """
+        deaths = sum(not episode.win and not episode.timed_out for episode in self.episodes)
+        timeouts = sum(episode.timed_out for episode in self.episodes)
+        lines = [
+            f"Episodes      : {len(self.episodes)} "
+            f"({deaths} deaths, {timeouts} timeouts)",
+            f"Elapsed       : {self.elapsed:.3f} s",
+            f"Steps         : {self.total_steps} ({self.steps_per_second:,.0f} steps/s)",
+            f"Apples        : {self.total_apples} ({self.apples_per_second:,.0f} apples/s)",
+            f"Win rate      : {self.win_rate:.1%}",
+        ]
+        steps_to_win = self.steps_to_win
+        if steps_to_win:
+            lines.append(
+                f"Steps to win  : mean {statistics.fmean(steps_to_win):,.0f}, "
+                f"median {statistics.median(steps_to_win):,.0f}, "
+                f"min {min(steps_to_win)}, max {max(steps_to_win)}"
+            )
+        return "\n".join(lines)
+
+
+class HeadlessEngine:
+    """
+    Runs games without any view, timer or input handling, as fast as the
+    CPU allows. Used to measure the strategies under load.
+    """
+
+    def __init__(self, config: dict, strategy: MovementStrategy | None = None, max_steps: int | None = None,
+                 seed: int | None = None, record_dir: str | None = None, record_prefix: str | None = None):
+        """
+        Initialize the headless engine.
+
+        :param config: Game configuration.
+        :param strategy: The strategy to play with, built from the config if None.
+        :param max_steps: Maximum number of steps of an episode. By default an
+                          episode is stopped when the snake goes twice the
+                          number of cells of the grid without eating.
+        :param seed: The seed of the run, taken from the config if None.
+        :param record_dir: Directory where a replay of every game is recorded,
+                           taken from the config (replay.record_dir) if None.
+        :param record_prefix: The prefix of the names of the replay files,
+                              before the seed (or the date of an unseeded run),
+                              telling apart the runs sharing a seed.
+        """
+        game_config = config["game"]
+        self.seed = seed if seed is not None else game_config.get("seed")
+        self.game_state = GameState(
+            grid_width=game_config["grid_width"],
+            grid_height=game_config["grid_height"],
+            wrap_around=game_config["wrap_around"],
+            rng=make_rng(self.seed, "food")
+        )
+        if strategy is None:
+            strategy = StrategyRegistry(config, self.seed).get(game_config["strategy"])
+        self.strategy = strategy
+        self.max_steps = max_steps
+        self.stall_limit = 2 * game_config["grid_width"] * game_config["grid_height"]
+
+        if record_dir is None:
+            record_dir = config.get("replay", {}).get("record_dir")
+        self.recorder = None
+        if record_dir is not None:
+            prefix = f"seed{self.seed}" if self.seed is not None else time.strftime("%Y%m%d-%H%M%S")
+            if record_prefix is not None:
+                prefix = f"{record_prefix}-{prefix}"
+            self.recorder = ReplayRecorder(record_dir, config, self.seed, prefix)
+
+    def run_episode(self) -> EpisodeResult:
+        """
+        Play a single game until it ends or times out.
+
+        :return: The result of the game.
+        """
+        game_state = self.game_state
+        strategy = self.strategy
+        game_state.reset()
+        strategy.reset()
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.start(game_state)
+
+        max_steps = self.max_steps
+        stall_limit = self.stall_limit
+        steps = 0
+        last_apple_step = 0
+        score = game_state.score
+        timed_out = False
+
+        while not game_state.game_over:
+            if max_steps is not None and steps >= max_steps or steps - last_apple_step > stall_limit:
+                timed_out = True
+                break
+
+            direction = strategy.get_move(game_state.snake.body, game_state.food)
+            game_state.update(direction)
+            if recorder is not None:
+                recorder.record_step(direction, game_state)
+            steps += 1
+
+            if game_state.score != score:
+                score = game_state.score
+                last_apple_step = steps
+
+        if recorder is not None:
+            recorder.stop(OUTCOME_TIMEOUT, game_state.score)
+
+        return EpisodeResult(
+            steps=steps,
+            apples=len(game_state.snake) - 1,
+            win=game_state.win,
+            timed_out=timed_out,
+        )
+
+    def run(self, episodes: int) -> SimulationStats:
+        """
+        Play several games in a row.
+
+        :param episodes: The number of games to play.
+        :return: The aggregated statistics.
+        """
+        stats = SimulationStats()
+        start = time.perf_counter()
+        for _ in range(episodes):
+            stats.episodes.append(self.run_episode())
+        stats.elapsed = time.perf_counter() - start
+        return stats
@@ -0,0 +1,33 @@
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from typing import TypeVar
+
+Item = TypeVar("Item")
+Result = TypeVar("Result")
+
+
+def map_unordered(pool: Executor, function: Callable[[Item], Result], items: Iterable[Item],
+                  max_in_flight: int) -> Iterator[tuple[Item, Result]]:
+    """
+    Apply a function to items over a pool, submitting the items lazily with
+    at most max_in_flight of them pending, and yield the results as soon as
+    they finish (not in the order of the items), so that the memory doesn't
+    grow with the number of items.
+
+    :param pool: The executor.
+    :param function: The function, picklable for a process pool.
+    :param items: The arguments of the function.
+    :param max_in_flight: Maximum number of pending items.
+    :return: The (item, result) pairs.
+    """
+    pending = {}
+    for item in items:
+        pending[pool.submit(function, item)] = item
+        if len(pending) >= max_in_flight:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield pending.pop(future), future.result()
@@ -0,0 +1,138 @@
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import json
+import os
+import tempfile
+
+from .headless_engine import HeadlessEngine
+from .pool import map_unordered
+from ..config import config_hash
+
+# Digits of the config hash prefixing the names of the replays of a point
+RECORD_PREFIX_LENGTH = 12
+
+
+@dataclass
+class SweepJob:
+    """The headless games of a concrete config of a sweep."""
+    key: str
+    config: dict
+    episodes: int
+    max_steps: int | None
+
+
+@dataclass
+class SweepPoint:
+    """Results of the headless games of a concrete config of a sweep."""
+    config: dict
+    key: str
+    result: dict
+    cached: bool
+
+
+class SweepResultCache:
+    """
+    Results of the sweep points on disk, one JSON file per config hash, so
+    that rerunning a sweep only plays the points that are missing.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        :param cache_dir: The cache directory.
+        """
+        self.cache_dir = cache_dir
+
+    def path(self, key: str) -> str:
+        """
+        :param key: The config hash of a point.
+        :return: The path of its result file.
+        """
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> dict | None:
+        """
+        :param key: The config hash of a point.
+        :return: The cached result, or None if there is none.
+        """
+        try:
+            with open(self.path(key)) as file:
+                return json.load(file)["result"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key: str, config: dict, result: dict) -> None:
+        """
+        Write the result of a point next to its final path and rename it,
+        so that an interrupted sweep never leaves a partial result.
+
+        :param key: The config hash of the point.
+        :param config: The concrete config of the point.
+        :param result: The result.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "w") as file:
+                json.dump({"config": config, "result": result}, file, indent=2)
+            os.replace(temporary_path, self.path(key))
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+
+def is_cacheable(config: dict) -> bool:
+    """
+    :param config: The concrete config of a sweep point.
+    :return: Whether its result can be cached: an unseeded point plays
+             different games on every run, so its result is never stored
+             nor reused.
+    """
+    return config["game"].get("seed") is not None
+
+
+def run_sweep_job(job: SweepJob) -> dict:
+    """
+    Play the headless games of a sweep point in a worker process.
+
+    :param job: The point.
+    :return: The aggregated statistics of the games.
+    """
+    # The points of a sweep share their seed: their replays are told apart by the config hash
+    engine = HeadlessEngine(job.config, max_steps=job.max_steps, record_prefix=job.key[:RECORD_PREFIX_LENGTH])
+    return engine.run(job.episodes).to_dict()
+
+
+def run_sweep(configs: Iterable[dict], episodes: int, max_steps: int | None = None, workers: int | None = None,
+              cache_dir: str | None = None) -> Iterator[SweepPoint]:
+    """
+    Play the points of a sweep over a pool of worker processes, without any
+    view. The points already in the result cache are yielded first, then the
+    others as soon as they finish. The unseeded points are always played.
+
+    :param configs: The concrete configs of the sweep (see config.expand_sweep).
+    :param episodes: The number of games of each point.
+    :param max_steps: Maximum number of steps of a game.
+    :param workers: The number of worker processes, the number of CPUs if None.
+    :param cache_dir: The result cache directory, or None to disable the cache.
+    :return: The results of the points.
+    """
+    cache = SweepResultCache(cache_dir) if cache_dir is not None else None
+
+    missing = []
+    for config in configs:
+        key = config_hash(config, episodes=episodes, max_steps=max_steps)
+        result = cache.get(key) if cache is not None and is_cacheable(config) else None
+        if result is not None:
+            yield SweepPoint(config, key, result, cached=True)
+        else:
+            missing.append(SweepJob(key, config, episodes, max_steps))
+    if not missing:
+        return
+
+    workers = min(workers or os.cpu_count() or 1, len(missing))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for job, result in map_unordered(pool, run_sweep_job, missing, workers * 4):
+            if cache is not None and is_cacheable(job.config):
+                cache.put(job.key, job.config, result)
+            yield SweepPoint(job.config, job.key, result, cached=False)
@@ -0,0 +1,347 @@
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
+import copy
+import csv
+import json
+import math
+import os
+
+from .headless_engine import HeadlessEngine
+from .pool import map_unordered
+from ..strategies import HamiltonianCycle, StrategyRegistry
+from ..strategies.cycle_cache import get_cycle
+
+# Percentiles reported for each metric
+PERCENTILES = [50, 90, 99]
+# Relative error of the reported percentiles
+PERCENTILE_ACCURACY = 0.01
+
+
+@dataclass(frozen=True)
+class TournamentJob:
+    """A single game of the tournament."""
+    strategy: str
+    grid_width: int
+    grid_height: int
+    wrap_around: bool
+    seed: int
+
+
+@dataclass
+class GameResult:
+    """Outcome of a tournament game."""
+    strategy: str
+    grid_width: int
+    grid_height: int
+    wrap_around: bool
+    seed: int
+    steps: int
+    apples: int
+    win: bool
+    timed_out: bool
+    elapsed: float
+
+    @property
+    def group(self) -> tuple[str, int, int, bool]:
+        """
+        :return: The (strategy, grid_width, grid_height, wrap_around) the game is aggregated with.
+        """
+        return (self.strategy, self.grid_width, self.grid_height, self.wrap_around)
+
+    @property
+    def apples_per_1000_steps(self) -> float:
+        return self.apples * 1000 / self.steps if self.steps else 0.0
+
+    @property
+    def moves_per_second(self) -> float:
+        return self.steps / self.elapsed if self.elapsed > 0 else 0.0
+
+
+# State of a worker process, kept between the jobs it runs
+_worker_config: dict | None = None
+_worker_max_steps: int | None = None
+_worker_cycles: dict[tuple[int, int], HamiltonianCycle] = {}
+
+
+def _init_worker(config: dict, max_steps: int | None) -> None:
+    """
+    Initialize a worker process with the base config of the tournament.
+
+    :param config: The base game configuration.
+    :param max_steps: Maximum number of steps of a game.
+    """
+    global _worker_config, _worker_max_steps
+    _worker_config = config
+    _worker_max_steps = max_steps
+
+
+class _WorkerStrategyRegistry(StrategyRegistry):
+    """
+    Strategy registry taking its fixed Hamiltonian cycle from the cache of
+    the worker process, so that the games of a worker sharing a grid load
+    their cycle only once.
+
+    A random cycle depends on the seed of the game: it is generated for the
+    game and cached neither in the worker nor on disk, which would keep a
+    cycle (and write a cache file) per seed of the tournament.
+    """
+
+    @property
+    def cycle(self) -> HamiltonianCycle:
+        if self._cycle is None:
+            if self.config["hamiltonian"]["random_cycle"]:
+                self._cycle = get_cycle(self.grid_width, self.grid_height, True, self.seed, None)
+                return self._cycle
+            key = (self.grid_width, self.grid_height)
+            cycle = _worker_cycles.get(key)
+            if cycle is None:
+                cycle = get_cycle(self.grid_width, self.grid_height, False, self.seed,
+                                  self.config["hamiltonian"].get("cache_dir"))
+                _worker_cycles[key] = cycle
+            self._cycle = cycle
+        return self._cycle
+
+
+def run_job(job: TournamentJob) -> GameResult:
+    """
+    Play a tournament game in a worker process.
+
+    :param job: The game to play.
+    :return: The outcome of the game.
+    """
+    config = copy.deepcopy(_worker_config)
+    game_config = config["game"]
+    game_config["strategy"] = job.strategy
+    game_config["grid_width"] = job.grid_width
+    game_config["grid_height"] = job.grid_height
+    game_config["wrap_around"] = job.wrap_around
+
+    strategy = _WorkerStrategyRegistry(config, job.seed).get(job.strategy)
+    # The games of the strategies and grids share their seeds: their replays are told apart by the job
+    record_prefix = f"{job.strategy}-{job.grid_width}x{job.grid_height}-{'wrap' if job.wrap_around else 'walls'}"
+    engine = HeadlessEngine(config, strategy, _worker_max_steps, job.seed, record_prefix=record_prefix)
+    stats = engine.run(1)
+    episode = stats.episodes[0]
+    return GameResult(
+        **asdict(job),
+        steps=episode.steps,
+        apples=episode.apples,
+        win=episode.win,
+        timed_out=episode.timed_out,
+        elapsed=stats.elapsed,
+    )
+
+
+def run_tournament(config: dict, jobs: Iterable[TournamentJob], workers: int | None = None,
+                   max_steps: int | None = None, max_in_flight: int | None = None) -> Iterator[GameResult]:
+    """
+    Play the games of a tournament over a pool of worker processes, which
+    are reused across the games. The jobs are submitted lazily, with at most
+    max_in_flight of them pending, and the results are yielded as soon as
+    they finish (not in the order of the jobs), so that the memory doesn't
+    grow with the number of games.
+
+    :param config: The base game configuration.
+    :param jobs: The games to play.
+    :param workers: The number of worker processes, the number of CPUs if None.
+    :param max_steps: Maximum number of steps of a game.
+    :param max_in_flight: Maximum number of pending jobs, four per worker if None.
+    :return: The results of the games.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config, max_steps)) as pool:
+        for _, result in map_unordered(pool, run_job, jobs, max_in_flight):
+            yield result
+
+
+class QuantileSketch:
+    """
+    Mean and percentiles of a stream of non-negative values in bounded
+    memory: the values are counted in buckets growing geometrically (as in
+    DDSketch), so that a percentile is known within a relative error and the
+    number of buckets only depends on the range of the values, not on their
+    number.
+    """
+
+    def __init__(self, relative_accuracy: float = PERCENTILE_ACCURACY):
+        """
+        :param relative_accuracy: The relative error of the percentiles.
+        """
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        # Bucket k counts the values in (gamma ** (k - 1), gamma ** k]
+        self.buckets: dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: float) -> None:
+        """
+        Add a value.
+
+        :param value: The value, not negative.
+        """
+        self.count += 1
+        self.total += value
+        if value <= 0:
+            self.zeros += 1
+            return
+        key = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def mean(self) -> float | None:
+        """
+        :return: The exact mean of the values, None if there is none.
+        """
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percent: float) -> float | None:
+        """
+        :param percent: The percentile, between 0 and 100.
+        :return: The value of the rank of the percentile (rounded down),
+                 within the relative accuracy, None if there is no value.
+        """
+        if not self.count:
+            return None
+        rank = int((self.count - 1) * percent / 100)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                # The middle of the bucket in relative terms
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return None
+
+
+# Metrics of the games aggregated with their percentiles
+METRICS = ("steps_to_win", "apples_per_1000_steps", "moves_per_second")
+
+
+class _GroupStats:
+    """The running aggregates of a group of games."""
+
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.deaths = 0
+        self.timeouts = 0
+        self.metrics = {metric: QuantileSketch() for metric in METRICS}
+
+    def add(self, result: GameResult) -> None:
+        """
+        Add the result of a game.
+
+        :param result: The result.
+        """
+        self.games += 1
+        if result.win:
+            self.wins += 1
+            self.metrics["steps_to_win"].add(result.steps)
+        elif result.timed_out:
+            self.timeouts += 1
+        else:
+            self.deaths += 1
+        self.metrics["apples_per_1000_steps"].add(result.apples_per_1000_steps)
+        self.metrics["moves_per_second"].add(result.moves_per_second)
+
+
+class TournamentReport:
+    """
+    Aggregates the results of a tournament by strategy, grid size and
+    wrap_around: death rate, steps to win, apples per 1000 steps and moves
+    per second, with their percentiles.
+
+    The results are aggregated as they are added (counts, sums and a
+    QuantileSketch per metric) instead of being kept, so the memory doesn't
+    grow with the number of games; the percentiles are within
+    PERCENTILE_ACCURACY of the exact ones (games.csv has the exact values).
+    """
+
+    def __init__(self):
+        self._groups: dict[tuple[str, int, int, bool], _GroupStats] = {}
+
+    def add(self, result: GameResult) -> None:
+        """
+        Add the result of a game.
+
+        :param result: The result.
+        """
+        stats = self._groups.get(result.group)
+        if stats is None:
+            stats = self._groups[result.group] = _GroupStats()
+        stats.add(result)
+
+    def summary(self) -> list[dict]:
+        """
+        :return: One row of aggregated metrics per group, sorted by group.
+        """
+        rows = []
+        for group in sorted(self._groups):
+            stats = self._groups[group]
+            strategy, grid_width, grid_height, wrap_around = group
+            row = {
+                "strategy": strategy,
+                "grid_width": grid_width,
+                "grid_height": grid_height,
+                "wrap_around": wrap_around,
+                "games": stats.games,
+                "win_rate": stats.wins / stats.games,
+                "death_rate": stats.deaths / stats.games,
+                "timeout_rate": stats.timeouts / stats.games,
+            }
+            for metric, sketch in stats.metrics.items():
+                row[f"{metric}_mean"] = sketch.mean()
+                for percent in PERCENTILES:
+                    row[f"{metric}_p{percent}"] = sketch.percentile(percent)
+            rows.append(row)
+        return rows
+
+    def write(self, output_dir: str) -> None:
+        """
+        Write the summary to summary.csv and summary.json.
+
+        :param output_dir: The output directory.
+        """
+        rows = self.summary()
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, "summary.json"), "w") as file:
+            json.dump(rows, file, indent=2)
+        if rows:
+            with open(os.path.join(output_dir, "summary.csv"), "w", newline="") as file:
+                writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+                writer.writeheader()
+                writer.writerows(rows)
+
+
+class GameWriter:
+    """Streams the results of the games, one row each, to a CSV file."""
+
+    def __init__(self, path: str):
+        """
+        Open the file and write its header.
+
+        :param path: The path of the CSV file.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([field.name for field in fields(GameResult)])
+
+    def write(self, result: GameResult) -> None:
+        """
+        Write the result of a game.
+
+        :param result: The result.
+        """
+        self._writer.writerow([getattr(result, field.name) for field in fields(GameResult)])
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
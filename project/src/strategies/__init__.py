@@ -2,7 +2,10 @@ from .hamiltonian_skip_strategy import HamiltonianSkipMovementStrategy
 from .hamiltonian_strategy import HamiltonianMovementStrategy
 from .player_strategy import PlayerMovementStrategy
 from .dummy_strategy import DummyMovementStrategy
+from .pathfinding_strategy import PathfindingMovementStrategy
 from .movement_strategy import MovementStrategy
+from .hamiltonian_cycle import HamiltonianCycle
+from .registry import StrategyRegistry, register_strategy
 
 __all__ = [
     "MovementStrategy",
@@ -10,5 +13,9 @@ __all__ = [
     "HamiltonianMovementStrategy",
     "HamiltonianSkipMovementStrategy",
     "DummyMovementStrategy",
+    "PathfindingMovementStrategy",
+    "HamiltonianCycle",
+    "StrategyRegistry",
+    "register_strategy",
 ]
 
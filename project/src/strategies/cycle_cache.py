@@ -0,0 +1,131 @@
+import logging
+import mmap
+import os
+import struct
+import tempfile
+
+from .hamiltonian_cycle import HamiltonianCycle, GENERATOR_VERSION
+from ..seeding import make_rng
+
+logger = logging.getLogger(__name__)
+
+# File layout (native byte order, checked with the byte order mark):
+#   header: magic, byte order mark, format version, generator version, width, height
+#   order:          uint32 * cell_count
+#   index:          int32  * cell_count
+#   neighbor_index: int32  * cell_count * 4
+#   next_direction: uint8  * cell_count
+MAGIC = b"HCYC"
+FORMAT_VERSION = 1
+BYTE_ORDER_MARK = 0x01020304
+HEADER = struct.Struct("=4sIIIII")
+
+
+def cycle_cache_path(cache_dir: str, grid_width: int, grid_height: int, random_cycle: bool, seed: int | None) -> str:
+    """
+    Path of the cache file of a cycle.
+
+    :param cache_dir: The cache directory.
+    :param grid_width: The width of the game grid.
+    :param grid_height: The height of the game grid.
+    :param random_cycle: Whether the cycle is random.
+    :param seed: The seed of the run (ignored for non random cycles).
+    :return: The path of the file.
+    """
+    key = f"seed{seed}" if random_cycle else "fixed"
+    return os.path.join(cache_dir, f"{grid_width}x{grid_height}-{key}-v{GENERATOR_VERSION}.hcyc")
+
+
+def save_cycle(path: str, cycle: HamiltonianCycle) -> None:
+    """
+    Write a cycle to a cache file. The file is written next to its final
+    path and renamed, so that concurrent readers never see a partial file.
+
+    :param path: The path of the file.
+    :param cycle: The cycle to save.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(HEADER.pack(MAGIC, BYTE_ORDER_MARK, FORMAT_VERSION, GENERATOR_VERSION,
+                                   cycle.grid_width, cycle.grid_height))
+            file.write(memoryview(cycle.order).cast("B"))
+            file.write(memoryview(cycle.index).cast("B"))
+            file.write(memoryview(cycle.neighbor_index).cast("B"))
+            file.write(memoryview(cycle.next_direction).cast("B"))
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+def load_cycle(path: str) -> HamiltonianCycle | None:
+    """
+    Memory-map a cycle from a cache file. The tables are read-only views of
+    the mapping, so loading doesn't depend on the size of the grid and the
+    pages are shared between the processes using the same file.
+
+    :param path: The path of the file.
+    :return: The cycle, or None if the file is missing or not compatible.
+    """
+    try:
+        with open(path, "rb") as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    if len(mapping) < HEADER.size:
+        return None
+    magic, byte_order_mark, format_version, generator_version, grid_width, grid_height = \
+        HEADER.unpack_from(mapping, 0)
+    if (magic != MAGIC or byte_order_mark != BYTE_ORDER_MARK or format_version != FORMAT_VERSION
+            or generator_version != GENERATOR_VERSION):
+        return None
+
+    cell_count = grid_width * grid_height
+    if len(mapping) != HEADER.size + cell_count * (4 + 4 + 16 + 1):
+        return None
+
+    view = memoryview(mapping)
+    offset = HEADER.size
+    order = view[offset:offset + cell_count * 4].cast("I")
+    offset += cell_count * 4
+    index = view[offset:offset + cell_count * 4].cast("i")
+    offset += cell_count * 4
+    neighbor_index = view[offset:offset + cell_count * 16].cast("i")
+    offset += cell_count * 16
+    next_direction = view[offset:offset + cell_count]
+
+    return HamiltonianCycle(grid_width, grid_height, order, index, next_direction, neighbor_index)
+
+
+def get_cycle(grid_width: int, grid_height: int, random_cycle: bool, seed: int | None,
+              cache_dir: str | None) -> HamiltonianCycle:
+    """
+    Load a cycle from the cache, generating and caching it on a miss.
+    Random cycles of non reproducible runs (no seed) are never cached.
+
+    :param grid_width: The width of the game grid.
+    :param grid_height: The height of the game grid.
+    :param random_cycle: Whether to generate a random cycle.
+    :param seed: The seed of the run, or None for a non reproducible run.
+    :param cache_dir: The cache directory, or None to disable the cache.
+    :return: The cycle.
+    """
+    if cache_dir is None or (random_cycle and seed is None):
+        return HamiltonianCycle.generate(grid_width, grid_height, random_cycle, make_rng(seed, "cycle"))
+
+    path = cycle_cache_path(cache_dir, grid_width, grid_height, random_cycle, seed)
+    cycle = load_cycle(path)
+    if cycle is not None:
+        return cycle
+
+    cycle = HamiltonianCycle.generate(grid_width, grid_height, random_cycle, make_rng(seed, "cycle"))
+    try:
+        save_cycle(path, cycle)
+    except OSError as e:
+        logger.warning(f"Could not cache the Hamiltonian cycle in {path}: {e}")
+    return cycle
@@ -1,4 +1,11 @@
 from .movement_strategy import MovementStrategy
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from ..model.batch_game_state import BatchGameState
 
 
 class DummyMovementStrategy(MovementStrategy):
@@ -10,7 +17,11 @@ class DummyMovementStrategy(MovementStrategy):
     def __init__(self):
         self.last_move = (1, 0)
 
-    def get_move(self, snake_body: list[tuple[int, int]], food_pos: tuple[int, int] | None) -> tuple[int, int]:
+    def reset(self) -> None:
+        """Forget the last move."""
+        self.last_move = (1, 0)
+
+    def get_move(self, snake_body: Sequence[tuple[int, int]], food_pos: tuple[int, int] | None) -> tuple[int, int]:
         """
         Move towards the food on one axis at a time.
         Prefer the movement on the X axis, then on the Y axis.
@@ -59,3 +70,34 @@ class DummyMovementStrategy(MovementStrategy):
         self.last_move = move
         return self.last_move
 
+    def get_moves(self, batch_state: "BatchGameState") -> "np.ndarray":
+        """
+        Move every snake towards its food with the rules of get_move.
+        The last move of each game is the direction stored in the batch.
+
+        :param batch_state: The games.
+        :return: The direction code of each game.
+        """
+        import numpy as np
+
+        head_x = batch_state.head % batch_state.grid_width
+        head_y = batch_state.head // batch_state.grid_width
+        food_x = batch_state.food % batch_state.grid_width
+        food_y = batch_state.food // batch_state.grid_width
+        last_move = batch_state.direction
+
+        # X axis first, then Y axis, -1 when aligned on the food
+        move = np.select(
+            [head_x < food_x, head_x > food_x, head_y < food_y, head_y > food_y],
+            [0, 2, 1, 3],
+            default=-1
+        )
+
+        # Avoid making a half-turn: try the Y axis instead, else keep the last move
+        half_turn = (move == (last_move + 2) % 4) & (batch_state.length > 1)
+        y_move = np.select([head_y < food_y, head_y > food_y], [1, 3], default=last_move)
+        move = np.where(half_turn, y_move, move)
+
+        # Aligned on the food or no food: continue
+        move = np.where((move == -1) | (batch_state.food < 0), last_move, move)
+        return move.astype(np.int64)
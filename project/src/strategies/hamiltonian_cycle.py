@@ -0,0 +1,334 @@
+from collections.abc import Sequence
+from array import array
+import random
+
+# Bumped whenever the generators change, so that cached cycles are regenerated
+GENERATOR_VERSION = 1
+
+# Directions ordered so that turning left is +1 and turning right is -1 (mod 4)
+DIRECTIONS = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+# Direction code of the cells that are not on the cycle
+NO_DIRECTION = 255
+
+# Order in which the neighbors of a cell are stored in the neighbor table
+NEIGHBOR_MOVES = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+# Direction code (in DIRECTIONS) of each move of NEIGHBOR_MOVES
+NEIGHBOR_DIRECTIONS = [DIRECTIONS.index(move) for move in NEIGHBOR_MOVES]
+
+
+def generate_hamiltonian_cycle(grid_width: int, grid_height: int) -> list[tuple[int, int]]:
+    """
+    Generate a Hamiltonian cycle for the given grid dimensions.
+
+    :param grid_width: The width of the game grid.
+    :param grid_height: The height of the game grid.
+    :return: The (x, y) cells in the order of the cycle.
+    """
+    cycle: list[tuple[int, int]] = []
+    visited: set[tuple[int, int]] = set()
+
+    current_pos = (0, 0)
+    ws = grid_width - 1  # world size - 1
+    max_y = grid_height - 1
+
+    while True:
+        curr_x, curr_y = current_pos
+
+        if current_pos in visited and current_pos != (0, 0):
+            break
+
+        cycle.append(current_pos)
+        visited.add(current_pos)
+
+        is_up = (curr_x % 2 == 0)
+        # Convert to the original coordinate system (y=0 at the bottom)
+        original_y = max_y - curr_y
+
+        next_direction = None
+
+        if is_up and original_y != max_y and (original_y != 0 or curr_x == 0):
+            next_direction = (0, -1)  # North (our y decreases)
+        elif is_up and original_y == max_y or (not is_up and original_y == 1 and curr_x != ws):
+            next_direction = (1, 0)   # East
+        elif original_y == 0 and curr_x != 0:
+            next_direction = (-1, 0)  # West
+        elif not is_up and original_y != 0 and (original_y > 1 or curr_x == ws):
+            next_direction = (0, 1)   # South (our y increases)
+
+        if next_direction is None:
+            break
+
+        new_pos_x = curr_x + next_direction[0]
+        new_pos_y = curr_y + next_direction[1]
+
+        if new_pos_x < 0 or new_pos_x >= grid_width or new_pos_y < 0 or new_pos_y >= grid_height:
+            break
+
+        new_pos = (new_pos_x, new_pos_y)
+
+        if new_pos == (0, 0) and len(cycle) > 1:
+            break
+
+        current_pos = new_pos
+
+    return cycle
+
+
+def generate_random_hamiltonian_cycle(grid_width: int, grid_height: int, rng: random.Random) -> list[tuple[int, int]]:
+    """
+    Generate a random Hamiltonian cycle for the given grid dimensions.
+    1. Create a spanning tree (maze) on a grid of size / 2 via the randomized Kruskal's algorithm.
+    2. Walk along the walls of this maze on the real grid, turning left as soon as possible, to generate the cycle.
+
+    Both steps work on flat arrays indexed by cell id and run in near-linear time.
+
+    :param grid_width: The width of the game grid.
+    :param grid_height: The height of the game grid.
+    :param rng: The random generator used to build the maze.
+    :return: The (x, y) cells in the order of the cycle.
+    """
+    if grid_width % 2 != 0 or grid_height % 2 != 0:
+        # If the dimensions are odd, fall back to the non-random cycle
+        return generate_hamiltonian_cycle(grid_width, grid_height)
+
+    maze_width = grid_width // 2
+    maze_height = grid_height // 2
+    maze_size = maze_width * maze_height
+
+    # --- 1. Generate the spanning tree of the maze (randomized Kruskal's algorithm) ---
+
+    # A wall between a maze cell and its east (or south) neighbor is encoded
+    # as cell * 2 (or cell * 2 + 1)
+    walls = [cell * 2 for cell in range(maze_size) if cell % maze_width != maze_width - 1]
+    walls.extend(cell * 2 + 1 for cell in range(maze_size - maze_width))
+    rng.shuffle(walls)
+
+    # Union-find over the maze cells
+    parent = list(range(maze_size))
+
+    def find(cell: int) -> int:
+        """Find the root of a cell, halving the path on the way."""
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    # open_east[cell] / open_south[cell] are set when the wall towards the
+    # east / south neighbor has been broken
+    open_east = bytearray(maze_size)
+    open_south = bytearray(maze_size)
+    passages = 0
+    for wall in walls:
+        cell = wall >> 1
+        if wall & 1:
+            neighbor = cell + maze_width
+        else:
+            neighbor = cell + 1
+
+        # Break the wall if it joins two different trees
+        root1 = find(cell)
+        root2 = find(neighbor)
+        if root1 == root2:
+            continue
+        parent[root1] = root2
+        if wall & 1:
+            open_south[cell] = 1
+        else:
+            open_east[cell] = 1
+
+        passages += 1
+        if passages == maze_size - 1:
+            break
+
+    # --- 2. Walk along the walls of this maze on the real grid, turning left as soon as possible, to generate the cycle. ---
+
+    def is_passage(x: int, y: int, direction: int) -> bool:
+        """Check if a movement is allowed (passage or intra-cellule)."""
+        if direction == 0:  # East
+            if x & 1 == 0:
+                return True  # Stays in the same cell of the maze (2x2 block)
+            return x + 1 < grid_width and open_east[(y >> 1) * maze_width + (x >> 1)] == 1
+        elif direction == 1:  # South
+            if y & 1 == 0:
+                return True
+            return y + 1 < grid_height and open_south[(y >> 1) * maze_width + (x >> 1)] == 1
+        elif direction == 2:  # West
+            if x & 1 == 1:
+                return True
+            return x > 0 and open_east[(y >> 1) * maze_width + (x >> 1) - 1] == 1
+        else:  # North
+            if y & 1 == 1:
+                return True
+            return y > 0 and open_south[((y >> 1) - 1) * maze_width + (x >> 1)] == 1
+
+    cycle = []
+    x, y = 0, 0
+    # Start looking towards the East
+    direction = 0
+
+    for _ in range(grid_width * grid_height):
+        cycle.append((x, y))
+
+        # Rule: Turn left if possible, otherwise straight, otherwise right
+        left = (direction + 1) & 3
+        if is_passage(x, y, left):
+            direction = left
+        elif not is_passage(x, y, direction):
+            # If left and straight are blocked, right must be open
+            direction = (direction - 1) & 3
+
+        # Move in the new direction
+        dx, dy = DIRECTIONS[direction]
+        x += dx
+        y += dy
+
+    return cycle
+
+
+class CycleCells(Sequence):
+    """
+    Read-only view of the cells of a cycle as (x, y) tuples, computed on
+    access from the flat order table.
+    """
+
+    def __init__(self, grid_width: int, order: Sequence[int]):
+        """
+        :param grid_width: The width of the game grid.
+        :param order: The cell ids in the order of the cycle.
+        """
+        self.grid_width = grid_width
+        self.order = order
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.order)))]
+        y, x = divmod(self.order[index], self.grid_width)
+        return (x, y)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+
+class HamiltonianCycle:
+    """
+    A Hamiltonian cycle of the grid, with flat lookup tables indexed by
+    cell id (y * grid_width + x) so that strategies never search the cycle.
+
+    The tables are plain integer sequences (arrays, or memoryviews of a
+    memory-mapped cache file, see cycle_cache):
+    - order[i]: the cell id of the i-th cell of the cycle,
+    - index[cell_id]: the index of the cell in the cycle, -1 if it is not on the cycle,
+    - next_direction[cell_id]: the code (in DIRECTIONS) of the move towards the
+      next cell of the cycle, NO_DIRECTION if the cell is not on the cycle,
+    - neighbor_index[cell_id * 4 + k]: the cycle index of the neighbor in the
+      direction NEIGHBOR_MOVES[k], -1 if it is out of the grid.
+    """
+
+    def __init__(self, grid_width: int, grid_height: int, order: Sequence[int], index: Sequence[int],
+                 next_direction: Sequence[int], neighbor_index: Sequence[int]):
+        """
+        Initialize the cycle from its tables.
+
+        :param grid_width: The width of the game grid.
+        :param grid_height: The height of the game grid.
+        :param order: The cell ids in the order of the cycle.
+        :param index: The cell id -> cycle index table.
+        :param next_direction: The cell id -> next direction code table.
+        :param neighbor_index: The cell id * 4 + k -> neighbor cycle index table.
+        """
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.order = order
+        self.index = index
+        self.next_direction = next_direction
+        self.neighbor_index = neighbor_index
+        self.cells = CycleCells(grid_width, order)
+        self._numpy_tables = None
+
+    @classmethod
+    def from_cells(cls, grid_width: int, grid_height: int, cells: list[tuple[int, int]]) -> "HamiltonianCycle":
+        """
+        Build the lookup tables of a cycle.
+
+        :param grid_width: The width of the game grid.
+        :param grid_height: The height of the game grid.
+        :param cells: The (x, y) cells in the order of the cycle.
+        :return: The cycle.
+        """
+        cell_count = grid_width * grid_height
+        order = array("I", [y * grid_width + x for x, y in cells])
+        index = array("i", [-1]) * cell_count
+        next_direction = bytearray([NO_DIRECTION]) * cell_count
+        direction_codes = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+        cycle_length = len(cells)
+        for cycle_index, (x, y) in enumerate(cells):
+            next_x, next_y = cells[(cycle_index + 1) % cycle_length]
+            dx = next_x - x
+            dy = next_y - y
+
+            # Normalize (should be only -1, 0, or 1, but it's a good practice)
+            if dx != 0:
+                dx = 1 if dx > 0 else -1
+            if dy != 0:
+                dy = 1 if dy > 0 else -1
+
+            cell_id = y * grid_width + x
+            index[cell_id] = cycle_index
+            next_direction[cell_id] = direction_codes.get((dx, dy), NO_DIRECTION)
+
+        neighbor_index = array("i", [-1]) * (cell_count * 4)
+        for y in range(grid_height):
+            for x in range(grid_width):
+                base = (y * grid_width + x) * 4
+                if x > 0:
+                    neighbor_index[base] = index[y * grid_width + x - 1]
+                if x < grid_width - 1:
+                    neighbor_index[base + 1] = index[y * grid_width + x + 1]
+                if y > 0:
+                    neighbor_index[base + 2] = index[(y - 1) * grid_width + x]
+                if y < grid_height - 1:
+                    neighbor_index[base + 3] = index[(y + 1) * grid_width + x]
+
+        return cls(grid_width, grid_height, order, index, next_direction, neighbor_index)
+
+    @classmethod
+    def generate(cls, grid_width: int, grid_height: int, random_cycle: bool, rng: random.Random) -> "HamiltonianCycle":
+        """
+        Generate a Hamiltonian cycle for the given grid dimensions.
+
+        :param grid_width: The width of the game grid.
+        :param grid_height: The height of the game grid.
+        :param random_cycle: Whether to generate a random cycle.
+        :param rng: The random generator used for random cycles.
+        :return: The cycle.
+        """
+        if random_cycle:
+            cells = generate_random_hamiltonian_cycle(grid_width, grid_height, rng)
+        else:
+            cells = generate_hamiltonian_cycle(grid_width, grid_height)
+        return cls.from_cells(grid_width, grid_height, cells)
+
+    def numpy_tables(self):
+        """
+        NumPy views of the lookup tables, for the batch strategies. The views
+        share the memory of the tables and are built on first use.
+
+        :return: The (index, next_direction, neighbor_index) arrays, the
+                 neighbor table having the shape (cell_count, 4).
+        """
+        if self._numpy_tables is None:
+            import numpy as np
+
+            self._numpy_tables = (
+                np.frombuffer(self.index, dtype=np.int32),
+                np.frombuffer(self.next_direction, dtype=np.uint8),
+                np.frombuffer(self.neighbor_index, dtype=np.int32).reshape(-1, 4),
+            )
+        return self._numpy_tables
+
+    def __len__(self) -> int:
+        """
+        :return: The number of cells of the cycle.
+        """
+        return len(self.order)
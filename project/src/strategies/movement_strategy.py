@@ -1,4 +1,14 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from ..model.batch_game_state import BatchGameState
+
+# Direction code of the moves, as used by BatchGameState
+DIRECTION_CODES = {(1, 0): 0, (0, 1): 1, (-1, 0): 2, (0, -1): 3}
 
 
 class MovementStrategy(ABC):
@@ -7,14 +17,49 @@ class MovementStrategy(ABC):
     """
 
     @abstractmethod
-    def get_move(self, snake_body: list[tuple[int, int]], food_pos: tuple[int, int] | None) -> tuple[int, int]:
+    def get_move(self, snake_body: Sequence[tuple[int, int]], food_pos: tuple[int, int] | None) -> tuple[int, int]:
         """
         Compute the next direction for the snake.
 
-        :param snake_body: A list of (x, y) tuples representing the snake's body,
+        :param snake_body: A sequence of (x, y) tuples representing the snake's body,
                           where snake_body[0] is the head.
         :param food_pos: A (x, y) tuple for the food's position, or None if there is no food.
         :return: A (dx, dy) tuple representing the next direction (e.g., (1, 0) for right).
         """
         pass
 
+    def get_moves(self, batch_state: "BatchGameState") -> "np.ndarray":
+        """
+        Compute the next direction of every game of a batch.
+
+        The default implementation calls get_move for each game, so the
+        strategies keeping state between moves share it across the games.
+        Strategies override it with vectorized operations to keep the batch
+        simulation in NumPy.
+
+        :param batch_state: The games.
+        :return: The direction code (index in BatchGameState's DIRECTIONS) of each game.
+        """
+        import numpy as np
+
+        moves = np.empty(batch_state.num_games, dtype=np.int64)
+        for game in range(batch_state.num_games):
+            move = self.get_move(batch_state.get_body(game), batch_state.get_food(game))
+            moves[game] = DIRECTION_CODES[move]
+        return moves
+
+    def set_wrap_around(self, wrap_around: bool) -> None:
+        """
+        Follow a change of the teleportation during a game.
+        The strategies that don't depend on it don't need to override it.
+
+        :param wrap_around: Whether the snake teleports to the edges.
+        """
+        pass
+
+    def reset(self) -> None:
+        """
+        Reset the internal state of the strategy before a new game.
+        Stateless strategies don't need to override it.
+        """
+        pass
@@ -0,0 +1,488 @@
+from .hamiltonian_cycle import DIRECTIONS
+from .movement_strategy import MovementStrategy
+from collections.abc import Sequence
+from heapq import heappop, heappush
+
+ALGORITHMS = ("bfs", "astar")
+
+# Moves without eating, per cell of the grid, after which the path to the
+# food is taken even if the tail may not be reachable after eating
+GIVE_UP_CELLS = 8
+
+
+class PathfindingMovementStrategy(MovementStrategy):
+    """
+    A strategy that searches the shortest path to the food (breadth-first
+    search or A*) and takes it only if the tail is still reachable once the
+    food is eaten. Otherwise it follows its tail: it only takes a move after
+    which the tail is still reachable, the closest to the food, until the
+    body has moved enough for the food to be safe to reach. As a last resort,
+    it moves towards the neighbor with the most room.
+
+    A snake going around its tail for long without eating varies its moves
+    to break the cycle, and eventually takes the path to the food anyway
+    (GIVE_UP_CELLS), so that every game ends.
+
+    The searches run on flat lists indexed by cell id (y * grid_width + x)
+    allocated once: the visited markers and the marks of the body hold the
+    generation of the search that wrote them, so a search starts by
+    incrementing a counter instead of clearing them. The candidate moves and
+    their flood fills are kept in buffers of 4 entries, so a move allocates
+    no list.
+
+    A safe path to the food is followed until the food is eaten without
+    searching again: nothing else changes the grid before the snake eats,
+    so the path stays safe. The searches only run once per food, and when
+    the snake has to wait for a path to open.
+
+    The body is an obstacle only until it moves away: the segment i (the
+    head being 0) of a snake of length L leaves its cell after L - i moves,
+    and a snake entering the cell its tail is leaving dies (see GameState),
+    so the cell of the segment i can be entered from the move L - i + 1.
+    """
+
+    def __init__(self, grid_width: int, grid_height: int, wrap_around: bool = True, algorithm: str = "astar"):
+        """
+        Initialize the strategy and allocate its search buffers.
+
+        :param grid_width: The width of the game grid.
+        :param grid_height: The height of the game grid.
+        :param wrap_around: Whether the snake teleports to the edges.
+        :param algorithm: The search of the path to the food, "bfs" or "astar".
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Invalid pathfinding algorithm: {algorithm} (expected one of {', '.join(ALGORITHMS)})")
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.algorithm = algorithm
+        self.last_move = (1, 0)
+
+        cell_count = grid_width * grid_height
+        self.cell_count = cell_count
+        self._cell_x = [cell % grid_width for cell in range(cell_count)]
+        self._cell_y = [cell // grid_width for cell in range(cell_count)]
+
+        # Body marks: the body of the generation g leaving a cell after v moves
+        # marks it with g * body_stride + v, so a cell is occupied at the move t
+        # if its mark is at least g * body_stride + t (one comparison, the
+        # marks of the previous generations being smaller)
+        self._body_stride = cell_count + 2
+        self._occupied_until = [0] * cell_count
+        self._body_base = 0
+
+        # Search buffers
+        self._visited = [0] * cell_count
+        self._closed = [0] * cell_count
+        self._distance = [0] * cell_count
+        self._parent = [0] * cell_count
+        self._queue = [0] * cell_count
+        self._heap: list[int] = []
+        self._generation = 0
+
+        # Cells of the body, of the path to the food and of the body at the end of the path
+        self._body_cells = [0] * cell_count
+        self._path = [0] * cell_count
+        self._virtual_body = [0] * cell_count
+
+        # The free neighbors of the head (direction code and cell id), the
+        # codes of the safe moves among them, and the flood fills of the
+        # neighbors (the generation of the search and the room)
+        self._candidate_codes = [0] * 4
+        self._candidate_cells = [0] * 4
+        self._safe_codes = [0] * 4
+        self._flood_generations = [0] * 4
+        self._flood_rooms = [0] * 4
+
+        # The safe path to the food being followed: the food, the length of
+        # the snake, the next index in the path and the expected head
+        self._plan_food = -1
+        self._plan_snake_length = 0
+        self._plan_length = 0
+        self._plan_index = 0
+        self._plan_head = -1
+
+        # The moves since the snake last grew, to break out of the loops
+        # around the tail when the food never becomes safe to reach (the
+        # food path is then taken anyway after GIVE_UP_CELLS moves per cell)
+        self._last_length = 0
+        self._moves_since_growth = 0
+
+        self.wrap_around = wrap_around
+        self._neighbors: list[tuple[int, ...]] = []
+        self._neighbor_by_direction: list[int] = []
+        self._build_neighbors()
+
+    def _build_neighbors(self) -> None:
+        """Build the neighbor tables of the cells, for the current wrap_around."""
+        grid_width = self.grid_width
+        grid_height = self.grid_height
+        self._neighbor_by_direction = [-1] * (self.cell_count * 4)
+        self._neighbors = []
+        for cell in range(self.cell_count):
+            x, y = self._cell_x[cell], self._cell_y[cell]
+            neighbors = []
+            for code, (dx, dy) in enumerate(DIRECTIONS):
+                neighbor_x, neighbor_y = x + dx, y + dy
+                if self.wrap_around:
+                    neighbor_x %= grid_width
+                    neighbor_y %= grid_height
+                elif not (0 <= neighbor_x < grid_width and 0 <= neighbor_y < grid_height):
+                    continue
+                neighbor = neighbor_y * grid_width + neighbor_x
+                self._neighbor_by_direction[cell * 4 + code] = neighbor
+                neighbors.append(neighbor)
+            self._neighbors.append(tuple(neighbors))
+
+    def set_wrap_around(self, wrap_around: bool) -> None:
+        """
+        Follow a change of the teleportation.
+
+        :param wrap_around: Whether the snake teleports to the edges.
+        """
+        if wrap_around != self.wrap_around:
+            self.wrap_around = wrap_around
+            self._build_neighbors()
+            self._plan_length = 0
+
+    def reset(self) -> None:
+        """Forget the last move and the path being followed."""
+        self.last_move = (1, 0)
+        self._plan_length = 0
+        self._last_length = 0
+
+    def _mark_body(self, cells: list[int], length: int) -> None:
+        """
+        Mark the cells of a body as obstacles until they are left.
+
+        :param cells: The cell ids of the body, the head first.
+        :param length: The length of the body.
+        """
+        self._body_base += self._body_stride
+        occupied_until = self._occupied_until
+        last_mark = self._body_base + length
+        for index in range(length):
+            occupied_until[cells[index]] = last_mark - index
+
+    def _bfs(self, start: int, target: int) -> int:
+        """
+        Breadth-first search from a cell, around the marked body.
+
+        :param start: The cell id of the start.
+        :param target: The cell id of the target, or -1 to visit every reachable cell.
+        :return: The distance to the target (-1 if it is unreachable), or the
+                 number of reachable cells if there is no target.
+        """
+        self._generation += 1
+        generation = self._generation
+        visited = self._visited
+        distance = self._distance
+        parent = self._parent
+        queue = self._queue
+        neighbors = self._neighbors
+        occupied_until = self._occupied_until
+        body_base = self._body_base
+
+        visited[start] = generation
+        distance[start] = 0
+        queue[0] = start
+        read, write = 0, 1
+        while read < write:
+            cell = queue[read]
+            read += 1
+            time = distance[cell] + 1
+            occupied_mark = body_base + time
+            for neighbor in neighbors[cell]:
+                if visited[neighbor] == generation:
+                    continue
+                if occupied_until[neighbor] >= occupied_mark:
+                    # Still occupied at that time, maybe reachable later by a longer path
+                    continue
+                visited[neighbor] = generation
+                distance[neighbor] = time
+                parent[neighbor] = cell
+                if neighbor == target:
+                    return time
+                queue[write] = neighbor
+                write += 1
+        return -1 if target >= 0 else write
+
+    def _astar(self, start: int, target: int) -> int:
+        """
+        A* search from a cell to a target, around the marked body, with the
+        Manhattan distance (across the edges with wrap_around) as heuristic.
+
+        :param start: The cell id of the start.
+        :param target: The cell id of the target.
+        :return: The distance to the target, -1 if it is unreachable.
+        """
+        self._generation += 1
+        generation = self._generation
+        visited = self._visited
+        closed = self._closed
+        distance = self._distance
+        parent = self._parent
+        neighbors = self._neighbors
+        occupied_until = self._occupied_until
+        body_base = self._body_base
+        cell_x = self._cell_x
+        cell_y = self._cell_y
+        grid_width = self.grid_width
+        grid_height = self.grid_height
+        wrap_around = self.wrap_around
+        cell_count = self.cell_count
+        target_x, target_y = cell_x[target], cell_y[target]
+
+        # Heap keys pack (f, ties broken towards the deepest cells, cell) in one int
+        priority_stride = cell_count + 1
+        heap = self._heap
+        heap.clear()
+        visited[start] = generation
+        distance[start] = 0
+        heappush(heap, cell_count * cell_count + start)
+        while heap:
+            cell = heappop(heap) % cell_count
+            if closed[cell] == generation:
+                continue
+            if cell == target:
+                return distance[cell]
+            closed[cell] = generation
+
+            time = distance[cell] + 1
+            occupied_mark = body_base + time
+            for neighbor in neighbors[cell]:
+                if visited[neighbor] == generation and distance[neighbor] <= time:
+                    continue
+                if occupied_until[neighbor] >= occupied_mark:
+                    continue
+                visited[neighbor] = generation
+                distance[neighbor] = time
+                parent[neighbor] = cell
+
+                dx = abs(cell_x[neighbor] - target_x)
+                dy = abs(cell_y[neighbor] - target_y)
+                if wrap_around:
+                    dx = min(dx, grid_width - dx)
+                    dy = min(dy, grid_height - dy)
+                priority = (time + dx + dy) * priority_stride + cell_count - time
+                heappush(heap, priority * cell_count + neighbor)
+        return -1
+
+    def _trace_path(self, target: int, length: int) -> None:
+        """
+        Write the cells of the path found by the last search to the path
+        buffer, the cell after the start first.
+
+        :param target: The cell id of the target.
+        :param length: The distance to the target.
+        """
+        path = self._path
+        parent = self._parent
+        cell = target
+        for index in range(length - 1, -1, -1):
+            path[index] = cell
+            cell = parent[cell]
+
+    def _move_towards(self, head: int, cell: int) -> tuple[int, int]:
+        """
+        :return: The direction from the head to a neighbor cell.
+        """
+        base = head * 4
+        for code in range(4):
+            if self._neighbor_by_direction[base + code] == cell:
+                return DIRECTIONS[code]
+        return self.last_move
+
+    def _is_safe_after_path(self, distance: int, length: int) -> bool:
+        """
+        Check that the tail is reachable once the snake has followed the path
+        to the food and eaten it.
+
+        :param distance: The length of the path.
+        :param length: The length of the snake before eating.
+        :return: True if the tail is reachable, or if eating wins the game.
+        """
+        new_length = length + 1
+        if new_length >= self.cell_count:
+            return True
+
+        # Body at the end of the path: the path backwards, then the old body
+        virtual_body = self._virtual_body
+        path = self._path
+        count = min(distance, new_length)
+        for index in range(count):
+            virtual_body[index] = path[distance - 1 - index]
+        body_cells = self._body_cells
+        for index in range(count, new_length):
+            virtual_body[index] = body_cells[index - distance]
+        self._mark_body(virtual_body, new_length)
+        return self._bfs(virtual_body[0], virtual_body[new_length - 1]) > 0
+
+    def _tail_distance_after_move(self, cell: int, food: int, length: int, avoid_food: bool) -> int:
+        """
+        Check that the tail is still reachable after moving to a neighbor of
+        the head, eating the food if it is there.
+
+        :param cell: The cell id of the neighbor.
+        :param food: The cell id of the food, -1 if there is none.
+        :param length: The length of the snake before the move.
+        :param avoid_food: Whether the way to the tail may not pass over the
+                           food, which would grow the snake.
+        :return: The distance from the new head to the new tail (the number
+                 of cells if the snake is too short to block itself), -1 if
+                 the tail is unreachable.
+        """
+        new_length = length + 1 if cell == food else length
+        if new_length >= self.cell_count:
+            return self.cell_count
+        if new_length < 3:
+            return self.cell_count
+
+        virtual_body = self._virtual_body
+        body_cells = self._body_cells
+        virtual_body[0] = cell
+        for index in range(1, new_length):
+            virtual_body[index] = body_cells[index - 1]
+        self._mark_body(virtual_body, new_length)
+        if avoid_food and food >= 0 and cell != food:
+            # An obstacle until the next search
+            self._occupied_until[food] = self._body_base + self._body_stride - 1
+        return self._bfs(cell, virtual_body[new_length - 1])
+
+    def get_move(self, snake_body: Sequence[tuple[int, int]], food_pos: tuple[int, int] | None) -> tuple[int, int]:
+        """
+        Determine the next movement: the safe shortest path to the food, else
+        the move keeping the tail reachable the closest to the food, else the
+        neighbor with the most room.
+
+        :param snake_body: The current body of the snake.
+        :param food_pos: The position of the food.
+        :return: The (dx, dy) direction.
+        """
+        grid_width = self.grid_width
+        head_x, head_y = snake_body[0]
+        head = head_y * grid_width + head_x
+        food = -1 if food_pos is None else food_pos[1] * grid_width + food_pos[0]
+        if len(snake_body) != self._last_length:
+            self._last_length = len(snake_body)
+            self._moves_since_growth = 0
+        self._moves_since_growth += 1
+
+        # 0. Keep following the safe path to the food, if the game went as planned
+        if (self._plan_index < self._plan_length and head == self._plan_head and food == self._plan_food
+                and len(snake_body) == self._plan_snake_length):
+            return self._follow_plan(head)
+        self._plan_length = 0
+
+        body_cells = self._body_cells
+        length = 0
+        for x, y in snake_body:
+            body_cells[length] = y * grid_width + x
+            length += 1
+
+        # 1. The shortest path to the food, if the tail is reachable after
+        # eating, or if the snake has looped around its tail for too long
+        self._mark_body(body_cells, length)
+        if food >= 0:
+            if self.algorithm == "astar":
+                distance = self._astar(head, food)
+            else:
+                distance = self._bfs(head, food)
+            if distance > 0:
+                self._trace_path(food, distance)
+                if (self._moves_since_growth > GIVE_UP_CELLS * self.cell_count
+                        or self._is_safe_after_path(distance, length)):
+                    self._plan_food = food
+                    self._plan_snake_length = length
+                    self._plan_length = distance
+                    self._plan_index = 0
+                    return self._follow_plan(head)
+                self._mark_body(body_cells, length)
+
+        # The free neighbors of the head
+        occupied_until = self._occupied_until
+        candidate_codes = self._candidate_codes
+        candidate_cells = self._candidate_cells
+        candidate_count = 0
+        for code in range(4):
+            neighbor = self._neighbor_by_direction[head * 4 + code]
+            if neighbor >= 0 and occupied_until[neighbor] <= self._body_base:
+                candidate_codes[candidate_count] = code
+                candidate_cells[candidate_count] = neighbor
+                candidate_count += 1
+
+        # 2. Follow the tail: the moves after which the tail is still
+        # reachable, without passing over the food if possible (it would grow
+        # the snake). The closest to the food is taken (the one leaving the
+        # tail the farthest on a tie), so that the food may become safe to
+        # reach. After a while without eating, the move is a pseudo-random one
+        # of them, breaking out of the cycles of the deterministic choice.
+        cell_x, cell_y = self._cell_x, self._cell_y
+        food_x = cell_x[food] if food >= 0 else 0
+        food_y = cell_y[food] if food >= 0 else 0
+        stuck = self._moves_since_growth > self.cell_count
+        safe_codes = self._safe_codes
+        best_code = -1
+        for avoid_food in (True, False):
+            safe_count = 0
+            best_food_distance = best_tail_distance = -1
+            for index in range(candidate_count):
+                neighbor = candidate_cells[index]
+                tail_distance = self._tail_distance_after_move(neighbor, food, length, avoid_food)
+                if tail_distance < 0:
+                    continue
+                safe_codes[safe_count] = candidate_codes[index]
+                safe_count += 1
+                dx = abs(cell_x[neighbor] - food_x)
+                dy = abs(cell_y[neighbor] - food_y)
+                if self.wrap_around:
+                    dx = min(dx, self.grid_width - dx)
+                    dy = min(dy, self.grid_height - dy)
+                if (best_code < 0 or dx + dy < best_food_distance
+                        or (dx + dy == best_food_distance and tail_distance > best_tail_distance)):
+                    best_food_distance = dx + dy
+                    best_tail_distance = tail_distance
+                    best_code = candidate_codes[index]
+            if stuck and safe_count:
+                best_code = safe_codes[(self._moves_since_growth * 2654435761 >> 16) % safe_count]
+            if best_code >= 0:
+                return self._remember(DIRECTIONS[best_code])
+
+        # 3. The free neighbor with the most room. The neighbors reached by the
+        # flood fill of a previous neighbor share its room.
+        self._mark_body(body_cells, length)
+        best_room = -1
+        visited = self._visited
+        flood_generations = self._flood_generations
+        flood_rooms = self._flood_rooms
+        flood_count = 0
+        for index in range(candidate_count):
+            neighbor = candidate_cells[index]
+            for flood in range(flood_count):
+                if visited[neighbor] == flood_generations[flood]:
+                    room = flood_rooms[flood]
+                    break
+            else:
+                room = self._bfs(neighbor, -1)
+                flood_generations[flood_count] = self._generation
+                flood_rooms[flood_count] = room
+                flood_count += 1
+            if room > best_room:
+                best_room = room
+                best_code = candidate_codes[index]
+        return self._remember(DIRECTIONS[best_code] if best_code >= 0 else self.last_move)
+
+    def _follow_plan(self, head: int) -> tuple[int, int]:
+        """
+        :return: The next move of the path being followed.
+        """
+        next_cell = self._path[self._plan_index]
+        self._plan_index += 1
+        self._plan_head = next_cell
+        return self._remember(self._move_towards(head, next_cell))
+
+    def _remember(self, move: tuple[int, int]) -> tuple[int, int]:
+        """
+        :return: The move, remembered as the last move.
+        """
+        self.last_move = move
+        return move
@@ -1,4 +1,5 @@
 from .movement_strategy import MovementStrategy
+from collections.abc import Sequence
 
 
 class PlayerMovementStrategy(MovementStrategy):
@@ -12,9 +13,15 @@ class PlayerMovementStrategy(MovementStrategy):
         
         :param initial_direction: The starting direction of the snake.
         """
+        self.initial_direction = initial_direction
         self.pending_direction = initial_direction
         self.current_direction = initial_direction
 
+    def reset(self) -> None:
+        """Restore the initial direction."""
+        self.pending_direction = self.initial_direction
+        self.current_direction = self.initial_direction
+
     def set_pending_direction(self, new_direction: tuple[int, int], snake_length: int) -> None:
         """
         Set the next direction, preventing the snake from reversing.
@@ -30,7 +37,7 @@ class PlayerMovementStrategy(MovementStrategy):
                 return
         self.pending_direction = new_direction
 
-    def get_move(self, snake_body: list[tuple[int, int]], food_pos: tuple[int, int] | None) -> tuple[int, int]:
+    def get_move(self, snake_body: Sequence[tuple[int, int]], food_pos: tuple[int, int] | None) -> tuple[int, int]:
         """
         Return the pending direction set by the player.
 
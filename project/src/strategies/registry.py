@@ -0,0 +1,163 @@
+from collections.abc import Callable
+
+from .hamiltonian_skip_strategy import HamiltonianSkipMovementStrategy
+from .hamiltonian_strategy import HamiltonianMovementStrategy
+from .player_strategy import PlayerMovementStrategy
+from .dummy_strategy import DummyMovementStrategy
+from .pathfinding_strategy import PathfindingMovementStrategy
+from .movement_strategy import MovementStrategy
+from .hamiltonian_cycle import HamiltonianCycle
+from .cycle_cache import get_cycle
+
+StrategyFactory = Callable[["StrategyRegistry"], MovementStrategy]
+
+# Strategy name (as written in the config) -> (display name, factory)
+STRATEGIES: dict[str, tuple[str, StrategyFactory]] = {}
+# Other config name of a strategy -> its registered name
+STRATEGY_ALIASES: dict[str, str] = {}
+
+
+def register_strategy(name: str, display_name: str,
+                      aliases: tuple[str, ...] = ()) -> Callable[[StrategyFactory], StrategyFactory]:
+    """
+    Decorator registering a strategy factory under a config name.
+
+    :param name: The name of the strategy in the config.
+    :param display_name: The name shown by the views.
+    :param aliases: Other names of the strategy in the config, sharing its instance.
+    :return: The decorator.
+    """
+    def decorator(factory: StrategyFactory) -> StrategyFactory:
+        STRATEGIES[name] = (display_name, factory)
+        for alias in aliases:
+            STRATEGY_ALIASES[alias] = name
+        return factory
+    return decorator
+
+
+class StrategyRegistry:
+    """
+    Builds the strategies of a game on first use and keeps them for the
+    following uses, so that startup only pays for the strategies actually
+    played. The Hamiltonian cycle is shared by the strategies following it.
+    """
+
+    def __init__(self, config: dict, seed: int | None = None):
+        """
+        Initialize the registry.
+
+        :param config: Game configuration.
+        :param seed: The seed of the run, or None for a non reproducible run.
+        """
+        self.config = config
+        self.seed = seed
+        self.grid_width = config["game"]["grid_width"]
+        self.grid_height = config["game"]["grid_height"]
+        self.wrap_around = config["game"]["wrap_around"]
+        self._instances: dict[str, MovementStrategy] = {}
+        self._cycle: HamiltonianCycle | None = None
+
+    @property
+    def cycle(self) -> HamiltonianCycle:
+        """
+        :return: The Hamiltonian cycle of the game, loaded or generated on first access.
+        """
+        if self._cycle is None:
+            hamiltonian_config = self.config["hamiltonian"]
+            self._cycle = get_cycle(
+                self.grid_width,
+                self.grid_height,
+                hamiltonian_config["random_cycle"],
+                self.seed,
+                hamiltonian_config.get("cache_dir")
+            )
+        return self._cycle
+
+    @staticmethod
+    def resolve(name: str) -> str:
+        """
+        :param name: The name of the strategy in the config, or one of its aliases.
+        :return: The registered name of the strategy.
+        """
+        key = name.lower()
+        key = STRATEGY_ALIASES.get(key, key)
+        if key not in STRATEGIES:
+            raise ValueError(f"Invalid strategy: {name}")
+        return key
+
+    def get(self, name: str) -> MovementStrategy:
+        """
+        Get a strategy, building it if it's the first time it is used.
+
+        :param name: The name of the strategy in the config.
+        :return: The strategy instance.
+        """
+        key = self.resolve(name)
+        strategy = self._instances.get(key)
+        if strategy is None:
+            strategy = STRATEGIES[key][1](self)
+            self._instances[key] = strategy
+        return strategy
+
+    def display_name(self, name: str) -> str:
+        """
+        :param name: The name of the strategy in the config.
+        :return: The name shown by the views.
+        """
+        return STRATEGIES[self.resolve(name)][0]
+
+    def reset(self) -> None:
+        """Reset the strategies that have been built."""
+        for strategy in self._instances.values():
+            strategy.reset()
+
+    def set_wrap_around(self, wrap_around: bool) -> None:
+        """
+        Follow a change of the teleportation, in the strategies that have
+        been built and in the ones built later.
+
+        :param wrap_around: Whether the snake teleports to the edges.
+        """
+        self.wrap_around = wrap_around
+        for strategy in self._instances.values():
+            strategy.set_wrap_around(wrap_around)
+
+
+@register_strategy("player", "Player")
+def _create_player_strategy(registry: StrategyRegistry) -> MovementStrategy:
+    return PlayerMovementStrategy()
+
+
+@register_strategy("dummy", "Dummy")
+def _create_dummy_strategy(registry: StrategyRegistry) -> MovementStrategy:
+    return DummyMovementStrategy()
+
+
+@register_strategy("cycle", "Cycle", aliases=("hamiltonian",))
+def _create_cycle_strategy(registry: StrategyRegistry) -> MovementStrategy:
+    return HamiltonianMovementStrategy(
+        registry.grid_width,
+        registry.grid_height,
+        registry.config["hamiltonian"]["random_cycle"],
+        cycle=registry.cycle
+    )
+
+
+@register_strategy("hamiltonian_skip", "Hamiltonian Skip")
+def _create_hamiltonian_skip_strategy(registry: StrategyRegistry) -> MovementStrategy:
+    return HamiltonianSkipMovementStrategy(
+        registry.grid_width,
+        registry.grid_height,
+        registry.config["hamiltonian"]["random_cycle"],
+        cycle=registry.cycle
+    )
+
+
+@register_strategy("pathfinding", "Pathfinding")
+def _create_pathfinding_strategy(registry: StrategyRegistry) -> MovementStrategy:
+    return PathfindingMovementStrategy(
+        registry.grid_width,
+        registry.grid_height,
+        registry.wrap_around,
+        registry.config.get("pathfinding", {}).get("algorithm", "astar")
+    )
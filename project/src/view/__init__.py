@@ -1,6 +1,12 @@
 from .console_view import ConsoleView
-from .pygame_view import PygameView
 from .base_view import BaseView
 
 __all__ = ["BaseView", "PygameView", "ConsoleView"]
 
+
+def __getattr__(name: str):
+    """Import the pygame view (and pygame) only when it is used."""
+    if name == "PygameView":
+        from .pygame_view import PygameView
+        return PygameView
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -8,6 +8,10 @@ class BaseView(ABC):
     Defines the common interface that all views must implement.
     """
 
+    # True for the views drawing with pygame, the controller then drives
+    # the game with pygame events instead of the console input
+    uses_pygame = False
+
     @abstractmethod
     def initialize(self) -> None:
         """
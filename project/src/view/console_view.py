@@ -1,14 +1,88 @@
+from collections.abc import Iterator
+
 from ..model.game_state import GameState
 from .base_view import BaseView
 import platform
-import os
 import sys
 
+# ANSI escape sequences
+CLEAR_SCREEN = "\033[2J\033[H"
+CLEAR_LINE_END = "\033[K"
+HIDE_CURSOR = "\033[?25l"
+SHOW_CURSOR = "\033[?25h"
+HEAD_STYLE = "\033[1;32m"
+FOOD_STYLE = "\033[1;31m"
+RESET_STYLE = "\033[0m"
+
+# Glyphs of the cells
+EMPTY_GLYPH = "·"
+BODY_GLYPH = "○"
+HEAD_GLYPH = "◉"
+FOOD_GLYPH = "★"
+
+# Compact mode: a braille character shows 2x4 cells, BRAILLE_DOTS[y][x]
+# being the dot of the cell (x, y) of the character
+BRAILLE_BLANK = 0x2800
+BRAILLE_DOTS = ((0x01, 0x08), (0x02, 0x10), (0x04, 0x20), (0x40, 0x80))
+# The characters of the dot masks, the empty mask being a space
+BRAILLE_TABLE = {mask: chr(BRAILLE_BLANK + mask) for mask in range(1, 256)} | {0: " "}
+# A cell outside of the grid, never occupied
+OUTSIDE_CELL = (-1, -1)
+
+# Values of graphics.console.compact
+COMPACT_MODES = ("auto", True, False)
+
+# Screen row of the first row of the grid (1-based), below the header
+GRID_TOP_ROW = 4
+# Screen rows besides the grid: header, footer, info lines and game over message
+FRAME_ROWS = 15
+
+
+def move_to(row: int, column: int) -> str:
+    """
+    :return: The ANSI sequence moving the cursor to a screen position (1-based).
+    """
+    return f"\033[{row};{column}H"
+
+
+def scroll(position: int, origin: int, size: int, grid_size: int, align: int) -> int:
+    """
+    Scroll a viewport along an axis so that it shows a position: it stays
+    put while the position is away from its edges, and is recentered on it
+    otherwise.
+
+    :param position: The position to show.
+    :param origin: The current origin of the viewport.
+    :param size: The size of the viewport.
+    :param grid_size: The size of the grid.
+    :param align: The origin is a multiple of align.
+    :return: The new origin.
+    """
+    if size >= grid_size:
+        return 0
+    margin = size // 4
+    if origin + margin <= position < origin + size - margin:
+        return origin
+    origin = max(position - size // 2, 0)
+    origin -= origin % align
+    # The last origin is rounded up to align, so the viewport may extend past
+    # the end of the grid: the last rows are then always reachable.
+    return min(origin, -(-(grid_size - size) // align) * align)
+
 
 class ConsoleView(BaseView):
     """
     Console view that displays the Snake game in the terminal.
     Uses ASCII characters to represent the snake and food.
+
+    The previous frame is kept (the text lines and the glyphs of the occupied
+    cells), and a frame only writes the lines and the cells that changed,
+    with cursor moves, in a single write.
+
+    A grid too large for the terminal is drawn in compact mode, 2x4 cells
+    per braille character, and the viewport follows the head if it still
+    doesn't fit, so that the cost of a frame depends on the size of the
+    terminal, not of the grid.
     """
 
     def __init__(self, config: dict):
@@ -23,123 +97,348 @@ class ConsoleView(BaseView):
         self.grid_height = config["game"]["grid_height"]
         self.first_render = True
 
+        console_config = config["graphics"].get("console", {})
+        self.compact_mode = console_config.get("compact", "auto")
+        if self.compact_mode not in COMPACT_MODES:
+            raise ValueError(f"Unknown console compact mode {self.compact_mode}, expected auto, true or false")
+        self.follow_head = console_config.get("follow_head", True)
+
+        # The previous frame: its lines, and the glyphs of its non-empty cells
+        # (the rows of characters of the grid and its highlighted characters
+        # in compact mode)
+        self.drawn_lines: list[str] = []
+        self.drawn_cells: dict[tuple[int, int], str] = {}
+        self.drawn_rows: list[str] = []
+
+        # Compact mode: the cells of each dot of the characters of the
+        # viewport, for the origin of the viewport they were built for
+        self.dot_cells: list[tuple[int, list[tuple[int, int]]]] = []
+        self.dot_cells_origin = None
+
+        # The whole grid until the size of the terminal is known
+        self.setup_layout(None, None)
+
     def initialize(self) -> None:
         """Initialize the console view."""
-        self.clear_screen()
-        print("=== SNAKE GAME - CONSOLE VIEW ===")
-        print()
+        import shutil
 
-    def clear_screen(self) -> None:
-        """Clear the terminal screen."""
         if platform.system() == "Windows":
-            os.system('cls')
-        else:
-            os.system('clear')
-    
-    def move_cursor_to_top(self) -> None:
-        """Move cursor to the top of the terminal without clearing."""
-        if platform.system() != "Windows":
-            # ANSI escape code to move cursor to home position
-            sys.stdout.write("\033[H")
-            sys.stdout.flush()
+            self.enable_ansi_windows()
+        self.setup_layout(*shutil.get_terminal_size())
+        sys.stdout.write(CLEAR_SCREEN + HIDE_CURSOR + "=== SNAKE GAME - CONSOLE VIEW ===\n\n")
+        sys.stdout.flush()
+
+    def setup_layout(self, columns: int | None, rows: int | None) -> None:
+        """
+        Choose between the normal and the compact mode, and the size of the
+        viewport, for the size of the terminal.
+
+        :param columns: The number of columns of the terminal, None if unbounded.
+        :param rows: The number of rows of the terminal, None if unbounded.
+        """
+        grid_rows = None if rows is None else max(1, rows - FRAME_ROWS)
+        fits = ((columns is None or self.grid_width * 2 + 4 <= columns)
+                and (grid_rows is None or self.grid_height <= grid_rows))
+        self.compact = not fits if self.compact_mode == "auto" else self.compact_mode
+
+        if self.compact:
+            # "║" + a character per 2x4 cells + "║"
+            self.cell_columns, self.cell_rows = 2, 4
+            self.empty_glyph = " "
+            char_columns = None if columns is None else max(1, columns - 2)
         else:
-            # For Windows, we can try to use ANSI codes if supported
-            try:
-                sys.stdout.write("\033[H")
-                sys.stdout.flush()
-            except:
-                # Fallback: clear screen on Windows if ANSI not supported
-                os.system('cls')
+            # "║ " + 2 characters per cell + " ║"
+            self.cell_columns, self.cell_rows = 1, 1
+            self.empty_glyph = EMPTY_GLYPH
+            char_columns = None if columns is None else max(1, (columns - 4) // 2)
 
-    def render(self, game_state: GameState, current_strategy: str, speed: int) -> None:
+        self.view_x = self.view_y = 0
+        self.view_width, self.view_height = self.grid_width, self.grid_height
+        if self.follow_head:
+            if char_columns is not None:
+                self.view_width = min(self.grid_width, char_columns * self.cell_columns)
+            if grid_rows is not None:
+                self.view_height = min(self.grid_height, grid_rows * self.cell_rows)
+        self.clipped = self.view_width < self.grid_width or self.view_height < self.grid_height
+        self.char_columns = -(-self.view_width // self.cell_columns)
+        self.char_rows = -(-self.view_height // self.cell_rows)
+        self.first_render = True
+
+    @staticmethod
+    def enable_ansi_windows() -> None:
+        """Enable the processing of the ANSI escape sequences by the Windows console."""
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # Standard output
+        mode = ctypes.c_uint32()
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            kernel32.SetConsoleMode(handle, mode.value | 0x0004)  # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+
+    def clear_screen(self) -> None:
+        """Clear the terminal screen."""
+        sys.stdout.write(CLEAR_SCREEN)
+        sys.stdout.flush()
+        self.first_render = True
+
+    def frame_lines(self, game_state: GameState, current_strategy: str, speed: int) -> list[str]:
         """
-        Display the current game state in the terminal.
+        Build the lines of a frame, the rows of the grid being empty (the
+        cells are drawn over them).
 
         :param game_state: The game state to display.
         :param current_strategy: The name of the currently active strategy.
         :param speed: The current speed of the game.
+        :return: The lines, one per screen row.
         """
-        # On first render, clear screen. After that, just move cursor to top
-        if self.first_render:
-            self.clear_screen()
-            self.first_render = False
+        if self.compact:
+            inner_width = self.char_columns
+            grid_line = "║" + self.empty_glyph * self.char_columns + "║"
         else:
-            self.move_cursor_to_top()
-        
-        # Calculate the width for proper alignment
-        # Each cell takes 2 characters ("◉ "), so grid takes grid_width * 2 chars
-        # Plus 2 spaces for padding (one on each side after ║)
-        inner_width = self.grid_width * 2 + 2
+            # Each cell takes 2 characters ("◉ "), so grid takes grid_width * 2 chars
+            # Plus 2 spaces for padding (one on each side after ║)
+            inner_width = self.char_columns * 2 + 2
+            grid_line = "║ " + f"{self.empty_glyph} " * self.char_columns + " ║"
         border_line = "═" * inner_width
-        
+
         # Header
-        print("╔" + border_line + "╗")
-        
-        # Score line with proper padding
         score_text = f" SNAKE - Score: {game_state.score} "
-        padding_needed = inner_width - len(score_text)
-        score_line = "║" + score_text + " " * padding_needed + "║"
-        print(score_line)
-        
-        print("╠" + border_line + "╣")
-        
+        lines = [
+            "╔" + border_line + "╗",
+            "║" + score_text.ljust(inner_width) + "║",
+            "╠" + border_line + "╣",
+        ]
+
         # Game grid
-        for y in range(self.grid_height):
-            row = "║ "
-            for x in range(self.grid_width):
-                pos = (x, y)
-                if pos == game_state.snake.get_head():
-                    row += "◉ "  # Snake head
-                elif pos in game_state.snake.body:
-                    row += "○ "  # Snake body
-                elif pos == game_state.food:
-                    row += "★ "  # Food
-                else:
-                    row += "· "  # Empty cell
-            row += " ║"
-            print(row)
-        
+        lines.extend([grid_line] * self.char_rows)
+
         # Footer
-        print("╚" + border_line + "╝")
-        print()
-        
-        # Info lines - fixed width to avoid flickering
+        lines.append("╚" + border_line + "╝")
+        lines.append("")
+
+        # Info lines
         info_width = len(border_line) + 2  # +2 for the ║ borders
-        
-        mode_line = f"Mode: {current_strategy}"
-        print(mode_line.ljust(info_width))
-        
-        teleport_line = f"Teleportation: {'ON' if game_state.wrap_around else 'OFF'}"
-        print(teleport_line.ljust(info_width))
-        
-        speed_line = f"Speed: {speed}ms"
-        print(speed_line.ljust(info_width))
-        print()
-        
+        lines.append(f"Mode: {current_strategy}")
+        lines.append(f"Teleportation: {'ON' if game_state.wrap_around else 'OFF'}")
+        lines.append(f"Speed: {speed}ms")
+        if self.clipped:
+            # The viewport may extend past the end of the grid
+            last_x = min(self.view_x + self.view_width, self.grid_width) - 1
+            last_y = min(self.view_y + self.view_height, self.grid_height) - 1
+            lines.append(f"View: x {self.view_x}-{last_x}, y {self.view_y}-{last_y} "
+                         f"of {self.grid_width}x{self.grid_height}")
+        lines.append("")
+
         # Game over display
         if game_state.game_over:
             if game_state.win:
-                victory_line = "🎉 VICTORY ! 🎉"
-                print(victory_line.center(info_width))
+                lines.append("🎉 VICTORY ! 🎉".center(info_width))
             else:
-                gameover_line = "💀 GAME OVER ! 💀"
-                print(gameover_line.center(info_width))
-            
-            score_line = f"Final score: {game_state.score}"
-            print(score_line.center(info_width))
-            print()
-            restart_line = "Press SPACE to restart"
-            print(restart_line.center(info_width))
+                lines.append("💀 GAME OVER ! 💀".center(info_width))
+            lines.append(f"Final score: {game_state.score}".center(info_width))
+            lines.append("")
+            lines.append("Press SPACE to restart".center(info_width))
         else:
-            commands_line = "Commands: ZASD/Arrows = Move | 0 = Auto | 1 = Dummy | T = Teleportation | ESC = Quit"
-            print(commands_line.ljust(info_width))
-        
-        # Add some blank lines to clear any leftover text from previous renders
-        print("\n" * 3)
+            lines.append("Commands: ZASD/Arrows = Move | 0 = Auto | 1 = Dummy | 2 = Pathfinding | T = Teleportation | ESC = Quit")
+        return lines
+
+    def visible_body(self, game_state: GameState) -> Iterator[tuple[int, int]]:
+        """
+        Find the cells of the snake in the viewport, iterating over the body
+        or over the viewport, whichever is smaller.
+
+        :param game_state: The game state.
+        :return: The (x, y) cells, relative to the viewport.
+        """
+        view_x, view_y = self.view_x, self.view_y
+        view_width, view_height = self.view_width, self.view_height
+        snake = game_state.snake
+        if len(snake) <= view_width * view_height:
+            for x, y in snake.body:
+                x -= view_x
+                y -= view_y
+                if 0 <= x < view_width and 0 <= y < view_height:
+                    yield x, y
+        else:
+            for y in range(view_height):
+                for x in range(view_width):
+                    if (view_x + x, view_y + y) in snake:
+                        yield x, y
+
+    def to_view(self, position: tuple[int, int] | None) -> tuple[int, int] | None:
+        """
+        :return: The (x, y) position of a cell relative to the viewport, None
+                 if it isn't in the viewport.
+        """
+        if position is None:
+            return None
+        x, y = position[0] - self.view_x, position[1] - self.view_y
+        if 0 <= x < self.view_width and 0 <= y < self.view_height:
+            return x, y
+        return None
+
+    def visible_glyphs(self, game_state: GameState) -> dict[tuple[int, int], str]:
+        """
+        Build the glyphs of the non-empty cells of the grid (normal mode).
+
+        :param game_state: The game state to display.
+        :return: The glyphs by (x, y) of their cell in the viewport.
+        """
+        if self.clipped:
+            glyphs = dict.fromkeys(self.visible_body(game_state), BODY_GLYPH)
+        else:
+            glyphs = dict.fromkeys(game_state.snake.body, BODY_GLYPH)
+        for position, glyph in ((game_state.snake.get_head(), HEAD_GLYPH), (game_state.food, FOOD_GLYPH)):
+            position = self.to_view(position)
+            if position is not None:
+                glyphs[position] = glyph
+        return glyphs
+
+    def build_dot_cells(self) -> None:
+        """
+        List the cells of each dot of the characters of the viewport, the
+        characters in row-major order, for the current origin of the viewport.
+        """
+        view_x, view_y = self.view_x, self.view_y
+        grid_width, grid_height = self.grid_width, self.grid_height
+        self.dot_cells = []
+        for dy, row_dots in enumerate(BRAILLE_DOTS):
+            for dx, dot in enumerate(row_dots):
+                cells = []
+                for char_y in range(self.char_rows):
+                    y = view_y + char_y * 4 + dy
+                    for char_x in range(self.char_columns):
+                        x = view_x + char_x * 2 + dx
+                        cells.append((x, y) if x < grid_width and y < grid_height else OUTSIDE_CELL)
+                self.dot_cells.append((dot, cells))
+        self.dot_cells_origin = (view_x, view_y)
+
+    def compact_masks(self, game_state: GameState) -> bytearray:
+        """
+        Build the dot masks of the characters of the viewport (compact mode).
+        A short snake is drawn from its body; a long one from the membership
+        of the cells of each dot of the viewport, one pass per dot, without a
+        Python operation per cell.
+
+        :param game_state: The game state to display.
+        :return: The masks of the characters, in row-major order.
+        """
+        char_columns = self.char_columns
+        char_count = char_columns * self.char_rows
+        snake = game_state.snake
+        if len(snake) <= self.view_width * self.view_height // 2:
+            masks = bytearray(char_count)
+            for x, y in self.visible_body(game_state):
+                masks[(y >> 2) * char_columns + (x >> 1)] |= BRAILLE_DOTS[y & 3][x & 1]
+        else:
+            if self.dot_cells_origin != (self.view_x, self.view_y):
+                self.build_dot_cells()
+            # Each dot is a byte per character (0 or 1) of a big integer,
+            # scaled by the bit of the dot: the sum is the masks
+            total = 0
+            for dot, cells in self.dot_cells:
+                total += dot * int.from_bytes(bytes(map(snake.__contains__, cells)), "big")
+            masks = bytearray(total.to_bytes(char_count, "big"))
+
+        food = self.to_view(game_state.food)
+        if food is not None:
+            x, y = food
+            masks[(y >> 2) * char_columns + (x >> 1)] |= BRAILLE_DOTS[y & 3][x & 1]
+        return masks
+
+    def render_compact(self, game_state: GameState, output: list[str]) -> None:
+        """
+        Draw the grid in compact mode: each row of characters that changed
+        is rewritten from its first to its last changed character (the
+        characters start at the second column, after the border), then the
+        characters of the head and the food are highlighted.
+
+        :param game_state: The game state to display.
+        :param output: The output of the frame, extended.
+        """
+        char_columns = self.char_columns
+        text = self.compact_masks(game_state).decode("latin-1").translate(BRAILLE_TABLE)
+        rows = [text[start:start + char_columns] for start in range(0, len(text), char_columns)]
+        drawn_rows = self.drawn_rows or [" " * char_columns] * self.char_rows
+
+        # The highlighted characters of the previous frame are rewritten plain
+        highlighted: dict[int, list[int]] = {}
+        for char_x, char_y in self.drawn_cells:
+            highlighted.setdefault(char_y, []).append(char_x)
+
+        for char_y, (row, drawn_row) in enumerate(zip(rows, drawn_rows)):
+            if row == drawn_row and char_y not in highlighted:
+                continue
+            changed = [char_x for char_x in range(char_columns) if row[char_x] != drawn_row[char_x]]
+            changed += highlighted.get(char_y, ())
+            if changed:
+                first, last = min(changed), max(changed)
+                output.append(move_to(GRID_TOP_ROW + char_y, 2 + first) + row[first:last + 1])
+        self.drawn_rows = rows
+
+        styled = {}
+        for position, style in ((game_state.food, FOOD_STYLE), (game_state.snake.get_head(), HEAD_STYLE)):
+            position = self.to_view(position)
+            if position is not None:
+                char_x, char_y = position[0] >> 1, position[1] >> 2
+                styled[char_x, char_y] = style + rows[char_y][char_x] + RESET_STYLE
+        for (char_x, char_y), glyph in styled.items():
+            output.append(move_to(GRID_TOP_ROW + char_y, 2 + char_x) + glyph)
+        self.drawn_cells = styled
+
+    def render(self, game_state: GameState, current_strategy: str, speed: int) -> None:
+        """
+        Display the current game state in the terminal.
+
+        :param game_state: The game state to display.
+        :param current_strategy: The name of the currently active strategy.
+        :param speed: The current speed of the game.
+        """
+        output = []
+        # On first render, clear the screen and draw everything
+        if self.first_render:
+            output.append(CLEAR_SCREEN)
+            self.drawn_lines = []
+            self.drawn_cells = {}
+            self.drawn_rows = []
+            self.first_render = False
+
+        if self.clipped:
+            head_x, head_y = game_state.snake.get_head()
+            self.view_x = scroll(head_x, self.view_x, self.view_width, self.grid_width, self.cell_columns)
+            self.view_y = scroll(head_y, self.view_y, self.view_height, self.grid_height, self.cell_rows)
+
+        # The lines that changed, the leftover lines of the previous frame being cleared
+        lines = self.frame_lines(game_state, current_strategy, speed)
+        drawn_lines = self.drawn_lines
+        for row in range(max(len(lines), len(drawn_lines))):
+            line = lines[row] if row < len(lines) else ""
+            if row >= len(drawn_lines) or drawn_lines[row] != line:
+                output.append(move_to(row + 1, 1) + line + CLEAR_LINE_END)
+        self.drawn_lines = lines
+
+        if self.compact:
+            self.render_compact(game_state, output)
+        else:
+            # The cells that changed: the glyphs of the snake and the food
+            # that moved, and the empty cells they left (in O(length of the
+            # snake), or O(size of the viewport) if smaller)
+            cells = self.visible_glyphs(game_state)
+            drawn_cells = self.drawn_cells
+            for x, y in drawn_cells.keys() - cells.keys():
+                output.append(move_to(GRID_TOP_ROW + y, 3 + 2 * x) + EMPTY_GLYPH)
+            for (x, y), glyph in cells.items() - drawn_cells.items():
+                output.append(move_to(GRID_TOP_ROW + y, 3 + 2 * x) + glyph)
+            self.drawn_cells = cells
+
+        # Leave the cursor below the frame
+        output.append(move_to(len(lines) + 1, 1))
+        sys.stdout.write("".join(output))
         sys.stdout.flush()
 
     def cleanup(self) -> None:
         """Clean up the console view resources."""
+        sys.stdout.write(SHOW_CURSOR)
         self.clear_screen()
         print("Thank you for playing!")
 
@@ -150,4 +449,3 @@ class ConsoleView(BaseView):
         :param message: The message to display.
         """
         print(f"\n>>> {message}\n")
-
@@ -1,5 +1,6 @@
 from ..model.game_state import GameState
 from .base_view import BaseView
+from itertools import islice
 import pygame
 
 MIN_WINDOW_SIZE = 600
@@ -9,6 +10,8 @@ class PygameView(BaseView):
     Pygame view that displays the Snake game with a graphical interface.
     """
 
+    uses_pygame = True
+
     def __init__(self, config: dict):
         """
         Initialize the Pygame view.
@@ -129,7 +132,7 @@ class PygameView(BaseView):
         margin_x, margin_y, bottom_text_y = self.get_grid_offset()
 
         # --- Draw the snake ---
-        for segment_x, segment_y in game_state.snake.body[1:]:
+        for segment_x, segment_y in islice(game_state.snake.body, 1, None):
             self.draw_cell(segment_x, segment_y, self.snake_color, margin_x, margin_y)
         head_x, head_y = game_state.snake.get_head()
         self.draw_cell(head_x, head_y, self.head_color, margin_x, margin_y)
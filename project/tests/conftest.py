@@ -0,0 +1,67 @@
+import os
+import random
+import sys
+
+import pytest
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from src.config import load_config  # noqa: E402
+from src.model.game_state import GameState  # noqa: E402
+from src.replay import ReplayRecorder  # noqa: E402
+from src.strategies import StrategyRegistry  # noqa: E402
+
+
+@pytest.fixture
+def project_dir() -> str:
+    """The directory of the project, holding the configs."""
+    return PROJECT_DIR
+
+
+@pytest.fixture
+def config(project_dir) -> dict:
+    """The console config, with a fixed cycle and no cycle cache."""
+    config = load_config(os.path.join(project_dir, "config", "console.yaml"))
+    config["hamiltonian"]["cache_dir"] = None
+    return config
+
+
+def _record_game(config: dict, record_dir, chunk_steps: int,
+                 wrap_toggles: tuple[int, ...] = ()) -> tuple[str, list[int]]:
+    """
+    Record a game of the cycle strategy.
+
+    :return: The path of the replay and the steps after which food was spawned.
+    """
+    game_config = config["game"]
+    game_state = GameState(game_config["grid_width"], game_config["grid_height"], True, random.Random(1))
+    strategies = StrategyRegistry(config, 1)
+    strategy = strategies.get("cycle")
+    strategy.reset()
+    recorder = ReplayRecorder(str(record_dir), config, 1, chunk_steps=chunk_steps)
+    recorder.start(game_state)
+    path = recorder.writer.path
+
+    spawns = []
+    step = 0
+    while not game_state.game_over and step < 400:
+        if step in wrap_toggles:
+            game_state.toggle_wrap_around()
+            strategies.set_wrap_around(game_state.wrap_around)
+            recorder.record_wrap_around(game_state)
+        food = game_state.food
+        direction = strategy.get_move(game_state.snake.body, game_state.food)
+        game_state.update(direction)
+        recorder.record_step(direction, game_state)
+        step += 1
+        if game_state.food != food and not game_state.game_over:
+            spawns.append(step)
+    recorder.stop(score=game_state.score)
+    return path, spawns
+
+
+@pytest.fixture
+def record_game():
+    """Records a game of the cycle strategy (see _record_game)."""
+    return _record_game
@@ -0,0 +1,42 @@
+import random
+
+from src.controller.game_controller import CONSOLE_STRATEGY_KEYS
+from src.model.game_state import GameState
+from src.model.snake import Snake
+from src.view.console_view import FRAME_ROWS, ConsoleView, scroll
+
+
+def test_footer_lists_the_strategy_keys(config):
+    game_config = config["game"]
+    game_state = GameState(game_config["grid_width"], game_config["grid_height"], True, random.Random(1))
+    view = ConsoleView(config)
+
+    lines = view.frame_lines(game_state, "Player", 100)
+
+    footer = lines[-1]
+    assert footer.startswith("Commands: ")
+    assert "0 = Auto" in footer
+    assert "1 = Dummy" in footer
+    assert "2 = Pathfinding" in footer
+    for key in CONSOLE_STRATEGY_KEYS:
+        assert f"| {key} = " in footer
+    assert lines[view.char_rows + 5:view.char_rows + 8] == ["Mode: Player", "Teleportation: ON", "Speed: 100ms"]
+
+
+def test_compact_viewport_reaches_the_last_row(config):
+    # A height that is not a multiple of the 4 rows of a braille character
+    config["game"]["grid_width"], config["game"]["grid_height"] = 20, 250
+    config["graphics"]["console"] = {"compact": True, "follow_head": True}
+    assert scroll(249, 0, 36, 250, 4) == 216
+
+    game_state = GameState(20, 250, True, random.Random(1))
+    game_state.snake = Snake.from_body([(5, 249), (5, 248), (5, 247)], (0, 1))
+    view = ConsoleView(config)
+    view.setup_layout(None, FRAME_ROWS + 9)
+    assert view.clipped and view.view_height == 36
+
+    view.render(game_state, "Player", 100)
+
+    assert view.view_y % 4 == 0
+    assert view.to_view((5, 249)) == (5, 249 - view.view_y)
+    assert f"y {view.view_y}-249 of 20x250" in "\n".join(view.drawn_lines)
@@ -0,0 +1,76 @@
+from src.controller.game_controller import GameController
+from src.view.base_view import BaseView
+
+
+class RecordingView(BaseView):
+    """A console view counting the frames drawn."""
+
+    def __init__(self):
+        self.frames = []
+
+    def initialize(self) -> None:
+        pass
+
+    def render(self, game_state, current_strategy: str, speed: int) -> None:
+        self.frames.append((current_strategy, speed, game_state.wrap_around))
+
+    def show_message(self, message: str) -> None:
+        pass
+
+    def cleanup(self) -> None:
+        pass
+
+
+class ScriptedInput:
+    """A console input returning batches of keys, then ESCAPE."""
+
+    def __init__(self, batches: list[list[str]]):
+        self.batches = batches + [["ESCAPE"]]
+        self.keys = []
+
+    def wait_for_input(self, timeout: float | None) -> bool:
+        self.keys = self.batches.pop(0)
+        return True
+
+    def get_key(self) -> str | None:
+        return self.keys.pop(0) if self.keys else None
+
+
+def run_keys(config: dict, batches: list[list[str]]) -> list[tuple]:
+    """
+    Run the console loop over batches of keys, without game updates.
+
+    :return: The frames drawn.
+    """
+    config["game"]["strategy"] = "player"
+    view = RecordingView()
+    controller = GameController(config, view)
+    terminal = controller.input_handler
+    controller.input_handler = ScriptedInput(batches)
+    controller.run_due_updates = lambda: False
+    try:
+        controller.run_console()
+    finally:
+        # The controller set up the terminal for the console input
+        terminal.restore_terminal()
+    return view.frames
+
+
+def test_keys_changing_nothing_do_not_redraw(config):
+    frames = run_keys(config, [["x"], ["UP"], ["?", "LEFT"], [" "]])
+
+    assert len(frames) == 1
+
+
+def test_keys_changing_the_frame_redraw(config):
+    frames = run_keys(config, [["t"], ["x"], ["2"], ["+"], ["t", "t"]])
+
+    wrap_around = config["game"]["wrap_around"]
+    speed = config["game"]["properties"]["initial_speed"]
+    acceleration = config["game"]["properties"]["speed_acceleration"]
+    assert frames == [
+        ("Player", speed, wrap_around),
+        ("Player", speed, not wrap_around),
+        ("Pathfinding", speed, not wrap_around),
+        ("Pathfinding", speed + acceleration, not wrap_around),
+    ]
@@ -0,0 +1,118 @@
+import random
+from collections.abc import Sequence
+
+import pytest
+
+from src.model.game_state import GameState
+from src.seeding import make_rng
+from src.strategies.hamiltonian_cycle import HamiltonianCycle
+from src.strategies.hamiltonian_skip_strategy import HamiltonianSkipMovementStrategy
+
+GRIDS = [(4, 4), (6, 6), (8, 8), (10, 10), (12, 12), (4, 8), (10, 6)]
+SEEDS = range(6)
+MAX_STEPS = 3000
+
+
+class ListScanSkipStrategy:
+    """
+    The decisions of HamiltonianSkipMovementStrategy before its lookup
+    tables: list.index lookups on the cycle, and neighbors filtered and
+    sorted in temporary lists.
+    """
+
+    def __init__(self, grid_width: int, grid_height: int, hamiltonian_cycle: list[tuple[int, int]]):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.hamiltonian_cycle = hamiltonian_cycle
+
+    def get_neighbors(self, pos: tuple[int, int]) -> list[tuple[tuple[int, int], int]]:
+        neighbors = []
+        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            new_pos = (pos[0] + dx, pos[1] + dy)
+            if 0 <= new_pos[0] < self.grid_width and 0 <= new_pos[1] < self.grid_height:
+                neighbors.append((new_pos, self.hamiltonian_cycle.index(new_pos)))
+        return neighbors
+
+    def get_distance(self, ham_index1: int, ham_index2: int) -> int:
+        if ham_index1 < ham_index2:
+            return ham_index2 - ham_index1
+        else:
+            return (len(self.hamiltonian_cycle) - ham_index1 + ham_index2) % len(self.hamiltonian_cycle)
+
+    def get_move(self, snake_body: Sequence[tuple[int, int]], food_pos: tuple[int, int] | None) -> tuple[int, int]:
+        if not self.hamiltonian_cycle:
+            return (1, 0)
+
+        head = snake_body[0]
+        tail = snake_body[-1]
+        apple = food_pos
+        try:
+            head_ham_index = self.hamiltonian_cycle.index(head)
+            tail_ham_index = self.hamiltonian_cycle.index(tail)
+            apple_ham_index = self.hamiltonian_cycle.index(apple)
+        except ValueError:
+            return (1, 0)
+
+        head_neighbors = self.get_neighbors(head)
+
+        next_cell = None
+        snake_percent = len(snake_body) / (self.grid_width * self.grid_height)
+        threshold = 0.5
+        if head_ham_index > tail_ham_index and snake_percent < threshold:
+            head_neighbors = [neighbor for neighbor in head_neighbors if neighbor[1]
+                              < tail_ham_index or neighbor[1] > head_ham_index]
+            head_neighbors.sort(
+                key=lambda x: self.get_distance(x[1], apple_ham_index))
+            free_space = 5
+            head_neighbors = [
+                neighbor for neighbor in head_neighbors if self.get_distance(neighbor[1], tail_ham_index) > free_space
+            ]
+            if head_neighbors:
+                next_cell = head_neighbors[0][0]
+        elif head_ham_index < tail_ham_index and snake_percent < threshold:
+            head_neighbors = [neighbor for neighbor in head_neighbors if neighbor[1]
+                              > head_ham_index and neighbor[1] < tail_ham_index]
+            head_neighbors.sort(
+                key=lambda x: self.get_distance(x[1], apple_ham_index))
+            free_space = 5
+            head_neighbors = [
+                neighbor for neighbor in head_neighbors if self.get_distance(neighbor[1], tail_ham_index) > free_space
+            ]
+            if head_neighbors:
+                next_cell = head_neighbors[0][0]
+        elif head_ham_index == tail_ham_index:
+            head_neighbors.sort(
+                key=lambda x: self.get_distance(x[1], apple_ham_index))
+            if head_neighbors:
+                next_cell = head_neighbors[0][0]
+
+        if next_cell is None:
+            next_index = (head_ham_index + 1) % len(self.hamiltonian_cycle)
+            next_cell = self.hamiltonian_cycle[next_index]
+
+        dx = next_cell[0] - head[0]
+        dy = next_cell[1] - head[1]
+        if dx != 0:
+            dx = 1 if dx > 0 else -1
+        if dy != 0:
+            dy = 1 if dy > 0 else -1
+        return (dx, dy)
+
+
+@pytest.mark.parametrize("grid_width, grid_height", GRIDS)
+@pytest.mark.parametrize("random_cycle", [True, False])
+@pytest.mark.parametrize("wrap_around", [True, False])
+def test_same_moves_as_the_list_scan_decisions(grid_width, grid_height, random_cycle, wrap_around):
+    for seed in SEEDS:
+        cycle = HamiltonianCycle.generate(grid_width, grid_height, random_cycle, random.Random(seed))
+        strategy = HamiltonianSkipMovementStrategy(grid_width, grid_height, random_cycle, cycle=cycle)
+        reference = ListScanSkipStrategy(grid_width, grid_height, list(cycle.cells))
+        game_state = GameState(grid_width, grid_height, wrap_around, make_rng(seed, "food"))
+
+        step = 0
+        while not game_state.game_over and step < MAX_STEPS:
+            move = strategy.get_move(game_state.snake.body, game_state.food)
+            assert move == reference.get_move(game_state.snake.body, game_state.food), f"seed {seed}, step {step}"
+            game_state.update(move)
+            step += 1
+        assert game_state.score > 0
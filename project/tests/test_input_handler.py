@@ -0,0 +1,52 @@
+import os
+import platform
+
+import pytest
+
+from src.controller.input_handler import ConsoleInputHandler
+
+pytestmark = pytest.mark.skipif(platform.system() == "Windows", reason="reads stdin with select")
+
+
+@pytest.fixture
+def stdin_pipe(monkeypatch):
+    """A pipe replacing stdin, yielding the file descriptor its keys are written to."""
+    read_end, write_end = os.pipe()
+    stdin = os.fdopen(read_end, "r")
+    monkeypatch.setattr("sys.stdin", stdin)
+    yield write_end
+    stdin.close()
+    try:
+        os.close(write_end)
+    except OSError:
+        pass
+
+
+def read_keys(handler: ConsoleInputHandler) -> list[str]:
+    """The keys available without waiting."""
+    keys = []
+    while (key := handler.get_key()) is not None:
+        keys.append(key)
+    return keys
+
+
+def test_keys_typed_together_are_all_read(stdin_pipe):
+    handler = ConsoleInputHandler()
+    os.write(stdin_pipe, b"\x1b[Ax\x1b[BQ\x1b[H")
+
+    assert handler.wait_for_input(0)
+    assert read_keys(handler) == ["UP", "x", "DOWN", "q"]
+    assert not handler.wait_for_input(0)
+
+    os.write(stdin_pipe, "\x1bé".encode())
+    assert handler.wait_for_input(0)
+    assert read_keys(handler) == ["ESCAPE", "é"]
+
+
+def test_end_of_the_input(stdin_pipe):
+    handler = ConsoleInputHandler()
+    os.write(stdin_pipe, b"t")
+    os.close(stdin_pipe)
+
+    assert read_keys(handler) == ["t"]
+    assert handler.closed
@@ -0,0 +1,51 @@
+import pytest
+
+from src.model.game_state import GameState
+from src.seeding import make_rng
+from src.strategies.pathfinding_strategy import GIVE_UP_CELLS, PathfindingMovementStrategy
+
+GRID_SIZE = 10
+SEEDS = range(10)
+MAX_STEPS = 20000
+
+
+def play(wrap_around: bool, seed: int) -> tuple[GameState, int]:
+    """
+    Play a game of the pathfinding strategy on a 10x10 grid.
+
+    :return: The final game state and the most moves made without eating.
+    """
+    game_state = GameState(GRID_SIZE, GRID_SIZE, wrap_around, make_rng(seed, "food"))
+    strategy = PathfindingMovementStrategy(GRID_SIZE, GRID_SIZE, wrap_around)
+    strategy.reset()
+
+    longest_wait = wait = 0
+    for _ in range(MAX_STEPS):
+        if game_state.game_over:
+            break
+        score = game_state.score
+        game_state.update(strategy.get_move(game_state.snake.body, game_state.food))
+        wait = 0 if game_state.score != score else wait + 1
+        longest_wait = max(longest_wait, wait)
+    return game_state, longest_wait
+
+
+@pytest.mark.parametrize("wrap_around", [True, False])
+def test_survives_to_a_long_snake(wrap_around):
+    scores = []
+    for seed in SEEDS:
+        game_state, _ = play(wrap_around, seed)
+        scores.append(game_state.score)
+        assert game_state.win or game_state.score >= 60, f"seed {seed} died at {game_state.score}"
+
+    assert sum(scores) / len(scores) >= 85
+
+
+@pytest.mark.parametrize("wrap_around", [True, False])
+def test_keeps_eating_until_the_game_ends(wrap_around):
+    cell_count = GRID_SIZE * GRID_SIZE
+    for seed in SEEDS:
+        game_state, longest_wait = play(wrap_around, seed)
+
+        assert game_state.game_over, f"seed {seed} still running after {MAX_STEPS} moves"
+        assert longest_wait <= (GIVE_UP_CELLS + 1) * cell_count
@@ -0,0 +1,21 @@
+import pytest
+
+from src.strategies import StrategyRegistry
+
+
+def test_alias_shares_the_instance(config):
+    registry = StrategyRegistry(config, seed=1)
+
+    assert registry.get("hamiltonian") is registry.get("cycle")
+    assert registry.get("Hamiltonian") is registry.get("cycle")
+    assert registry.resolve("hamiltonian") == "cycle"
+    assert registry.display_name("hamiltonian") == registry.display_name("cycle")
+
+
+def test_unknown_strategy(config):
+    registry = StrategyRegistry(config, seed=1)
+
+    with pytest.raises(ValueError):
+        registry.get("hamiltonain")
+    with pytest.raises(ValueError):
+        registry.display_name("hamiltonain")
@@ -0,0 +1,72 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from src.controller import replay_controller  # noqa: E402
+from src.controller.replay_controller import ReplayController  # noqa: E402
+from src.replay import ReplayPlayer  # noqa: E402
+from src.view.base_view import BaseView  # noqa: E402
+
+
+class RecordingPygameView(BaseView):
+    """A pygame view recording the frames drawn, without a window."""
+
+    uses_pygame = True
+
+    def __init__(self):
+        self.frames = []
+
+    def initialize(self) -> None:
+        pass
+
+    def render(self, game_state, current_strategy: str, speed: int) -> None:
+        self.frames.append(current_strategy)
+
+    def show_message(self, message: str) -> None:
+        pass
+
+    def cleanup(self) -> None:
+        pass
+
+
+def key(name: str) -> pygame.event.Event:
+    return pygame.event.Event(pygame.KEYDOWN, key=getattr(pygame, name))
+
+
+def test_paused_replay_blocks_and_redraws_only_on_changes(config, tmp_path, monkeypatch, record_game):
+    path, _ = record_game(config, tmp_path, 1 << 16)
+    batches = [
+        [key("K_SPACE")],
+        [key("K_a")],
+        [pygame.event.Event(pygame.MOUSEMOTION, pos=(1, 1), rel=(1, 1), buttons=(0, 0, 0))],
+        [key("K_RIGHT")],
+        [key("K_b"), key("K_c")],
+        [key("K_5")],
+        [pygame.event.Event(pygame.QUIT)],
+    ]
+    timeouts = []
+
+    def scripted_events(timeout):
+        timeouts.append(timeout)
+        return batches.pop(0)
+
+    monkeypatch.setattr(replay_controller, "wait_pygame_events", scripted_events)
+    view = RecordingPygameView()
+    controller = ReplayController(config, view, ReplayPlayer(path))
+    controller.frame_clock.set_interval(0)
+    try:
+        controller.run_pygame()
+    finally:
+        controller.player.close()
+        pygame.quit()
+
+    total = controller.player.total_steps
+    # The first frame, the pause, the step forward and the jump to 50%
+    assert len(view.frames) == 4
+    assert view.frames[1].startswith("Replay 0/") and view.frames[1].endswith("(paused)")
+    assert view.frames[2].startswith("Replay 1/")
+    assert view.frames[3].startswith(f"Replay {total * 5 // 10}/")
+    # Paused: the loop sleeps until the next event
+    assert timeouts[1:] == [None] * (len(timeouts) - 1)
@@ -0,0 +1,34 @@
+import os
+
+from src.replay import ReplayPlayer
+from src.replay import replay_index
+from src.replay.replay_index import index_path
+
+
+def player_states(player: ReplayPlayer, steps: list[int]) -> list[tuple]:
+    """The body, food and score of the replay at each step, seeking to it."""
+    states = []
+    for step in steps:
+        player.seek(step)
+        states.append((list(player.state.snake.body), player.state.food, player.state.score))
+    return states
+
+
+def test_index_in_memory_when_it_cannot_be_written(config, tmp_path, monkeypatch, record_game):
+    path, _ = record_game(config, tmp_path / "replays", 1 << 16)
+    steps = [400, 0, 123, 17, 399, 250]
+
+    def read_only(*_):
+        raise PermissionError("Read-only file system")
+
+    monkeypatch.setattr(replay_index, "write_index", read_only)
+    player = ReplayPlayer(path, keyframe_interval=16)
+    in_memory = player_states(player, steps)
+    player.close()
+    assert not os.path.exists(index_path(path))
+
+    monkeypatch.undo()
+    player = ReplayPlayer(path, keyframe_interval=16)
+    assert player_states(player, steps) == in_memory
+    player.close()
+    assert os.path.exists(index_path(path))
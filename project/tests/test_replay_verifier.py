@@ -0,0 +1,26 @@
+from src.replay import ReplayReader, verify_replay
+from src.replay.replay_format import EVENT_FOOD
+
+
+def test_food_spawned_on_the_last_step_of_a_chunk(config, tmp_path, record_game):
+    _, spawns = record_game(config, tmp_path / "probe", chunk_steps=1 << 16)
+    boundary = spawns[1]
+
+    path, _ = record_game(config, tmp_path / "replays", chunk_steps=boundary)
+    reader = ReplayReader(path)
+    chunks = list(reader.chunks())
+    # The food of the last step of the first chunk is recorded in the second chunk
+    assert chunks[0].step_count == boundary
+    assert chunks[1].events[0][:2] == (boundary, EVENT_FOOD)
+
+    result = verify_replay(path, check_moves=True)
+    assert result.ok, result.message
+    assert result.steps == reader.total_steps
+
+
+def test_small_chunks_with_wrap_toggles(config, tmp_path, record_game):
+    for chunk_steps in (1, 2, 7, 37):
+        path, _ = record_game(config, tmp_path / str(chunk_steps), chunk_steps, wrap_toggles=(5, 60, 150))
+        result = verify_replay(path)
+        assert result.ok, (chunk_steps, result.divergence_step, result.message)
+
@@ -0,0 +1,84 @@
+import copy
+import os
+
+import pytest
+
+from src import config as config_module
+from src.config import config_hash, expand_sweep, load_config
+from src.simulation import run_sweep
+
+
+@pytest.fixture
+def sweep_config(project_dir) -> dict:
+    """The sweep config, with small grids."""
+    config = load_config(os.path.join(project_dir, "config", "sweep.yaml"))
+    config["hamiltonian"]["cache_dir"] = None
+    config["sweep"] = {"game.grid_width": [4, 6], "game.strategy": ["cycle", "hamiltonian_skip"]}
+    return config
+
+
+def test_expand_sweep(sweep_config):
+    configs = expand_sweep(sweep_config)
+
+    assert [(config["game"]["grid_width"], config["game"]["strategy"]) for config in configs] == [
+        (4, "cycle"), (4, "hamiltonian_skip"), (6, "cycle"), (6, "hamiltonian_skip")]
+    assert all("sweep" not in config for config in configs)
+
+
+def test_unknown_sweep_key(sweep_config):
+    sweep_config["sweep"] = {"game.grid_widht": [4, 6]}
+
+    with pytest.raises(ValueError):
+        expand_sweep(sweep_config)
+
+
+def test_hash_ignores_the_output_settings(sweep_config):
+    config = expand_sweep(sweep_config)[0]
+    key = config_hash(config, episodes=2)
+
+    moved = copy.deepcopy(config)
+    moved["hamiltonian"]["cache_dir"] = "elsewhere/cycles"
+    moved["replay"]["record_dir"] = "elsewhere/replays"
+    moved["graphics"]["fps"] = 30
+    assert config_hash(moved, episodes=2) == key
+    assert config["hamiltonian"]["cache_dir"] is None
+
+    changed = copy.deepcopy(config)
+    changed["hamiltonian"]["random_cycle"] = not config["hamiltonian"]["random_cycle"]
+    assert config_hash(changed, episodes=2) != key
+    assert config_hash(config, episodes=3) != key
+
+
+def test_hash_changes_with_the_results_version(sweep_config, monkeypatch):
+    config = expand_sweep(sweep_config)[0]
+    key = config_hash(config, episodes=2)
+
+    monkeypatch.setattr(config_module, "RESULTS_VERSION", config_module.RESULTS_VERSION + 1)
+    assert config_hash(config, episodes=2) != key
+
+
+def test_unseeded_points_are_not_cached(sweep_config, tmp_path):
+    cache_dir = str(tmp_path / "sweeps")
+    configs = expand_sweep(sweep_config)
+    configs[0]["game"]["seed"] = None
+
+    first = list(run_sweep(configs, 2, max_steps=200, workers=2, cache_dir=cache_dir))
+    assert not any(point.cached for point in first)
+    assert len(os.listdir(cache_dir)) == len(configs) - 1
+
+    second = {point.key: point.cached for point in run_sweep(configs, 2, max_steps=200, workers=2,
+                                                             cache_dir=cache_dir)}
+    unseeded_key = config_hash(configs[0], episodes=2, max_steps=200)
+    assert second.pop(unseeded_key) is False
+    assert all(second.values())
+
+
+def test_points_sharing_a_seed_record_distinct_replays(sweep_config, tmp_path):
+    record_dir = tmp_path / "replays"
+    sweep_config["replay"]["record_dir"] = str(record_dir)
+    configs = expand_sweep(sweep_config)
+
+    points = list(run_sweep(configs, 2, max_steps=200, workers=2))
+
+    assert len(points) == len(configs)
+    assert len(os.listdir(record_dir)) == 2 * len(configs)
@@ -0,0 +1,86 @@
+import random
+
+from src.simulation.tournament import (
+    PERCENTILE_ACCURACY, GameResult, QuantileSketch, TournamentJob, TournamentReport, run_tournament
+)
+
+
+def exact_percentile(values: list[float], percent: float) -> float:
+    """The value of the rank of a percentile, rounded down."""
+    values = sorted(values)
+    return values[int((len(values) - 1) * percent / 100)]
+
+
+def test_sketch_percentiles_within_the_accuracy():
+    rng = random.Random(1)
+    values = [rng.lognormvariate(5, 2) for _ in range(20000)] + [0.0] * 500
+    sketch = QuantileSketch()
+    for value in values:
+        sketch.add(value)
+
+    assert sketch.count == len(values)
+    assert abs(sketch.mean() - sum(values) / len(values)) < 1e-6 * sketch.mean()
+    for percent in (0, 1, 50, 90, 99, 100):
+        exact = exact_percentile(values, percent)
+        assert abs(sketch.percentile(percent) - exact) <= PERCENTILE_ACCURACY * exact
+    # The buckets cover the range of the values, not their number
+    assert len(sketch.buckets) < 1000
+
+
+def test_report_aggregates_the_groups():
+    report = TournamentReport()
+    rng = random.Random(2)
+    results = []
+    for seed in range(3000):
+        win = seed % 3 == 0
+        timed_out = seed % 3 == 1
+        result = GameResult("cycle", 10, 10, seed % 2 == 0, seed, rng.randint(100, 5000), rng.randint(1, 100),
+                            win, timed_out, rng.uniform(0.01, 1))
+        results.append(result)
+        report.add(result)
+
+    rows = report.summary()
+    assert [row["wrap_around"] for row in rows] == [False, True]
+    for row in rows:
+        group = [result for result in results if result.wrap_around == row["wrap_around"]]
+        assert row["games"] == len(group)
+        assert row["win_rate"] == sum(result.win for result in group) / len(group)
+        assert row["timeout_rate"] == sum(result.timed_out for result in group) / len(group)
+        assert row["death_rate"] == sum(not result.win and not result.timed_out for result in group) / len(group)
+
+        steps = [result.steps for result in group if result.win]
+        assert row["steps_to_win_mean"] == sum(steps) / len(steps)
+        exact = exact_percentile(steps, 90)
+        assert abs(row["steps_to_win_p90"] - exact) <= PERCENTILE_ACCURACY * exact
+
+
+def test_empty_metric():
+    report = TournamentReport()
+    report.add(GameResult("dummy", 10, 10, True, 0, 10, 1, False, False, 0.1))
+
+    row = report.summary()[0]
+    assert row["steps_to_win_mean"] is None
+    assert row["steps_to_win_p50"] is None
+    assert row["death_rate"] == 1.0
+
+
+def test_random_cycles_of_the_seeds_are_not_cached(config, tmp_path):
+    config["hamiltonian"]["random_cycle"] = True
+    config["hamiltonian"]["cache_dir"] = str(tmp_path / "cycles")
+    jobs = [TournamentJob("hamiltonian_skip", 8, 8, True, seed) for seed in range(6)]
+
+    results = list(run_tournament(config, jobs, workers=2, max_steps=200))
+
+    assert sorted(result.seed for result in results) == list(range(6))
+    assert not (tmp_path / "cycles").exists()
+
+
+def test_games_sharing_a_seed_record_distinct_replays(config, tmp_path):
+    config["replay"]["record_dir"] = str(tmp_path / "replays")
+    jobs = [TournamentJob(strategy, 6, 6, wrap_around, 1)
+            for strategy in ("cycle", "hamiltonian_skip") for wrap_around in (True, False)]
+
+    results = list(run_tournament(config, jobs, workers=2, max_steps=200))
+
+    assert len(results) == len(jobs)
+    assert len(list((tmp_path / "replays").iterdir())) == len(jobs)
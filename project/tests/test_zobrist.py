@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from src.model.game_state import GameState
+from src.seeding import make_rng
+from src.strategies.hamiltonian_cycle import DIRECTIONS
+
+
+def towards_food(game_state: GameState, rng: random.Random) -> tuple[int, int]:
+    """A move towards the food most of the time (to eat often), a random one otherwise."""
+    head_x, head_y = game_state.snake.body[0]
+    food = game_state.food
+    if food is not None and rng.random() < 0.8:
+        if food[0] != head_x:
+            return (1, 0) if food[0] > head_x else (-1, 0)
+        return (0, 1) if food[1] > head_y else (0, -1)
+    return rng.choice(DIRECTIONS)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_hash_follows_interleaved_operations(seed):
+    rng = random.Random(seed)
+    game_state = GameState(6, 6, True, make_rng(seed, "food"))
+    records = []
+    snapshots = []
+    counts = dict.fromkeys(("update", "apply", "undo", "snapshot", "restore", "toggle", "reset", "food"), 0)
+
+    for step in range(3000):
+        food = game_state.food
+        operation = rng.choice(("update", "update", "apply", "apply", "undo", "snapshot", "restore", "toggle"))
+        if game_state.game_over and operation in ("update", "apply"):
+            operation = "reset"
+
+        if operation == "update":
+            game_state.update(towards_food(game_state, rng))
+            records.clear()
+        elif operation == "apply":
+            records.append(game_state.apply_move(towards_food(game_state, rng)))
+        elif operation == "undo" and records:
+            game_state.undo_move(records.pop())
+        elif operation == "snapshot":
+            snapshots.append(game_state.snapshot())
+        elif operation == "restore" and snapshots:
+            game_state.restore(rng.choice(snapshots))
+            records.clear()
+        elif operation == "toggle":
+            game_state.toggle_wrap_around()
+        elif operation == "reset":
+            game_state.reset()
+            records.clear()
+        else:
+            continue
+        counts[operation] += 1
+        if game_state.food != food and operation in ("update", "apply"):
+            counts["food"] += 1
+
+        assert game_state.zobrist_hash == game_state.compute_zobrist_hash(), f"step {step}: {operation}"
+
+    assert all(count > 0 for count in counts.values()), counts
@@ -0,0 +1,66 @@
+from src.simulation import TournamentJob, TournamentReport, GameWriter, run_tournament
+from src.config import load_config
+import argparse
+import itertools
+import os
+import time
+
+DEFAULT_CONFIG_PATH = "config/default.yaml"
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="Snake tournament",
+        description="Play headless games of several strategies over a process pool and aggregate the results",
+    )
+    parser.add_argument("--config", "-c", metavar="CONFIG_FILE", default=DEFAULT_CONFIG_PATH,
+                        help="Base configuration (Hamiltonian cycle options, cache directory).")
+    parser.add_argument("--strategies", nargs="+", default=["cycle", "hamiltonian_skip", "dummy"],
+                        help="Strategies playing the games.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 20],
+                        help="Widths and heights of the grids.")
+    parser.add_argument("--wrap-around", choices=["true", "false", "both"], default="both",
+                        help="Whether the snakes teleport to the edges.")
+    parser.add_argument("--seeds", type=int, default=10,
+                        help="Number of games (seeds 0 to SEEDS - 1) of each combination.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes, the number of CPUs by default.")
+    parser.add_argument("--max-steps", type=int, default=None,
+                        help="Maximum number of steps of a game.")
+    parser.add_argument("--output", "-o", default="tournament",
+                        help="Directory of games.csv, summary.csv and summary.json.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    config = load_config(args.config)
+
+    wrap_arounds = {"true": [True], "false": [False], "both": [True, False]}[args.wrap_around]
+    jobs = (
+        TournamentJob(strategy, size, size, wrap_around, seed)
+        for strategy, size, wrap_around, seed
+        in itertools.product(args.strategies, args.sizes, wrap_arounds, range(args.seeds))
+    )
+    game_count = len(args.strategies) * len(args.sizes) * len(wrap_arounds) * args.seeds
+
+    report = TournamentReport()
+    writer = GameWriter(os.path.join(args.output, "games.csv"))
+    start = time.perf_counter()
+    try:
+        for finished, result in enumerate(run_tournament(config, jobs, args.workers, args.max_steps), 1):
+            report.add(result)
+            writer.write(result)
+            if finished % max(1, game_count // 100) == 0 or finished == game_count:
+                print(f"\r{finished}/{game_count} games", end="", flush=True)
+    finally:
+        writer.close()
+    print(f"\nPlayed {game_count} games in {time.perf_counter() - start:.1f} s")
+
+    report.write(args.output)
+    for row in report.summary():
+        print(f"{row['strategy']:<18} {row['grid_width']:>4}x{row['grid_height']:<4} "
+              f"wrap={row['wrap_around']!s:<5} win {row['win_rate']:>6.1%} "
+              f"death {row['death_rate']:>6.1%} "
+              f"apples/1000 steps p50 {row['apples_per_1000_steps_p50']:>7.1f}")
@@ -0,0 +1,45 @@
+from src.replay import find_replays, verify_replays
+import argparse
+import sys
+import time
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="Snake replay verifier",
+        description="Re-simulate recorded games over a process pool and report the first divergence of each",
+    )
+    parser.add_argument("paths", nargs="+", metavar="PATH",
+                        help="Replay files, or directories searched recursively for replays.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes, the number of CPUs by default.")
+    parser.add_argument("--check-moves", action="store_true",
+                        help="Also check that the strategy of each game plays the recorded moves "
+                             "(games recorded by the headless engine).")
+    parser.add_argument("--max-failures", type=int, default=20,
+                        help="Number of divergences printed (all of them are counted).")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    games = steps = failures = incomplete = 0
+    start = time.perf_counter()
+    for result in verify_replays(find_replays(args.paths), args.workers, args.check_moves):
+        games += 1
+        steps += result.steps
+        if not result.ok:
+            failures += 1
+            if failures <= args.max_failures:
+                step = f"step {result.divergence_step}: " if result.divergence_step is not None else ""
+                print(f"\r{result.path}: {step}{result.message}")
+        elif result.outcome is None:
+            incomplete += 1
+        if games % 100 == 0:
+            print(f"\r{games} games", end="", flush=True)
+
+    print(f"\rVerified {games} games ({steps:,} steps) in {time.perf_counter() - start:.1f} s: "
+          f"{failures} diverged, {incomplete} without outcome (interrupted recordings)")
+    sys.exit(1 if failures else 0)